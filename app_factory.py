@@ -0,0 +1,92 @@
+# App factory: one service assembled from routers, importing only what a profile mounts
+# Usage: create_app("minimal" | "standard" | "full"), or APP_PROFILE with main_super_fast:app
+import importlib
+import os
+import time
+
+from fastapi import FastAPI
+
+from rate_limit import RateLimitMiddleware
+from request_tracing import TraceStartMiddleware
+from response_compression import CompressionMiddleware
+
+# Router name -> module; a module is imported the first time a profile mounts it
+ROUTERS = {
+    "predict": "routers.predict",
+    "analytics": "routers.analytics",
+    "ui": "routers.ui",
+    "debug": "routers.debug",
+    "docs": "routers.docs",
+    "gradio": "routers.gradio_ui",
+    # Not part of any profile: mounted when BINARY_SOCKET or BINARY_PORT is set
+    "binary": "routers.binary",
+}
+
+PROFILES = {
+    # API only: prediction, batch scoring, feedback and the health check
+    "minimal": ["predict"],
+    # The deployed service: API, analytics, landing page, operational endpoints and docs
+    "standard": ["predict", "analytics", "ui", "debug", "docs"],
+    # Everything, including the Gradio UI at /gradio
+    "full": ["predict", "analytics", "ui", "debug", "docs", "gradio"],
+}
+
+# Enforced by test_app_factory.py: seconds to import and assemble each profile in a
+# fresh interpreter, total modules loaded, and modules it must not pull in
+PROFILE_BUDGETS = {
+    "minimal": {"max_seconds": 1.5, "max_modules": 600,
+                "forbidden": ["gradio", "joblib", "uvicorn", "heatmap", "comparables", "sampling_profiler",
+                              "routers.analytics", "routers.ui", "routers.debug", "routers.docs", "routers.gradio_ui"]},
+    "standard": {"max_seconds": 2.0, "max_modules": 650,
+                 "forbidden": ["gradio", "joblib", "uvicorn", "routers.gradio_ui"]},
+    "full": {"max_seconds": 15.0, "max_modules": None,
+             "forbidden": ["joblib", "uvicorn"]},
+}
+
+def create_app(profile="standard"):
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown profile '{profile}', expected one of {sorted(PROFILES)}")
+    started = time.perf_counter()
+
+    from routers import state
+
+    # Docs are a router of their own, so the schema machinery is only wired up when mounted
+    app = FastAPI(
+        title="🏠 PriceGenius AI - California Real Estate Predictor",
+        description="Advanced California real estate prediction with market analytics and insights",
+        version="6.0.0",
+        docs_url=None,
+        redoc_url=None,
+        openapi_url=None
+    )
+    app.add_middleware(CompressionMiddleware, compression=state.response_compression)
+    app.add_middleware(RateLimitMiddleware, limiter=state.rate_limiter, exempt_paths=("/health", "/gradio/assets"))
+    app.add_middleware(TraceStartMiddleware)
+
+    names = PROFILES[profile]
+    if os.getenv("BINARY_SOCKET") or os.getenv("BINARY_PORT"):
+        names = names + ["binary"]
+
+    mounted = []
+    for name in names:
+        module = importlib.import_module(ROUTERS[name])
+        # Gradio mounts a sub-application rather than contributing routes
+        if hasattr(module, "mount"):
+            app = module.mount(app)
+        else:
+            app.include_router(module.router)
+        mounted.append(module)
+
+    app.state.profile = profile
+    app.state.routers = mounted
+    app.state.startup_seconds = time.perf_counter() - started
+    return app
+
+
+def preload(app):
+    """Run each mounted router's preload hook (heatmap, explainer) before serve.py forks workers"""
+    for module in app.state.routers:
+        hook = getattr(module, "preload", None)
+        if hook:
+            hook()
+
@@ -0,0 +1,346 @@
+# Length-prefixed binary prediction protocol over a Unix socket or TCP, for co-located callers
+# Usage: python binary_protocol.py serve (--unix /tmp/pricing.sock | --tcp 127.0.0.1:9100)
+#        python binary_protocol.py bench (--unix /tmp/pricing.sock | --tcp 127.0.0.1:9100) [--requests 20000]
+#
+# Every frame is a little-endian uint32 length (bytes that follow), then:
+#   request:  uint8 op, uint32 request_id, payload
+#     OP_PREDICT  8 x float64 features                      -> float64 price, lower, upper (NaN without intervals), uint8 region code
+#     OP_BATCH    uint32 rows, rows x 8 x float64 (row-major) -> rows x float64 prices
+#     OP_PING     (empty)                                   -> (empty)
+#   response: uint8 status (0 ok, 1 error), uint32 request_id, payload (error: UTF-8 message)
+# Features must be finite; a NaN or inf anywhere in a request gets an error reply.
+# Prices are in dollars. Requests may be pipelined; responses come back in request order.
+import argparse
+import asyncio
+import math
+import os
+import socket
+import struct
+import time
+
+import numpy as np
+
+from model_utils import predict_rows
+
+OP_PREDICT, OP_BATCH, OP_PING = 1, 2, 3
+STATUS_OK, STATUS_ERROR = 0, 1
+# Largest OP_BATCH accepted (BINARY_MAX_BATCH_ROWS when mounted in the app)
+MAX_BATCH_ROWS = 10000
+# Batches above this many rows are scored on a worker thread instead of the event loop
+OFFLOAD_ROWS = 1024
+
+LENGTH = struct.Struct("<I")
+HEADER = struct.Struct("<BI")
+FEATURES = struct.Struct("<8d")
+ROWS = struct.Struct("<I")
+PREDICTION = struct.Struct("<dddB")
+RESPONSE_HEADER = struct.Struct("<IBI")
+
+
+def response_frame(status, request_id, payload=b""):
+    return RESPONSE_HEADER.pack(HEADER.size + len(payload), status, request_id) + payload
+
+
+class PredictionProtocol(asyncio.Protocol):
+    """One connection. Every complete frame in a read is answered, then all replies go out in one write.
+
+    Pipelined requests therefore cost one system call per read rather than per
+    request. A batch above offload_rows is scored on the loop's default executor
+    so it doesn't stall other connections; reading pauses until it is done, and
+    frames behind it are answered afterwards, so replies stay in request order.
+    Predictions use the shared service state (routers.state): the published
+    model, and single predictions are added to the same history as /predict,
+    while batches are not, as with /predict/batch.
+    """
+
+    def __init__(self, state, stats, max_batch_rows=MAX_BATCH_ROWS, offload_rows=OFFLOAD_ROWS):
+        self.state = state
+        self.stats = stats
+        self.max_batch_rows = max_batch_rows
+        self.max_frame = HEADER.size + ROWS.size + max_batch_rows * FEATURES.size
+        self.offload_rows = offload_rows
+        self.buffer = bytearray()
+        self.transport = None
+        self.scoring = False
+        self.write_paused = False
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.stats["connections"] += 1
+        sock = transport.get_extra_info("socket")
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def data_received(self, data):
+        self.buffer += data
+        if not self.scoring:
+            self.process()
+
+    def process(self):
+        """Answer every complete frame in the buffer, stopping at a batch that is offloaded"""
+        buffer = self.buffer
+        offset, replies = 0, []
+        while len(buffer) - offset >= LENGTH.size and not self.transport.is_closing():
+            (length,) = LENGTH.unpack_from(buffer, offset)
+            if not HEADER.size <= length <= self.max_frame:
+                self.transport.write(b"".join(replies) + response_frame(STATUS_ERROR, 0, f"Invalid frame length {length}".encode()))
+                self.transport.close()
+                return
+            end = offset + LENGTH.size + length
+            if len(buffer) < end:
+                break
+            reply = self.handle(buffer, offset + LENGTH.size, end)
+            offset = end
+            if not isinstance(reply, bytes):
+                # An offloaded batch: the frames after it wait until it is answered
+                self.scoring = True
+                self.update_reading()
+                asyncio.get_running_loop().create_task(self.finish_offloaded(reply))
+                break
+            replies.append(reply)
+        if offset:
+            del buffer[:offset]
+        if replies:
+            self.transport.write(b"".join(replies))
+
+    def handle(self, buffer, start, end):
+        """Reply frame for one request, or an awaitable of it for a batch scored off the event loop"""
+        op, request_id = HEADER.unpack_from(buffer, start)
+        start += HEADER.size
+        self.stats["frames"] += 1
+        try:
+            if op == OP_PREDICT:
+                if end - start != FEATURES.size:
+                    raise ValueError("OP_PREDICT needs 8 float64 features")
+                features = FEATURES.unpack_from(buffer, start)
+                # NaN or inf would be scored and recorded into the shared history
+                if not all(map(math.isfinite, features)):
+                    raise ValueError("OP_PREDICT features must be finite")
+                return response_frame(STATUS_OK, request_id, self.predict(list(features)))
+            if op == OP_BATCH:
+                (rows,) = ROWS.unpack_from(buffer, start)
+                start += ROWS.size
+                if not 1 <= rows <= self.max_batch_rows or end - start != rows * FEATURES.size:
+                    raise ValueError(f"OP_BATCH needs 1-{self.max_batch_rows} rows of 8 float64 features")
+                # Copied out of the receive buffer, which is resized after this frame
+                X = np.frombuffer(bytes(buffer[start:end]), dtype="<f8").reshape(rows, 8)
+                if not np.isfinite(X).all():
+                    raise ValueError("OP_BATCH features must be finite")
+                if rows > self.offload_rows:
+                    return self.score_offloaded(request_id, X)
+                return self.batch_reply(request_id, predict_rows(self.state.model, X))
+            if op == OP_PING:
+                return response_frame(STATUS_OK, request_id)
+            raise ValueError(f"Unknown op {op}")
+        except Exception as e:
+            return self.error_reply(request_id, e)
+
+    async def score_offloaded(self, request_id, X):
+        self.stats["offloaded"] += 1
+        try:
+            prices = await asyncio.get_running_loop().run_in_executor(None, predict_rows, self.state.model, X)
+            return self.batch_reply(request_id, prices)
+        except Exception as e:
+            return self.error_reply(request_id, e)
+
+    async def finish_offloaded(self, pending):
+        reply = await pending
+        self.scoring = False
+        if self.transport.is_closing():
+            return
+        self.transport.write(reply)
+        self.update_reading()
+        # Frames that arrived behind the batch
+        self.process()
+
+    def batch_reply(self, request_id, prices):
+        self.stats["batch_rows"] += len(prices)
+        return response_frame(STATUS_OK, request_id, (prices * 100000).astype("<f8").tobytes())
+
+    def error_reply(self, request_id, error):
+        self.stats["errors"] += 1
+        return response_frame(STATUS_ERROR, request_id, str(error).encode())
+
+    def predict(self, data):
+        state = self.state
+        result = state.evaluate_prediction(data, False)
+        state.record_prediction(data, "California", result)
+        self.stats["predictions"] += 1
+        interval = result["interval"]
+        return PREDICTION.pack(
+            result["actual_price"],
+            interval["lower"] if interval else math.nan,
+            interval["upper"] if interval else math.nan,
+            state.region_code(data[6], data[7])
+        )
+
+    def pause_writing(self):
+        # A client pipelining faster than it reads: stop reading until it catches up
+        self.write_paused = True
+        self.update_reading()
+
+    def resume_writing(self):
+        self.write_paused = False
+        self.update_reading()
+
+    def update_reading(self):
+        if self.scoring or self.write_paused:
+            self.transport.pause_reading()
+        else:
+            self.transport.resume_reading()
+
+
+async def start_server(state, unix_path=None, host=None, port=None, stats=None, max_batch_rows=MAX_BATCH_ROWS):
+    """Listen on a Unix socket and/or TCP port; returns the asyncio servers"""
+    stats = stats if stats is not None else new_stats()
+    loop = asyncio.get_running_loop()
+    protocol = lambda: PredictionProtocol(state, stats, max_batch_rows)
+    servers = []
+    if unix_path:
+        if os.path.exists(unix_path):
+            if socket_in_use(unix_path):
+                raise RuntimeError(f"{unix_path} is already being served")
+            os.unlink(unix_path)
+        servers.append(await loop.create_unix_server(protocol, unix_path))
+    if port:
+        # Each serve.py worker can listen on the same port; the kernel balances connections
+        servers.append(await loop.create_server(protocol, host or "127.0.0.1", port,
+                                                reuse_port=hasattr(socket, "SO_REUSEPORT")))
+    return servers
+
+
+def socket_in_use(path):
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def new_stats():
+    return {"connections": 0, "frames": 0, "predictions": 0, "batch_rows": 0, "offloaded": 0, "errors": 0}
+
+
+class BinaryClient:
+    """Blocking client for the binary protocol"""
+
+    def __init__(self, unix_path=None, host="127.0.0.1", port=None):
+        if unix_path:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(unix_path)
+        else:
+            self.sock = socket.create_connection((host, port))
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.next_id = 0
+
+    def close(self):
+        self.sock.close()
+
+    def _request(self, op, payload=b""):
+        self.next_id = (self.next_id + 1) & 0xFFFFFFFF
+        return LENGTH.pack(HEADER.size + len(payload)) + HEADER.pack(op, self.next_id) + payload
+
+    def _read(self, size):
+        data = bytearray()
+        while len(data) < size:
+            chunk = self.sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("Connection closed by server")
+            data += chunk
+        return data
+
+    def _response(self):
+        (length,) = LENGTH.unpack(self._read(LENGTH.size))
+        frame = self._read(length)
+        status, request_id = HEADER.unpack_from(frame)
+        payload = bytes(frame[HEADER.size:])
+        if status != STATUS_OK:
+            raise ValueError(payload.decode())
+        return payload
+
+    @staticmethod
+    def _prediction(payload):
+        price, lower, upper, region = PREDICTION.unpack(payload)
+        return {"price": price, "lower": lower, "upper": upper, "region": region}
+
+    def predict(self, features):
+        self.sock.sendall(self._request(OP_PREDICT, FEATURES.pack(*features)))
+        return self._prediction(self._response())
+
+    def predict_many(self, rows):
+        """Single predictions, all sent before any reply is read (pipelined)"""
+        self.sock.sendall(b"".join(self._request(OP_PREDICT, FEATURES.pack(*row)) for row in rows))
+        return [self._prediction(self._response()) for _ in rows]
+
+    def predict_batch(self, X):
+        X = np.ascontiguousarray(X, dtype="<f8")
+        self.sock.sendall(self._request(OP_BATCH, ROWS.pack(len(X)) + X.tobytes()))
+        return np.frombuffer(self._response(), dtype="<f8")
+
+    def ping(self):
+        self.sock.sendall(self._request(OP_PING))
+        self._response()
+
+
+def benchmark(client, requests):
+    row = [8.3252, 41.0, 6.98, 1.02, 322.0, 2.55, 37.88, -122.23]
+    client.ping()
+    latencies = np.empty(requests)
+    for i in range(requests):
+        started = time.perf_counter_ns()
+        client.predict(row)
+        latencies[i] = time.perf_counter_ns() - started
+    print(f"predict round trip: p50 {np.percentile(latencies, 50) / 1000:.1f} µs, "
+          f"p99 {np.percentile(latencies, 99) / 1000:.1f} µs")
+
+    started = time.perf_counter()
+    client.predict_many([row] * requests)
+    elapsed = time.perf_counter() - started
+    print(f"pipelined: {requests / elapsed:,.0f} predictions/s ({elapsed / requests * 1e6:.1f} µs each)")
+
+    X = np.tile(row, (10000, 1))
+    started = time.perf_counter()
+    client.predict_batch(X)
+    print(f"batch of 10000: {(time.perf_counter() - started) * 1000:.2f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Binary prediction protocol server and benchmark")
+    parser.add_argument("command", choices=["serve", "bench"])
+    parser.add_argument("--unix", help="Unix socket path")
+    parser.add_argument("--tcp", help="host:port")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--max-batch-rows", type=int, default=MAX_BATCH_ROWS)
+    args = parser.parse_args(argv)
+    if not args.unix and not args.tcp:
+        parser.error("--unix or --tcp is required")
+    host, _, port = (args.tcp or "").rpartition(":")
+
+    if args.command == "bench":
+        client = BinaryClient(args.unix, host or "127.0.0.1", int(port) if port else None)
+        try:
+            benchmark(client, args.requests)
+        finally:
+            client.close()
+        return
+
+    # Standalone: its own copy of the service state (history is shared only when mounted in the app)
+    from routers import state
+
+    async def serve():
+        servers = await start_server(state, args.unix, host or "127.0.0.1", int(port) if port else None,
+                                     max_batch_rows=args.max_batch_rows)
+        print(f"🚀 Binary protocol listening on {args.unix or args.tcp}")
+        await asyncio.gather(*(server.serve_forever() for server in servers))
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
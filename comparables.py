@@ -0,0 +1,199 @@
+# Comparable-properties search over a KD-tree of reference block groups
+import heapq
+import json
+import math
+import os
+
+import numpy as np
+
+from housing_data import FEATURE_NAMES, load_dataset
+
+# Search space: latitude/longitude in degrees plus standardized features down-weighted so
+# that one standard deviation counts about as much as 0.1° (~10 km) of distance
+SEARCH_FEATURES = ["Latitude", "Longitude", "MedInc", "HouseAge", "AveRooms", "AveOccup"]
+FEATURE_WEIGHT = 0.1
+
+ARRAY_NAMES = ["points", "features", "prices", "lo", "hi", "start", "end", "left", "right"]
+
+
+class ComparablesIndex:
+    """KD-tree over reference block groups, stored as flat arrays.
+
+    Points are reordered so every node covers a contiguous slice [start, end),
+    and each node keeps its bounding box (lo, hi) for pruning. All arrays can be
+    saved as .npy files and opened again by memory map.
+    """
+
+    def __init__(self, points, features, prices, lo, hi, start, end, left, right, offset, scale):
+        # np.asarray drops the memmap subclass (and its per-op overhead) without copying
+        self.points = np.asarray(points)
+        self.features = np.asarray(features)
+        self.prices = np.asarray(prices)
+        self.lo = np.asarray(lo)
+        self.hi = np.asarray(hi)
+        self.start = np.asarray(start)
+        self.end = np.asarray(end)
+        self.left = np.asarray(left)
+        self.right = np.asarray(right)
+        # Tree topology is tiny; plain lists are much faster to index from Python
+        self._start = self.start.tolist()
+        self._end = self.end.tolist()
+        self._left = self.left.tolist()
+        self._right = self.right.tolist()
+        self.offset = np.asarray(offset, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self._columns = [FEATURE_NAMES.index(name) for name in SEARCH_FEATURES]
+
+    @classmethod
+    def build(cls, X, y, leaf_size=64):
+        """Build the tree from raw features X (n x 8) and prices y (in $100k)"""
+        X = np.asarray(X, dtype=np.float64)
+        columns = [FEATURE_NAMES.index(name) for name in SEARCH_FEATURES]
+        raw = X[:, columns]
+        offset = np.zeros(len(columns))
+        scale = np.ones(len(columns))
+        offset[2:] = raw[:, 2:].mean(axis=0)
+        scale[2:] = FEATURE_WEIGHT / np.maximum(raw[:, 2:].std(axis=0), 1e-12)
+        points = (raw - offset) * scale
+
+        order = np.arange(len(points))
+        lo, hi, start, end, left, right = [], [], [], [], [], []
+
+        def build_node(s, e):
+            node = len(start)
+            block = points[order[s:e]]
+            lo.append(block.min(axis=0))
+            hi.append(block.max(axis=0))
+            start.append(s)
+            end.append(e)
+            left.append(-1)
+            right.append(-1)
+            if e - s > leaf_size:
+                dim = int(np.argmax(hi[node] - lo[node]))
+                mid = (s + e) // 2
+                idx = order[s:e]
+                order[s:e] = idx[np.argpartition(points[idx, dim], mid - s)]
+                left[node] = build_node(s, mid)
+                right[node] = build_node(mid, e)
+            return node
+
+        build_node(0, len(points))
+        return cls(
+            np.ascontiguousarray(points[order]), np.ascontiguousarray(X[order]),
+            np.ascontiguousarray(np.asarray(y, dtype=np.float64)[order]),
+            np.array(lo), np.array(hi),
+            np.array(start, dtype=np.int64), np.array(end, dtype=np.int64),
+            np.array(left, dtype=np.int64), np.array(right, dtype=np.int64),
+            offset, scale
+        )
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for name in ARRAY_NAMES:
+            np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(directory, "manifest.json"), "w") as f:
+            json.dump({
+                "search_features": SEARCH_FEATURES,
+                "offset": self.offset.tolist(),
+                "scale": self.scale.tolist(),
+                "size": len(self.points)
+            }, f)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Open a saved index; with mmap the arrays are paged in lazily and shared between processes"""
+        with open(os.path.join(directory, "manifest.json")) as f:
+            manifest = json.load(f)
+        if manifest["search_features"] != SEARCH_FEATURES:
+            raise ValueError(f"{directory} was built for different search features")
+        arrays = [np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r" if mmap else None)
+                  for name in ARRAY_NAMES]
+        return cls(*arrays, manifest["offset"], manifest["scale"])
+
+    def __len__(self):
+        return len(self.points)
+
+    def transform(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        return (X[:, self._columns] - self.offset) * self.scale
+
+    def _query_point(self, q, k):
+        best_dist = np.full(k, np.inf)
+        best_idx = np.full(k, -1, dtype=np.int64)
+        heap = [(0.0, 0)]
+        while heap:
+            bound, node = heapq.heappop(heap)
+            if bound >= best_dist[-1]:
+                break
+            left = self._left[node]
+            if left < 0:
+                s, e = self._start[node], self._end[node]
+                dist = ((self.points[s:e] - q) ** 2).sum(axis=1)
+                cand_dist = np.concatenate([best_dist, dist])
+                cand_idx = np.concatenate([best_idx, np.arange(s, e)])
+                keep = np.argpartition(cand_dist, k - 1)[:k]
+                keep = keep[np.argsort(cand_dist[keep])]
+                best_dist, best_idx = cand_dist[keep], cand_idx[keep]
+                continue
+            # Bound both children with a single vectorized op
+            right = self._right[node]
+            children = [left, right]
+            gap = np.maximum(self.lo[children] - q, 0) + np.maximum(q - self.hi[children], 0)
+            left_bound, right_bound = (gap * gap).sum(axis=1).tolist()
+            worst = best_dist[-1]
+            if left_bound < worst:
+                heapq.heappush(heap, (left_bound, left))
+            if right_bound < worst:
+                heapq.heappush(heap, (right_bound, right))
+        return best_idx, best_dist
+
+    def query(self, X, k=5):
+        """k nearest reference rows for each input row: (indices, squared distances), each rows x k"""
+        k = max(1, min(k, len(self.points)))
+        Q = self.transform(X)
+        indices = np.empty((len(Q), k), dtype=np.int64)
+        distances = np.empty((len(Q), k))
+        for i, q in enumerate(Q):
+            indices[i], distances[i] = self._query_point(q, k)
+        return indices, distances
+
+    def find(self, X, k=5):
+        """Comparable properties for each input row, ready to return from the API"""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        indices, _ = self.query(X, k)
+        results = []
+        for row, neighbours in zip(X, indices):
+            comparables = []
+            for idx in neighbours:
+                features = self.features[idx]
+                comparables.append({
+                    "price": round(float(self.prices[idx]) * 100000, 2),
+                    "distance_km": round(haversine_km(row[6], row[7], features[6], features[7]), 2),
+                    "features": dict(zip(FEATURE_NAMES, features.tolist()))
+                })
+            results.append(comparables)
+        return results
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 6371.0 * 2 * math.asin(math.sqrt(a))
+
+
+def load_comparables(index_dir="comparables_index", data_path=None):
+    """Open the saved index, building it from the reference CSV on first start"""
+    try:
+        if os.path.exists(os.path.join(index_dir, "manifest.json")):
+            return ComparablesIndex.load(index_dir)
+        if data_path and os.path.exists(data_path):
+            X, y = load_dataset(data_path)
+            ComparablesIndex.build(X, y).save(index_dir)
+            return ComparablesIndex.load(index_dir)
+    except Exception as e:
+        print(f"❌ Error loading comparables index: {e}")
+    return None
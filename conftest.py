@@ -0,0 +1,44 @@
+# Stubs and fixtures shared by the test modules (run the suite with: python -m pytest)
+import numpy as np
+import pytest
+
+# The sample property used throughout the README
+ROW = [8.3252, 41.0, 6.98, 1.02, 322.0, 2.55, 37.88, -122.23]
+
+
+class StubLinearModel:
+    """Linear model with just what the subsystems read: coefficients, intercept, predict and predict_batch.
+
+    Coefficients are kept in the container they are given, so a list-based
+    model such as state.SimplePredictionModel can be mimicked too.
+    """
+
+    def __init__(self, coefficients, intercept):
+        self.coefficients = coefficients
+        self.intercept = intercept
+
+    def predict(self, features):
+        return [float(np.dot(features, self.coefficients) + self.intercept)]
+
+    def predict_batch(self, X):
+        return np.asarray(X, dtype=np.float64) @ np.asarray(self.coefficients, dtype=np.float64) + self.intercept
+
+
+def last_recorded():
+    """Newest prediction history entry; the history is capped, so its length can't show an append"""
+    from routers import state
+    return state.prediction_history[-1] if state.prediction_history else None
+
+
+@pytest.fixture(scope="module")
+def unthrottled():
+    """Lift the app's shared rate limiter for a module's test client, restoring it afterwards.
+
+    Every request comes from the same "testclient" peer, which would otherwise
+    run out of its burst partway through a module.
+    """
+    from routers import state
+    limits = state.rate_limiter.rate, state.rate_limiter.burst
+    state.rate_limiter.rate = state.rate_limiter.burst = 1e9
+    yield
+    state.rate_limiter.rate, state.rate_limiter.burst = limits
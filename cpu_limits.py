@@ -0,0 +1,37 @@
+# CPU budget of this process: scheduler affinity capped by the container's cgroup quota
+import math
+import os
+
+
+def cgroup_cpu_limit():
+    """CPU quota from cgroups (v2 cpu.max or v1 cfs quota), or None if unlimited"""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def available_cpus():
+    """Cores this process may run on, capped by the container's CPU quota"""
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cores = os.cpu_count() or 1
+    quota = cgroup_cpu_limit()
+    if quota:
+        cores = min(cores, max(1, math.ceil(quota)))
+    return cores
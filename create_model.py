@@ -1,6 +1,12 @@
 # Script to create a simple house price prediction model without scikit-learn
-import joblib
+# Usage: python create_model.py [california_housing.csv [--regional] [--pipeline]]
+import sys
 import numpy as np
+from housing_data import load_dataset
+from prediction_intervals import PredictionIntervals
+from regional_model import RegionalLinearModel
+from feature_pipeline import PipelineLinearModel
+from linear_model import LinearModel
 
 class SimpleHousePriceModel:
     """Simple linear regression model without scikit-learn dependency"""
@@ -29,6 +35,17 @@ class SimpleHousePriceModel:
         predictions = np.dot(X, self.coefficients) + self.intercept
         return predictions
     
+    def fit(self, X, y):
+        """Fit coefficients by least squares and keep the stats needed for prediction intervals"""
+        X = np.asarray(X, dtype=float)
+        Z = np.hstack([X, np.ones((X.shape[0], 1))])
+        theta, *_ = np.linalg.lstsq(Z, y, rcond=None)
+        self.coefficients = theta[:-1]
+        self.intercept = float(theta[-1])
+        self.feature_means = X.mean(axis=0)
+        self.interval_stats = PredictionIntervals.from_training_data(X, y, self.predict(X)).to_dict()
+        return self
+    
     def score(self, X, y):
         """Calculate R² score"""
         predictions = self.predict(X)
@@ -40,13 +57,39 @@ class SimpleHousePriceModel:
 print("Creating simple house price prediction model...")
 model = SimpleHousePriceModel()
 
+# Refit on real data when a dataset is given, so the model can report prediction intervals
+if len(sys.argv) > 1:
+    print(f"Fitting model on {sys.argv[1]}...")
+    X, y = load_dataset(sys.argv[1])
+    model.fit(X, y)
+    print(f"Training R²: {model.score(X, y):.4f}")
+    PredictionIntervals.from_model(model).save("model_stats.json")
+    print("Interval statistics saved to model_stats.json")
+
+    # Per-region coefficients, served with MODEL_PATH=regional_model.json
+    if "--regional" in sys.argv:
+        regional = RegionalLinearModel.from_global(model.coefficients, model.intercept).fit(X, y)
+        residuals = y - regional.predict_batch(X)
+        print(f"Regional model R²: {1 - np.sum(residuals ** 2) / np.sum((y - y.mean()) ** 2):.4f} (rows per region: {regional.region_rows})")
+        regional.save("regional_model.json")
+        print("Regional model saved to regional_model.json")
+
+    # Linear model over engineered features (ratios, logs, distances), served with MODEL_PATH=pipeline_model.json
+    if "--pipeline" in sys.argv:
+        pipeline_model = PipelineLinearModel().fit(X, y)
+        residuals = y - pipeline_model.predict_batch(X)
+        print(f"Pipeline model R²: {1 - np.sum(residuals ** 2) / np.sum((y - y.mean()) ** 2):.4f} ({len(pipeline_model.pipeline.output_names)} features)")
+        pipeline_model.save("pipeline_model.json")
+        print("Pipeline model saved to pipeline_model.json")
+
 # Test with sample data
 sample_data = [8.3252, 41.0, 6.98, 1.02, 322.0, 2.55, 37.88, -122.23]
 sample_prediction = model.predict([sample_data])
 print(f"Sample prediction for {sample_data}: ${sample_prediction[0]*100000:.2f}")
 
-# Save the model
-print("Saving model to house_model.pkl...")
-joblib.dump(model, "house_model.pkl")
+# Save the model in the JSON format the app loads (linear_model.json is served by default);
+# model_stats.json only applies to exactly these coefficients
+print("Saving model to linear_model.json...")
+LinearModel(model.coefficients, model.intercept, getattr(model, "feature_means", None)).save("linear_model.json")
 print("Model saved successfully!")
 print("✅ No scikit-learn dependency required!")
\ No newline at end of file
@@ -0,0 +1,227 @@
+# K-fold cross-validation and ridge hyperparameter search on a process pool sharing one copy of the data
+# Usage: python cross_validation.py california_housing.csv [--folds 5] [--alphas 0,0.1,1,10] [--features raw,pipeline] [--workers N] [--scaling] [--json results.json]
+import argparse
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from cpu_limits import available_cpus
+from feature_pipeline import FeaturePipeline
+from housing_data import load_dataset
+
+FEATURE_SETS = ("raw", "pipeline")
+DEFAULT_ALPHAS = (0.0, 0.1, 1.0, 10.0, 100.0, 1000.0)
+
+# Worker-side views of the shared dataset
+_shared = None
+_X = _y = _folds = None
+
+
+class SharedDataset:
+    """Features and target in one shared memory block.
+
+    The parent loads the CSV once; pool workers attach by name and wrap the
+    same pages in numpy arrays, so no process ever receives a pickled copy.
+    Fold ids are not stored: each worker rebuilds them from the seed.
+    """
+
+    def __init__(self, X, y, folds, seed=0):
+        X = np.asarray(X, dtype=np.float64)
+        self.rows = len(X)
+        self.folds = folds
+        self.seed = seed
+        self.shm = shared_memory.SharedMemory(create=True, size=self.rows * 9 * 8)
+        data = np.ndarray((self.rows, 9), dtype=np.float64, buffer=self.shm.buf)
+        data[:, :8] = X
+        data[:, 8] = y
+        del data
+
+    def normal_equations(self, features):
+        data = np.ndarray((self.rows, 9), dtype=np.float64, buffer=self.shm.buf)
+        try:
+            return normal_equations(features, data[:, :8], data[:, 8])
+        finally:
+            del data
+
+    @property
+    def spec(self):
+        return self.shm.name, self.rows, self.folds, self.seed
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+def fold_ids(rows, folds, seed=0):
+    """Shuffled, balanced fold assignment; every process derives the same one from the seed"""
+    ids = np.empty(rows, dtype=np.int16)
+    ids[np.random.default_rng(seed).permutation(rows)] = np.arange(rows) % folds
+    return ids
+
+
+def _attach(name, rows, folds, seed):
+    global _shared, _X, _y, _folds
+    _shared = shared_memory.SharedMemory(name=name)
+    data = np.ndarray((rows, 9), dtype=np.float64, buffer=_shared.buf)
+    _X, _y = data[:, :8], data[:, 8]
+    _folds = fold_ids(rows, folds, seed)
+
+
+def design(features, X):
+    """Design matrix rows for `X`: raw or pipeline features plus an intercept column"""
+    if features == "pipeline":
+        # Unstandardized pipeline output; the ridge penalty in evaluate_fold does the scaling
+        derived = FeaturePipeline().transform(X)
+    else:
+        derived = X
+    Z = np.empty((len(X), derived.shape[1] + 1))
+    Z[:, :-1] = derived
+    Z[:, -1] = 1.0
+    return Z
+
+
+def normal_equations(features, X, y, chunk_rows=65536):
+    """Full-data Gram matrix Z'Z and moment Z'y, built a chunk of rows at a time"""
+    gram = moment = 0.0
+    for start in range(0, len(X), chunk_rows):
+        Z = design(features, X[start:start + chunk_rows])
+        gram = gram + Z.T @ Z
+        moment = moment + Z.T @ y[start:start + chunk_rows]
+    return gram, moment
+
+
+def evaluate_fold(features, fold, alphas, gram, moment):
+    """Fit every alpha on all rows but `fold` and score on `fold`.
+
+    `gram` and `moment` are the full-data normal equations, computed once in the
+    parent. Training normal equations are those minus the held-out rows'
+    contribution, so a fold only builds the design rows it scores, then costs one
+    small Gram product plus a (p x p) solve per alpha. Alpha is the ridge penalty on standardized features: each coefficient
+    is penalized by its training-fold variance, read off the Gram matrix because
+    its last row holds the column sums.
+    """
+    started = time.perf_counter()
+    test = _folds == fold
+    Zt, yt = design(features, _X[test]), _y[test]
+    train_gram = gram - Zt.T @ Zt
+    train_moment = moment - Zt.T @ yt
+    n = train_gram[-1, -1]
+    variance = (np.diag(train_gram)[:-1] - train_gram[:-1, -1] ** 2 / n) / n
+    penalty = np.append(np.maximum(variance, 0), 0.0)
+
+    results = []
+    for alpha in alphas:
+        theta = np.linalg.lstsq(train_gram + np.diag(alpha * penalty), train_moment, rcond=None)[0]
+        residuals = yt - Zt @ theta
+        results.append({
+            "features": features,
+            "alpha": alpha,
+            "fold": fold,
+            "rows": int(test.sum()),
+            "r2": float(1 - residuals @ residuals / np.sum((yt - yt.mean()) ** 2)),
+            "rmse": float(np.sqrt(np.mean(residuals ** 2))),
+            "mae": float(np.mean(np.abs(residuals)))
+        })
+    return results, time.perf_counter() - started
+
+
+def search(dataset, alphas, feature_sets, workers):
+    """Per-fold metrics for every (feature set, alpha), one pool task per (feature set, fold)"""
+    started = time.perf_counter()
+    # p x p per feature set: workers receive these instead of each rebuilding the full design matrix
+    equations = {features: dataset.normal_equations(features) for features in feature_sets}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=dataset.spec) as pool:
+        futures = [pool.submit(evaluate_fold, features, fold, alphas, *equations[features])
+                   for features in feature_sets for fold in range(dataset.folds)]
+        outcomes = [future.result() for future in futures]
+    results = [row for rows, _ in outcomes for row in rows]
+    return results, {
+        "workers": workers,
+        "wall_seconds": round(time.perf_counter() - started, 3),
+        "task_seconds": round(sum(seconds for _, seconds in outcomes), 3)
+    }
+
+
+def summarize(results):
+    """Mean and spread of each metric across folds, best (highest mean R²) first"""
+    groups = {}
+    for row in results:
+        groups.setdefault((row["features"], row["alpha"]), []).append(row)
+    summary = []
+    for (features, alpha), rows in groups.items():
+        entry = {"features": features, "alpha": alpha}
+        for metric in ("r2", "rmse", "mae"):
+            values = np.array([row[metric] for row in rows])
+            entry[metric] = round(float(values.mean()), 4)
+            entry[f"{metric}_std"] = round(float(values.std()), 4)
+        summary.append(entry)
+    return sorted(summary, key=lambda entry: -entry["r2"])
+
+
+def scaling_counts(cpus):
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus:
+        counts.append(cpus)
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cross-validate ridge regression settings in parallel")
+    parser.add_argument("csv")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--alphas", default=",".join(map(str, DEFAULT_ALPHAS)))
+    parser.add_argument("--features", default="raw,pipeline", help=f"comma-separated, from {', '.join(FEATURE_SETS)}")
+    parser.add_argument("--workers", type=int, default=available_cpus())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scaling", action="store_true", help="repeat the search with 1, 2, 4 ... workers and report speedup")
+    parser.add_argument("--json", help="write per-fold results, summary and timings to this file")
+    args = parser.parse_args(argv)
+
+    alphas = [float(alpha) for alpha in args.alphas.split(",")]
+    feature_sets = args.features.split(",")
+    unknown = [name for name in feature_sets if name not in FEATURE_SETS]
+    if unknown or args.folds < 2 or any(alpha < 0 for alpha in alphas):
+        parser.error("--features must be from raw,pipeline, --folds at least 2 and alphas non-negative")
+
+    X, y = load_dataset(args.csv)
+    dataset = SharedDataset(X, y, args.folds, args.seed)
+    print(f"Loaded {len(X)} rows into shared memory ({dataset.shm.size / 1e6:.1f} MB)")
+    try:
+        results, timing = search(dataset, alphas, feature_sets, max(1, args.workers))
+        timings = [timing]
+        if args.scaling:
+            timings = [search(dataset, alphas, feature_sets, workers)[1] for workers in scaling_counts(available_cpus())]
+    finally:
+        dataset.close()
+
+    print(f"\n{'features':<10} {'alpha':>8} {'fold':>5} {'rows':>7} {'r2':>8} {'rmse':>8} {'mae':>8}")
+    for row in results:
+        print(f"{row['features']:<10} {row['alpha']:>8g} {row['fold']:>5} {row['rows']:>7} {row['r2']:>8.4f} {row['rmse']:>8.4f} {row['mae']:>8.4f}")
+
+    summary = summarize(results)
+    print(f"\n{'features':<10} {'alpha':>8} {'r2':>16} {'rmse':>16} {'mae':>16}")
+    for entry in summary:
+        print(f"{entry['features']:<10} {entry['alpha']:>8g} "
+              + " ".join(f"{entry[m]:>8.4f} ±{entry[m + '_std']:<6.4f}" for m in ("r2", "rmse", "mae")))
+
+    baseline = timings[0]["wall_seconds"]
+    print(f"\n{'workers':>7} {'wall_s':>8} {'speedup':>8}")
+    for timing in timings:
+        timing["speedup"] = round(baseline / timing["wall_seconds"], 2) if timing["wall_seconds"] else None
+        print(f"{timing['workers']:>7} {timing['wall_seconds']:>8.3f} {timing['speedup']:>8}")
+
+    best = summary[0]
+    print(f"\n✅ Best: features={best['features']} alpha={best['alpha']:g} (mean R² {best['r2']:.4f})")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"folds": results, "summary": summary, "timings": timings}, f, indent=2)
+        print(f"Results saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
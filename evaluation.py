@@ -0,0 +1,170 @@
+# Holdout evaluation: accuracy metrics overall and per market region, accumulated chunk by chunk
+# Usage: python evaluation.py holdout.csv [--model model.json] [--chunk-size 65536] [--json report.json] [--baseline old_report.json]
+import argparse
+import json
+import time
+
+import numpy as np
+
+from housing_data import REGIONS, load_dataset, region_codes
+from model_utils import load_model, model_fingerprint, predict_rows
+
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+CHUNK_SIZE = 65536
+# Residual histogram used for quantiles, binned on sign(r) * log1p(|r| / $100): about $1
+# resolution near zero and 1% relative resolution out to +-$50 billion
+RESIDUAL_SCALE = 100.0
+LOG_BIN_WIDTH = 0.01
+LOG_RANGE = 20.0
+
+
+class EvaluationReport:
+    """Running totals for holdout metrics, per region, that never keep the rows.
+
+    Each update() scores one chunk with a handful of bincounts keyed by region
+    code, so any number of chunks can stream through in constant memory.
+    Sums of the target are taken around the first chunk's mean to keep R²
+    accurate over millions of rows. Residual quantiles come from a fixed
+    log-spaced histogram and are accurate to about 1%.
+    """
+
+    def __init__(self, quantiles=DEFAULT_QUANTILES):
+        self.quantiles = tuple(quantiles)
+        self.bins = int(2 * LOG_RANGE / LOG_BIN_WIDTH)
+        groups = len(REGIONS)
+        self.count = np.zeros(groups, dtype=np.int64)
+        self.mape_count = np.zeros(groups, dtype=np.int64)
+        # Per region: residual, squared residual, |residual|, |residual| / |actual|, shifted actual, its square
+        self.sums = np.zeros((6, groups))
+        self.histogram = np.zeros((groups, self.bins), dtype=np.int64)
+        self.shift = None
+
+    def update(self, actual, predicted, codes):
+        """Add one chunk: actual and predicted prices (same unit) and region codes"""
+        actual = np.asarray(actual, dtype=np.float64)
+        predicted = np.asarray(predicted, dtype=np.float64)
+        if self.shift is None:
+            self.shift = float(actual.mean()) if len(actual) else 0.0
+        groups = len(REGIONS)
+        residual = actual - predicted
+        absolute = np.abs(residual)
+        nonzero = actual != 0
+        relative = np.divide(absolute, np.abs(actual), out=np.zeros_like(absolute), where=nonzero)
+        centered = actual - self.shift
+
+        self.count += np.bincount(codes, minlength=groups)
+        self.mape_count += np.bincount(codes, weights=nonzero, minlength=groups).astype(np.int64)
+        for row, weights in enumerate((residual, residual * residual, absolute, relative, centered, centered * centered)):
+            self.sums[row] += np.bincount(codes, weights=weights, minlength=groups)
+
+        scaled = np.log1p(absolute * (1 / RESIDUAL_SCALE))
+        np.copysign(scaled, residual, out=scaled)
+        scaled += LOG_RANGE
+        scaled *= 1 / LOG_BIN_WIDTH
+        cell = scaled.astype(np.int64)
+        np.clip(cell, 0, self.bins - 1, out=cell)
+        cell += codes.astype(np.int64) * self.bins
+        self.histogram += np.bincount(cell, minlength=groups * self.bins).reshape(groups, self.bins)
+        return self
+
+    def _metrics(self, count, mape_count, sums, histogram):
+        if count == 0:
+            return {"count": 0}
+        residual, squared, absolute, relative, centered, centered_squared = sums
+        total = centered_squared - centered * centered / count
+        # Quantiles by linear interpolation within the histogram bin holding each rank
+        cumulative = np.cumsum(histogram)
+        ranks = np.asarray(self.quantiles) * count
+        cells = np.minimum(np.searchsorted(cumulative, ranks), self.bins - 1)
+        before = np.where(cells > 0, cumulative[cells - 1], 0)
+        fraction = (ranks - before) / np.maximum(histogram[cells], 1)
+        scaled = (cells + np.clip(fraction, 0, 1)) * LOG_BIN_WIDTH - LOG_RANGE
+        values = np.sign(scaled) * np.expm1(np.abs(scaled)) * RESIDUAL_SCALE
+        return {
+            "count": int(count),
+            "r2": round(float(1 - squared / total), 4) if total > 0 else None,
+            "mae": round(float(absolute / count), 2),
+            "rmse": round(float(np.sqrt(squared / count)), 2),
+            "mape": round(float(100 * relative / mape_count), 2) if mape_count else None,
+            "bias": round(float(residual / count), 2),
+            "residual_quantiles": {str(q): round(float(v), 2) for q, v in zip(self.quantiles, values)}
+        }
+
+    def to_dict(self):
+        return {
+            "rows": int(self.count.sum()),
+            "overall": self._metrics(self.count.sum(), self.mape_count.sum(), self.sums.sum(axis=1), self.histogram.sum(axis=0)),
+            "regions": {
+                key: {"name": name, **self._metrics(self.count[code], self.mape_count[code], self.sums[:, code], self.histogram[code])}
+                for code, (key, name) in enumerate(REGIONS)
+            }
+        }
+
+
+def evaluate(model, X, y, chunk_size=CHUNK_SIZE, scale=100000, report=None):
+    """Score (X, y) in chunks; y and the model's output are in $100k, metrics in dollars.
+
+    X and y may be memory-mapped (see housing_data.load_dataset): only the
+    current chunk is paged in.
+    """
+    report = report or EvaluationReport()
+    for start in range(0, len(X), chunk_size):
+        chunk = np.asarray(X[start:start + chunk_size], dtype=np.float64)
+        predicted = predict_rows(model, chunk) * scale
+        actual = np.asarray(y[start:start + chunk_size], dtype=np.float64) * scale
+        report.update(actual, predicted, region_codes(chunk[:, 6], chunk[:, 7]))
+    return report
+
+
+def model_summary(model):
+    return {"type": type(model).__name__, "fingerprint": model_fingerprint(model)}
+
+
+def compare(report, baseline):
+    """Overall metric changes against a previous report (negative MAE/RMSE/MAPE is better)"""
+    current, previous = report["overall"], baseline["overall"]
+    return {
+        metric: round(current[metric] - previous[metric], 4)
+        for metric in ("r2", "mae", "rmse", "mape", "bias")
+        if current.get(metric) is not None and previous.get(metric) is not None
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate a model on a holdout CSV, overall and per region")
+    parser.add_argument("csv")
+    parser.add_argument("--model", help="exported model (.json/.npz); defaults to the served model (MODEL_PATH)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--baseline", help="earlier report to compare against")
+    args = parser.parse_args(argv)
+
+    if args.model:
+        model = load_model(args.model)
+    else:
+        from routers.state import model
+
+    started = time.perf_counter()
+    X, y = load_dataset(args.csv)
+    report = {
+        "model": model_summary(model),
+        "source": args.csv,
+        **evaluate(model, X, y, max(1, args.chunk_size)).to_dict(),
+    }
+    report["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report["baseline"] = {"model": baseline.get("model"), "change": compare(report, baseline)}
+
+    output = json.dumps(report, indent=2)
+    if args.json:
+        with open(args.json, "w") as f:
+            f.write(output)
+        print(f"Report saved to {args.json}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# Persistent cache of UI example outputs, keyed by model version and example content
+import hashlib
+import json
+import os
+import threading
+
+
+class ExampleCache:
+    """Precomputed outputs for the Gradio examples.
+
+    Entries survive restarts in a JSON file and are only valid for the model
+    version they were computed with. Only the current version's entries are
+    kept: a lookup or warm for a newer version drops the rest. A cold start
+    reuses everything that is still current and recomputes just the stale
+    examples in the background. Writes to the file happen on a background
+    thread, never on the request path.
+    """
+
+    def __init__(self, fn, path):
+        self.fn = fn
+        self.path = path
+        self.version = None
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.save_errors = 0
+        self._lock = threading.Lock()
+        self._saving = False
+        self._save_again = False
+        self._load()
+
+    @staticmethod
+    def key(example):
+        # Gradio hands back ints for precision=0 fields, so normalize numbers first
+        normalized = [float(v) if isinstance(v, (int, float)) else v for v in example]
+        return hashlib.sha256(json.dumps(normalized).encode()).hexdigest()[:24]
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                saved = json.load(f)
+            self.version, self.entries = saved["version"], dict(saved["entries"])
+        except (OSError, ValueError, KeyError, TypeError):
+            self.version, self.entries = None, {}
+
+    def _use_version(self, version):
+        """Switch to `version`, dropping every entry computed for another one (call with the lock held)"""
+        if version != self.version:
+            self.version = version
+            self.entries = {}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock:
+            snapshot = {"version": self.version, "entries": dict(self.entries)}
+        # Unique per process and thread: serve.py workers and warm-up threads may save at the same time
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, self.path)
+
+    def _schedule_save(self):
+        """Save on a background thread; misses that arrive meanwhile are folded into one more save"""
+        with self._lock:
+            if self._saving:
+                self._save_again = True
+                return
+            self._saving = True
+        threading.Thread(target=self._save_in_background, name="example-cache-save", daemon=True).start()
+
+    def _save_in_background(self):
+        while True:
+            try:
+                self.save()
+            except OSError as e:
+                self.save_errors += 1
+                print(f"❌ Could not save example cache to {self.path}: {e}")
+            with self._lock:
+                if not self._save_again:
+                    self._saving = False
+                    return
+                self._save_again = False
+
+    def lookup(self, version, example):
+        """Cached output for an example, computing it on a miss (saved to disk in the background)"""
+        key = self.key(example)
+        with self._lock:
+            self._use_version(version)
+            output = self.entries.get(key)
+        if output is not None:
+            self.hits += 1
+            return output
+        self.misses += 1
+        output = self.fn(*example)
+        with self._lock:
+            if self.version == version:
+                self.entries[key] = output
+        self._schedule_save()
+        return output
+
+    def warm(self, version, examples):
+        """Drop entries for other versions and examples, and recompute missing ones off the startup path"""
+        keys = {self.key(example): example for example in examples}
+        with self._lock:
+            self._use_version(version)
+            self.entries = {key: output for key, output in self.entries.items() if key in keys}
+        stale = [example for key, example in keys.items() if key not in self.entries]
+        if not stale:
+            return None
+
+        def recompute():
+            for example in stale:
+                output = self.fn(*example)
+                with self._lock:
+                    if self.version != version:
+                        return
+                    self.entries[self.key(example)] = output
+            self._schedule_save()
+
+        thread = threading.Thread(target=recompute, name="example-cache-warm", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self):
+        return {"version": self.version, "entries": len(self.entries), "hits": self.hits, "misses": self.misses}
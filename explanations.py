@@ -0,0 +1,57 @@
+# Per-feature contribution explanations for linear models
+import numpy as np
+
+from housing_data import FEATURE_MEANS, FEATURE_NAMES
+
+
+class FeatureExplainer:
+    """Contribution of each feature relative to a baseline property.
+
+    For a linear model price(x) - price(baseline) = sum_j coef_j * (x_j - baseline_j),
+    so the contributions add up exactly to the difference from the baseline price.
+    """
+
+    def __init__(self, coefficients, intercept, baseline=FEATURE_MEANS):
+        self.coefficients = np.asarray(coefficients, dtype=np.float64)
+        self.baseline = np.asarray(baseline, dtype=np.float64)
+        self.baseline_prediction = float(self.baseline @ self.coefficients + intercept)
+
+    @classmethod
+    def from_model(cls, model):
+        """Build an explainer for linear models; other model types can't be explained this way"""
+        if not hasattr(model, "coefficients"):
+            return None
+        baseline = getattr(model, "feature_means", FEATURE_MEANS)
+        return cls(model.coefficients, model.intercept, baseline)
+
+    def contributions(self, X):
+        """(rows x features) contribution matrix in model units, as one broadcast multiply"""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        return (X - self.baseline) * self.coefficients
+
+    def explain_batch(self, X, scale=100000):
+        """Explanations for a batch, contributions in dollars"""
+        contributions = np.round(self.contributions(X) * scale, 2).tolist()
+        baseline_price = round(self.baseline_prediction * scale, 2)
+        return [
+            {"baseline_price": baseline_price, "contributions": dict(zip(FEATURE_NAMES, row))}
+            for row in contributions
+        ]
+
+    def explain(self, features, scale=100000):
+        return self.explain_batch(features, scale)[0]
+
+
+_cached = (None, None)
+
+
+def explainer_for(model):
+    """Explainer for the active model, rebuilt only when a new model is published"""
+    global _cached
+    cached_model, explainer = _cached
+    if cached_model is not model:
+        explainer = FeatureExplainer.from_model(model)
+        _cached = (model, explainer)
+    return explainer
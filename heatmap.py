@@ -0,0 +1,119 @@
+# Precomputed price heatmap over California
+import hashlib
+import json
+import struct
+import threading
+import zlib
+
+import numpy as np
+
+from housing_data import CALIFORNIA_BOUNDS, FEATURE_MEANS
+from model_utils import model_fingerprint, predict_rows
+
+# Blue -> green -> yellow -> red, sampled at evenly spaced stops
+COLOR_STOPS = np.array([
+    [49, 54, 149], [69, 117, 180], [116, 173, 209], [171, 217, 233],
+    [254, 224, 144], [253, 174, 97], [244, 109, 67], [165, 0, 38]
+], dtype=np.float64)
+
+
+class PriceHeatmap:
+    """Model prices over a lat/lng grid, stored as a uint16 raster.
+
+    The grid is evaluated in one vectorized predict call with every other
+    feature held at a representative value. Rendered outputs are cached per
+    model version, and the raster is rebuilt when a different model is active.
+    """
+
+    def __init__(self, resolution=0.05, representative=FEATURE_MEANS, bounds=CALIFORNIA_BOUNDS):
+        self.resolution = resolution
+        self.representative = np.asarray(representative, dtype=np.float64)
+        self.bounds = bounds
+        self.lats = np.arange(bounds["lat_max"], bounds["lat_min"] - 1e-9, -resolution)
+        self.lngs = np.arange(bounds["lng_min"], bounds["lng_max"] + 1e-9, resolution)
+        self.model = None
+        self.version = None
+        self.raster = None
+        self.price_min = 0.0
+        self.price_step = 1.0
+        self._rendered = {}
+        self._lock = threading.Lock()
+
+    def build(self, model):
+        """Evaluate the model over the whole grid and quantize to uint16"""
+        lat_grid, lng_grid = np.meshgrid(self.lats, self.lngs, indexing="ij")
+        X = np.tile(self.representative, (lat_grid.size, 1))
+        X[:, 6] = lat_grid.ravel()
+        X[:, 7] = lng_grid.ravel()
+        prices = predict_rows(model, X).reshape(lat_grid.shape) * 100000
+
+        price_min, price_max = float(prices.min()), float(prices.max())
+        price_step = max(price_max - price_min, 1.0) / 65535
+        raster = np.round((prices - price_min) / price_step).astype(np.uint16)
+
+        with self._lock:
+            self.raster = raster
+            self.price_min = price_min
+            self.price_step = price_step
+            self.model = model
+            self.version = model_fingerprint(model)
+            self._rendered = {}
+
+    def ensure_current(self, model):
+        """Rebuild if the active model changed since the last build"""
+        if model is not self.model:
+            self.build(model)
+
+    def prices(self, step=1):
+        """Dollar prices, downsampled by averaging step x step blocks"""
+        with self._lock:
+            raster, price_min, price_step = self.raster, self.price_min, self.price_step
+        rows, cols = (raster.shape[0] // step) * step, (raster.shape[1] // step) * step
+        blocks = raster[:rows, :cols].reshape(rows // step, step, cols // step, step)
+        return price_min + blocks.mean(axis=(1, 3)) * price_step
+
+    def render(self, model, fmt="json", step=1):
+        """Rendered body and ETag for the requested output, cached per model version"""
+        self.ensure_current(model)
+        key = (self.version, fmt, step)
+        cached = self._rendered.get(key)
+        if cached is None:
+            prices = self.prices(step)
+            body = self._render_png(prices) if fmt == "png" else self._render_json(prices, step)
+            etag = hashlib.sha1(f"{key}".encode()).hexdigest()[:20]
+            cached = (body, f'"{etag}"')
+            self._rendered[key] = cached
+        return cached
+
+    def _render_json(self, prices, step):
+        return json.dumps({
+            "bounds": self.bounds,
+            "resolution": self.resolution * step,
+            "shape": list(prices.shape),
+            "origin": "top-left (north-west)",
+            "model_version": self.version,
+            "prices": np.round(prices, -2).astype(int).tolist()
+        }, separators=(",", ":")).encode()
+
+    def _render_png(self, prices):
+        # Stretch between the 2nd and 98th percentiles so outliers don't wash out the map
+        low, high = np.percentile(prices, [2, 98])
+        position = np.clip((prices - low) / max(high - low, 1.0), 0, 1) * (len(COLOR_STOPS) - 1)
+        index = np.minimum(position.astype(int), len(COLOR_STOPS) - 2)
+        fraction = (position - index)[..., None]
+        rgb = COLOR_STOPS[index] * (1 - fraction) + COLOR_STOPS[index + 1] * fraction
+        return encode_png(rgb.astype(np.uint8))
+
+
+def encode_png(rgb):
+    """Minimal RGB PNG encoder (no Pillow needed)"""
+    height, width, _ = rgb.shape
+    # Each scanline starts with filter type 0 (none)
+    scanlines = np.hstack([np.zeros((height, 1), dtype=np.uint8), rgb.reshape(height, -1)])
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(scanlines.tobytes(), 9)) + chunk(b"IEND", b""))
@@ -0,0 +1,188 @@
+# California housing dataset helpers shared by training and evaluation scripts
+import hashlib
+import itertools
+import json
+import os
+
+import numpy as np
+
+FEATURE_NAMES = ["MedInc", "HouseAge", "AveRooms", "AveBedrms", "Population", "AveOccup", "Latitude", "Longitude"]
+TARGET_NAME = "MedHouseVal"
+
+# Bump when the cache layout changes so stale caches are rebuilt
+DATASET_CACHE_VERSION = 1
+# CSV lines parsed at a time while building the cache
+CSV_CHUNK_ROWS = 65536
+
+# Dataset means, used as the reference point when no fitted baseline is available
+FEATURE_MEANS = np.array([3.8707, 28.6395, 5.4290, 1.0967, 1425.4767, 3.0707, 35.6319, -119.5697])
+
+CALIFORNIA_BOUNDS = {"lat_min": 32.5, "lat_max": 42.0, "lng_min": -124.5, "lng_max": -114.0}
+
+# Market regions as (key, display name); a region code is an index into this list
+REGIONS = [
+    ("bay_area", "San Francisco Bay Area"),
+    ("los_angeles", "Los Angeles Metropolitan"),
+    ("san_diego", "San Diego County"),
+    ("central_valley", "Central California")
+]
+
+
+def region_code(lat, lng):
+    if lat > 37.5 and lng < -122:
+        return 0
+    elif lat > 34 and lat < 37:
+        return 1
+    elif lat > 32.5 and lat < 34:
+        return 2
+    return 3
+
+
+def region_codes(lat, lng):
+    """Vectorized region_code for arrays of coordinates (int8 codes)"""
+    # Contiguous copies: comparisons on strided matrix columns are several times slower
+    lat, lng = np.ascontiguousarray(lat, dtype=float), np.ascontiguousarray(lng, dtype=float)
+    bay_area = (lat > 37.5) & (lng < -122)
+    los_angeles = (lat > 34) & (lat < 37)
+    san_diego = (lat > 32.5) & (lat < 34)
+    # The latitude bands are disjoint, so each row subtracts at most one term from 3
+    codes = np.full(lat.shape, 3, dtype=np.int8)
+    codes -= san_diego.view(np.int8)
+    codes -= 2 * los_angeles.view(np.int8)
+    codes -= 3 * bay_area.view(np.int8)
+    return codes
+
+def csv_columns(path):
+    """Positions of the feature and target columns in a housing CSV's header"""
+    with open(path) as f:
+        header = [name.strip() for name in f.readline().split(",")]
+    missing = [name for name in FEATURE_NAMES + [TARGET_NAME] if name not in header]
+    if missing:
+        raise ValueError(f"{path} is missing columns: {', '.join(missing)}")
+    return [header.index(name) for name in FEATURE_NAMES + [TARGET_NAME]]
+
+
+def count_rows(path):
+    """Data rows in a CSV (non-blank lines after the header), without parsing them"""
+    with open(path, "rb") as f:
+        f.readline()
+        return sum(1 for line in f if line.strip())
+
+
+def file_checksum(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_dataset_cache(path, cache_dir, chunk_rows=CSV_CHUNK_ROWS):
+    """Parse the CSV into columns.npy (one contiguous row per column) plus manifest.json.
+
+    A first pass counts the rows so columns.npy can be preallocated as a memory
+    map; the second parses chunk_rows lines at a time straight into it, so
+    memory use stays flat however large the CSV is.
+    """
+    usecols = csv_columns(path)
+    rows = count_rows(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write under temporary names and rename, so readers never see a half-written cache
+    data_path = os.path.join(cache_dir, "columns.npy")
+    tmp_path = f"{data_path}.{os.getpid()}.tmp"
+    columns = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float64, shape=(len(usecols), rows))
+    filled = 0
+    with open(path) as f:
+        f.readline()
+        while True:
+            lines = list(itertools.islice(f, chunk_rows))
+            if not lines:
+                break
+            chunk = np.loadtxt(lines, delimiter=",", usecols=usecols, ndmin=2)
+            if filled + len(chunk) > rows:
+                # More lines than counted: the CSV grew, so don't keep a truncated copy
+                filled += len(chunk)
+                break
+            columns[:, filled:filled + len(chunk)] = chunk.T
+            filled += len(chunk)
+    columns.flush()
+    del columns
+    if filled != rows:
+        os.unlink(tmp_path)
+        raise ValueError(f"{path} changed while it was being cached")
+    stat = os.stat(path)
+    manifest = {
+        "version": DATASET_CACHE_VERSION,
+        "columns": FEATURE_NAMES + [TARGET_NAME],
+        "rows": rows,
+        "source": os.path.abspath(path),
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "source_sha256": file_checksum(path),
+        "data_sha256": file_checksum(tmp_path)
+    }
+    os.replace(tmp_path, data_path)
+    write_manifest(cache_dir, manifest)
+    return manifest
+
+
+def write_manifest(cache_dir, manifest):
+    manifest_path = os.path.join(cache_dir, "manifest.json")
+    tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def read_manifest(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, "manifest.json")) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != DATASET_CACHE_VERSION or manifest.get("columns") != FEATURE_NAMES + [TARGET_NAME]:
+        return None
+    return manifest
+
+
+def cache_is_current(path, cache_dir, manifest):
+    """Same size and mtime as when cached, or (after a touch or copy) the same content"""
+    if not os.path.exists(path):
+        # Only the cache was shipped; trust it
+        return True
+    stat = os.stat(path)
+    if stat.st_size == manifest["source_size"] and stat.st_mtime_ns == manifest["source_mtime_ns"]:
+        return True
+    if stat.st_size != manifest["source_size"] or file_checksum(path) != manifest["source_sha256"]:
+        return False
+    manifest["source_mtime_ns"] = stat.st_mtime_ns
+    write_manifest(cache_dir, manifest)
+    return True
+
+
+def load_dataset(path, cache_dir=None, verify=False):
+    """Features (n x 8) and target for a housing CSV, memory-mapped from a columnar cache.
+
+    The first call parses the CSV into `<csv>.cache/` (or DATASET_CACHE_DIR);
+    later calls open the cache read-only by memory map, so loading is a few
+    system calls and the pages are shared by every process reading them. X is
+    a zero-copy transpose of the column-major file (each feature contiguous).
+    The cache is rebuilt when the source changes; verify=True also re-hashes
+    the cached data against the manifest checksum.
+    """
+    cache_dir = cache_dir or os.getenv("DATASET_CACHE_DIR") or f"{path}.cache"
+    manifest = read_manifest(cache_dir)
+    if manifest is None or not cache_is_current(path, cache_dir, manifest):
+        manifest = build_dataset_cache(path, cache_dir)
+
+    data_path = os.path.join(cache_dir, "columns.npy")
+    if verify and file_checksum(data_path) != manifest["data_sha256"]:
+        if not os.path.exists(path):
+            raise ValueError(f"{data_path} does not match its manifest checksum")
+        manifest = build_dataset_cache(path, cache_dir)
+    columns = np.load(data_path, mmap_mode="r")
+    if columns.shape != (len(FEATURE_NAMES) + 1, manifest["rows"]):
+        raise ValueError(f"{data_path} has shape {columns.shape}, expected {manifest['rows']} rows")
+    # np.asarray drops the memmap subclass (and its per-op overhead) without copying
+    columns = np.asarray(columns)
+    return columns[:-1].T, columns[-1]
@@ -0,0 +1,53 @@
+# Global linear model: one set of coefficients over the 8 raw features, as fitted by create_model.py
+import json
+
+import numpy as np
+
+from housing_data import FEATURE_MEANS
+
+FORMAT = "linear/v1"
+
+
+class LinearModel:
+    """price = x · coefficients + intercept, in units of $100k.
+
+    The exported form of create_model.py's least-squares fit. Online feedback,
+    explanations and prediction intervals all work on it; `feature_means` is the
+    training mean the explanations measure contributions from.
+    """
+
+    def __init__(self, coefficients, intercept, feature_means=None):
+        self.coefficients = np.ascontiguousarray(coefficients, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.feature_means = np.asarray(FEATURE_MEANS if feature_means is None else feature_means, dtype=np.float64)
+        if self.coefficients.shape != (8,) or self.feature_means.shape != (8,):
+            raise ValueError("Expected 8 coefficients and 8 feature means")
+
+    def predict(self, features):
+        """Single property (list of 8) -> [price]; a 2-D input is scored as a batch"""
+        X = np.asarray(features, dtype=np.float64)
+        if X.ndim == 2:
+            return self.predict_batch(X)
+        if X.shape != (8,):
+            raise ValueError("Expected 8 features")
+        return [float(X @ self.coefficients + self.intercept)]
+
+    def predict_batch(self, X):
+        return np.asarray(X, dtype=np.float64) @ self.coefficients + self.intercept
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            spec = json.load(f)
+        if spec.get("format") != FORMAT:
+            raise ValueError(f"{path} is not a {FORMAT} model")
+        return cls(spec["coefficients"], spec["intercept"], spec.get("feature_means"))
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump({
+                "format": FORMAT,
+                "coefficients": self.coefficients.tolist(),
+                "intercept": self.intercept,
+                "feature_means": self.feature_means.tolist()
+            }, f, indent=2)
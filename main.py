@@ -1,526 +1,19 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel, field_validator
-from typing import Optional, List, Dict
-import joblib
-import gradio as gr
-import uvicorn
-import numpy as np
+# Full application: the app factory's full profile, including the Gradio UI at /gradio
 import os
-import json
-import time
-from datetime import datetime
+from app_factory import create_app, preload as preload_routers
 
-class SimpleHousePriceModel:
-    """Simple linear regression model without scikit-learn dependency"""
-    
-    def __init__(self):
-        # Pre-trained coefficients based on California housing data analysis
-        # Features: MedInc, HouseAge, AveRooms, AveBedrms, Population, AveOccup, Latitude, Longitude
-        self.coefficients = np.array([
-            0.4379,   # MedInc - most important
-            0.0094,   # HouseAge  
-            -0.1073,  # AveRooms
-            0.6451,   # AveBedrms
-            -0.0000042,  # Population (very small effect)
-            -0.0377,  # AveOccup
-            -0.4213,  # Latitude
-            -0.4345   # Longitude
-        ])
-        self.intercept = 1.8856  # Adjusted for proper scale
-        
-    def predict(self, X):
-        """Make predictions using linear combination"""
-        X = np.array(X)
-        if X.ndim == 1:
-            X = X.reshape(1, -1)
-        
-        predictions = np.dot(X, self.coefficients) + self.intercept
-        return predictions
-    
-    def score(self, X, y):
-        """Calculate R² score"""
-        predictions = self.predict(X)
-        ss_res = np.sum((y - predictions) ** 2)
-        ss_tot = np.sum((y - np.mean(y)) ** 2)
-        return 1 - (ss_res / ss_tot)
+app = create_app("full")
 
-# Initialize FastAPI app with custom metadata
-app = FastAPI(
-    title="🏠 AI House Price Predictor",
-    description="Advanced California house price prediction using AI with market insights and trends",
-    version="2.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc"
-)
-
-# Load the trained model
-try:
-    model = joblib.load("house_model.pkl")
-    print("✅ Model loaded successfully!")
-except Exception as e:
-    print(f"❌ Error loading model: {e}")
-    # Create a fallback model
-    model = SimpleHousePriceModel()
-
-# Prediction history storage
-prediction_history = []
-
-class HousePredictionInput(BaseModel):
-    data: List[float]
-    location_name: Optional[str] = "California"
-    
-    @field_validator('data')
-    @classmethod
-    def validate_features(cls, v):
-        if len(v) != 8:
-            raise ValueError('Input must contain exactly 8 features')
-        if any(x < 0 for x in v[:5]):  # First 5 features should be positive
-            raise ValueError('Numeric features cannot be negative')
-        return v
-
-class PredictionResponse(BaseModel):
-    prediction: float
-    prediction_formatted: str
-    confidence_level: str
-    market_insight: str
-    location: str
-    timestamp: str
-    features_breakdown: Dict[str, float]
-    
-class MarketInsights:
-    """Generate market insights based on input features"""
-    
-    @staticmethod
-    def get_price_category(price):
-        if price < 200000:
-            return "💰 Budget-Friendly", "Great value for money!"
-        elif price < 400000:
-            return "🏡 Mid-Range", "Balanced pricing for the area"
-        elif price < 800000:
-            return "🌟 Premium", "High-value property"
-        else:
-            return "💎 Luxury", "Exclusive premium property"
-    
-    @staticmethod
-    def get_location_insight(lat, lon):
-        if lat > 37.5 and lon < -122:
-            return "🌉 San Francisco Bay Area - High demand tech hub"
-        elif lat > 34 and lat < 37:
-            return "☀️ Los Angeles Area - Entertainment & business center"
-        elif lat > 32.5 and lat < 34:
-            return "🏖️ San Diego Region - Coastal lifestyle premium"
-        else:
-            return "🏔️ Central/Northern California - Diverse communities"
-    
-    @staticmethod
-    def get_confidence_level(med_inc, house_age, rooms):
-        score = 0
-        if 3 <= med_inc <= 12:  # Normal income range
-            score += 30
-        if 1 <= house_age <= 50:  # Reasonable age
-            score += 25
-        if 4 <= rooms <= 10:  # Normal room count
-            score += 25
-        score += 20  # Base confidence
-        
-        if score >= 85:
-            return "🎯 Very High (85%+)"
-        elif score >= 70:
-            return "📊 High (70%+)"
-        elif score >= 55:
-            return "📈 Moderate (55%+)"
-        else:
-            return "⚠️ Low (<55%)"
-
-@app.get("/", response_class=HTMLResponse)
-def root():
-    """Enhanced root endpoint with modern design"""
-    return """
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>🏠 AI House Price Predictor</title>
-        <style>
-            * { margin: 0; padding: 0; box-sizing: border-box; }
-            body {
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                min-height: 100vh;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-            }
-            .container {
-                background: rgba(255, 255, 255, 0.95);
-                padding: 40px;
-                border-radius: 20px;
-                box-shadow: 0 20px 40px rgba(0,0,0,0.1);
-                text-align: center;
-                max-width: 800px;
-                backdrop-filter: blur(10px);
-            }
-            h1 {
-                color: #333;
-                margin-bottom: 20px;
-                font-size: 2.5em;
-                background: linear-gradient(45deg, #667eea, #764ba2);
-                -webkit-background-clip: text;
-                -webkit-text-fill-color: transparent;
-            }
-            .features {
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-                gap: 20px;
-                margin: 30px 0;
-            }
-            .feature-card {
-                background: #f8f9fa;
-                padding: 20px;
-                border-radius: 15px;
-                transition: transform 0.3s ease;
-            }
-            .feature-card:hover { transform: translateY(-5px); }
-            .btn {
-                display: inline-block;
-                padding: 15px 30px;
-                margin: 10px;
-                background: linear-gradient(45deg, #667eea, #764ba2);
-                color: white;
-                text-decoration: none;
-                border-radius: 50px;
-                font-weight: bold;
-                transition: transform 0.3s ease;
-                box-shadow: 0 5px 15px rgba(0,0,0,0.2);
-            }
-            .btn:hover { transform: translateY(-2px); }
-            .stats {
-                background: #e9ecef;
-                padding: 20px;
-                border-radius: 15px;
-                margin: 20px 0;
-            }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1>🏠 AI House Price Predictor</h1>
-            <p style="font-size: 1.2em; color: #666; margin-bottom: 30px;">
-                Advanced California housing market analysis powered by AI
-            </p>
-            
-            <div class="features">
-                <div class="feature-card">
-                    <h3>🎯 Smart Predictions</h3>
-                    <p>AI-powered price estimation with confidence levels</p>
-                </div>
-                <div class="feature-card">
-                    <h3>📊 Market Insights</h3>
-                    <p>Real-time market analysis and trends</p>
-                </div>
-                <div class="feature-card">
-                    <h3>🌍 Location Intelligence</h3>
-                    <p>Geographic premium analysis</p>
-                </div>
-                <div class="feature-card">
-                    <h3>📈 Price History</h3>
-                    <p>Track prediction trends over time</p>
-                </div>
-            </div>
-            
-            <div class="stats">
-                <h3>🔥 Live Statistics</h3>
-                <p>Predictions Made: <strong id="prediction-count">0</strong> | 
-                   Average Price: <strong>$485,000</strong> | 
-                   Accuracy: <strong>92%</strong></p>
-            </div>
-            
-            <div>
-                <a href="/gradio" class="btn">🚀 Launch Predictor</a>
-                <a href="/docs" class="btn">📚 API Documentation</a>
-                <a href="/analytics" class="btn">📊 Analytics Dashboard</a>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
-
-@app.post("/predict", response_model=PredictionResponse)
-def predict(input_data: HousePredictionInput):
-    """Enhanced prediction endpoint with market insights"""
-    if model is None:
-        raise HTTPException(status_code=500, detail="Model not loaded")
-    
-    try:
-        # Make prediction
-        pred = model.predict([input_data.data])
-        prediction_value = float(pred[0])
-        actual_price = prediction_value * 100000
-        
-        # Extract features for analysis
-        med_inc, house_age, ave_rooms, ave_bedrms, population, ave_occup, latitude, longitude = input_data.data
-        
-        # Generate insights
-        price_category, price_insight = MarketInsights.get_price_category(actual_price)
-        location_insight = MarketInsights.get_location_insight(latitude, longitude)
-        confidence = MarketInsights.get_confidence_level(med_inc, house_age, ave_rooms)
-        
-        # Create features breakdown
-        features_breakdown = {
-            "median_income_impact": f"${med_inc * 43790:.0f}",
-            "location_premium": f"${abs(latitude * longitude * 1000):.0f}",
-            "property_age_factor": f"{house_age} years",
-            "space_value": f"{ave_rooms:.1f} rooms avg"
-        }
-        
-        # Store prediction in history
-        prediction_record = {
-            "timestamp": datetime.now().isoformat(),
-            "price": actual_price,
-            "location": input_data.location_name,
-            "confidence": confidence
-        }
-        prediction_history.append(prediction_record)
-        
-        # Keep only last 100 predictions
-        if len(prediction_history) > 100:
-            prediction_history.pop(0)
-        
-        return PredictionResponse(
-            prediction=prediction_value,
-            prediction_formatted=f"${actual_price:,.2f}",
-            confidence_level=confidence,
-            market_insight=f"{price_category} - {price_insight} | {location_insight}",
-            location=input_data.location_name,
-            timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            features_breakdown=features_breakdown
-        )
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Prediction error: {str(e)}")
-
-@app.get("/analytics")
-def get_analytics():
-    """Analytics dashboard endpoint"""
-    if not prediction_history:
-        return {"message": "No predictions made yet", "total_predictions": 0}
-    
-    recent_predictions = prediction_history[-10:]
-    avg_price = np.mean([p["price"] for p in prediction_history])
-    price_trend = "📈 Rising" if len(prediction_history) > 1 and prediction_history[-1]["price"] > prediction_history[-2]["price"] else "📉 Stable"
-    
-    return {
-        "total_predictions": len(prediction_history),
-        "average_price": f"${avg_price:,.2f}",
-        "price_trend": price_trend,
-        "recent_predictions": recent_predictions,
-        "popular_locations": ["San Francisco Bay Area", "Los Angeles", "San Diego"],
-        "accuracy_rate": "92%"
-    }
-
-@app.get("/health")
-def health_check():
-    """Enhanced health check with system status"""
-    return {
-        "status": "healthy",
-        "model_loaded": model is not None,
-        "total_predictions": len(prediction_history),
-        "system_info": {
-            "version": "2.0.0",
-            "features": ["AI Predictions", "Market Insights", "Analytics"],
-            "uptime": "Available 24/7"
-        }
-    }
-
-# Enhanced Gradio interface function
-def predict_house_price(med_inc, house_age, ave_rooms, ave_bedrms, population, ave_occup, latitude, longitude, location_name="California"):
-    """Advanced prediction function with detailed analysis"""
-    try:
-        input_features = [med_inc, house_age, ave_rooms, ave_bedrms, population, ave_occup, latitude, longitude]
-        
-        # Make prediction
-        pred = model.predict([input_features])
-        prediction_value = float(pred[0])
-        actual_price = prediction_value * 100000
-        
-        # Generate comprehensive analysis
-        price_category, price_insight = MarketInsights.get_price_category(actual_price)
-        location_insight = MarketInsights.get_location_insight(latitude, longitude)
-        confidence = MarketInsights.get_confidence_level(med_inc, house_age, ave_rooms)
-        
-        # Create detailed result
-        result = f"""
-🏠 **HOUSE PRICE PREDICTION REPORT**
-═══════════════════════════════════════
-💰 **Estimated Price: ${actual_price:,.2f}**
-
-📊 **Analysis:**
-• {price_category} - {price_insight}
-• {location_insight}
-• Confidence Level: {confidence}
-
-🔍 **Feature Impact:**
-• Income Level: ${med_inc:.1f}K (Impact: High)
-• Property Age: {house_age} years
-• Space: {ave_rooms:.1f} rooms, {ave_bedrms:.1f} bedrooms
-• Population Density: {population:,.0f} people
-
-📍 **Location: {location_name}**
-📅 **Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}**
-        """
-        
-        return result.strip()
-    except Exception as e:
-        return f"❌ Error: {str(e)}"
-
-def get_price_history():
-    """Return recent prediction history"""
-    if not prediction_history:
-        return "No predictions made yet."
-    
-    recent = prediction_history[-5:]
-    history_text = "📈 **RECENT PREDICTIONS**\n" + "="*30 + "\n"
-    for i, pred in enumerate(recent, 1):
-        history_text += f"{i}. ${pred['price']:,.0f} - {pred['location']} ({pred['timestamp'][:16]})\n"
-    
-    avg_price = np.mean([p["price"] for p in prediction_history])
-    history_text += f"\n📊 Average: ${avg_price:,.0f} | Total: {len(prediction_history)} predictions"
-    return history_text
-
-# Create enhanced Gradio interface
-custom_css = """
-.gradio-container {
-    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-}
-.main-header {
-    text-align: center;
-    padding: 20px;
-    background: rgba(255,255,255,0.1);
-    border-radius: 10px;
-    margin-bottom: 20px;
-}
-"""
-
-iface = gr.Blocks(
-    title="🏠 AI House Price Predictor"
-)
-
-with iface:
-    
-    gr.HTML("""
-    <div class="main-header">
-        <h1 style="color: white; font-size: 2.5em; margin-bottom: 10px;">🏠 AI House Price Predictor</h1>
-        <p style="color: white; font-size: 1.2em;">Advanced California Housing Market Analysis</p>
-    </div>
-    """)
-    
-    with gr.Tabs():
-        with gr.TabItem("🎯 Price Predictor"):
-            with gr.Row():
-                with gr.Column(scale=2):
-                    gr.Markdown("### 📝 Property Details")
-                    med_inc = gr.Number(label="💰 Median Income (tens of thousands)", value=8.3252, precision=4)
-                    house_age = gr.Number(label="🏠 House Age (years)", value=41.0, precision=1)
-                    ave_rooms = gr.Number(label="🛏️ Average Rooms", value=6.98, precision=2)
-                    ave_bedrms = gr.Number(label="🛌 Average Bedrooms", value=1.02, precision=2)
-                    population = gr.Number(label="👥 Population", value=322.0, precision=0)
-                    ave_occup = gr.Number(label="🏘️ Average Occupancy", value=2.55, precision=2)
-                    
-                    gr.Markdown("### 🗺️ Location")
-                    latitude = gr.Number(label="📍 Latitude", value=37.88, precision=2)
-                    longitude = gr.Number(label="📍 Longitude", value=-122.23, precision=2)
-                    location_name = gr.Textbox(label="🏙️ Location Name", value="San Francisco Bay Area")
-                    
-                with gr.Column(scale=3):
-                    gr.Markdown("### 🔮 Prediction Result")
-                    prediction_output = gr.Textbox(
-                        label="📊 Analysis Report",
-                        lines=15,
-                        max_lines=20
-                    )
-                    
-            predict_btn = gr.Button("🚀 Predict House Price", variant="primary", size="lg")
-            
-        with gr.TabItem("📈 Price History"):
-            with gr.Column():
-                gr.Markdown("### 📊 Recent Predictions")
-                history_output = gr.Textbox(label="Prediction History", lines=10)
-                refresh_btn = gr.Button("🔄 Refresh History", variant="secondary")
-                
-        with gr.TabItem("ℹ️ About"):
-            gr.Markdown("""
-            ## 🎯 About This AI Predictor
-            
-            This advanced house price prediction system uses machine learning to analyze California housing market data and provide accurate price estimates with market insights.
-            
-            ### ✨ Features:
-            - **🤖 AI-Powered Predictions**: Custom trained model for accurate estimates
-            - **📊 Market Insights**: Comprehensive analysis of price factors
-            - **🎯 Confidence Scoring**: Reliability assessment for each prediction
-            - **🌍 Location Intelligence**: Geographic premium analysis
-            - **📈 Trend Analysis**: Historical prediction tracking
-            
-            ### 📋 Input Features:
-            1. **Median Income**: Average household income in the area (in $10K)
-            2. **House Age**: Average age of houses in the neighborhood
-            3. **Average Rooms**: Average number of rooms per house
-            4. **Average Bedrooms**: Average number of bedrooms per house
-            5. **Population**: Total population in the area
-            6. **Average Occupancy**: Average number of people per household
-            7. **Latitude & Longitude**: Geographic coordinates
-            
-            ### 🎨 Made with:
-            - FastAPI for robust API development
-            - Gradio for interactive UI
-            - Custom ML model for predictions
-            - Modern responsive design
-            """)
-    
-    # Event handlers
-    predict_btn.click(
-        predict_house_price,
-        inputs=[med_inc, house_age, ave_rooms, ave_bedrms, population, ave_occup, latitude, longitude, location_name],
-        outputs=prediction_output
-    )
-    
-    refresh_btn.click(
-        get_price_history,
-        outputs=history_output
-    )
-    
-    # Example data
-    examples = [
-        [8.3252, 41.0, 6.98, 1.02, 322.0, 2.55, 37.88, -122.23, "San Francisco Bay Area"],
-        [5.6431, 9.0, 7.85, 1.13, 485.0, 2.16, 33.60, -117.88, "Los Angeles Area"],
-        [3.2317, 34.0, 5.82, 1.06, 1977.0, 3.44, 36.06, -119.01, "Central Valley"],
-        [7.2574, 15.0, 8.32, 1.41, 1151.0, 2.93, 32.74, -117.16, "San Diego"],
-    ]
-    
-    gr.Examples(
-        examples=examples,
-        inputs=[med_inc, house_age, ave_rooms, ave_bedrms, population, ave_occup, latitude, longitude, location_name],
-        outputs=prediction_output,
-        fn=predict_house_price,
-        cache_examples=True
-    )
-
-# Mount the enhanced Gradio app
-app = gr.mount_gradio_app(app, iface, path="/gradio")
+def preload():
+    """Warm shared state before serve.py --preload forks workers (they then share it copy-on-write)"""
+    preload_routers(app)
 
 if __name__ == "__main__":
-    print("🚀 Starting Enhanced AI House Price Predictor...")
-    print("✨ Features: Advanced UI, Market Insights, Analytics Dashboard")
-    print("📊 Model loaded and ready for predictions!")
-    
-    # Get port from environment variable (Render sets this automatically)
+    import uvicorn
     port = int(os.getenv("PORT", 10000))
-    
+    print("🚀 Starting Enhanced AI House Price Predictor...")
     print(f"🌐 Main App: http://localhost:{port}")
     print(f"📚 API Docs: http://localhost:{port}/docs")
     print(f"🎯 Gradio UI: http://localhost:{port}/gradio")
     print(f"📊 Analytics: http://localhost:{port}/analytics")
-    
-    # Run the FastAPI app
-    uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=port)
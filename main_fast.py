@@ -1,267 +0,0 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse
-from pydantic import BaseModel
-from typing import List, Dict
-import os
-import json
-from datetime import datetime
-
-# Simple model without external dependencies
-class SimplePredictionModel:
-    def __init__(self):
-        # Simplified coefficients for quick prediction
-        self.coefficients = [0.44, 0.01, -0.11, 0.65, -0.000001, -0.04, -0.42, -0.43]
-        self.intercept = 1.89
-        
-    def predict(self, features):
-        if len(features) != 8:
-            raise ValueError("Expected 8 features")
-        
-        prediction = self.intercept
-        for i, feature in enumerate(features):
-            prediction += feature * self.coefficients[i]
-        return [prediction]
-
-app = FastAPI(
-    title="🏠 AI House Price Predictor",
-    description="Fast California house price prediction API",
-    version="2.2.0"
-)
-
-# Initialize model
-model = SimplePredictionModel()
-prediction_history = []
-
-class HousePredictionInput(BaseModel):
-    data: List[float]
-    location: str = "California"
-
-class PredictionResponse(BaseModel):
-    prediction_formatted: str
-    confidence: str
-    location_insight: str
-    timestamp: str
-
-@app.get("/", response_class=HTMLResponse)
-def root():
-    return """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>🏠 AI House Price Predictor</title>
-        <style>
-            * { margin: 0; padding: 0; box-sizing: border-box; }
-            body {
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                min-height: 100vh; padding: 20px;
-            }
-            .container {
-                background: white; max-width: 1000px; margin: 0 auto;
-                border-radius: 20px; padding: 40px; box-shadow: 0 20px 40px rgba(0,0,0,0.1);
-            }
-            h1 { color: #333; text-align: center; margin-bottom: 30px; font-size: 2.5em; }
-            .features { display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 20px; margin: 30px 0; }
-            .feature { background: #f8f9fa; padding: 20px; border-radius: 15px; text-align: center; }
-            .btn {
-                display: inline-block; padding: 15px 30px; margin: 10px;
-                background: linear-gradient(45deg, #667eea, #764ba2);
-                color: white; text-decoration: none; border-radius: 50px;
-                font-weight: bold; transition: transform 0.3s;
-            }
-            .btn:hover { transform: translateY(-2px); }
-            .demo { background: #e9ecef; padding: 30px; border-radius: 15px; margin: 20px 0; }
-            .input-group { margin: 15px 0; }
-            input { padding: 10px; border: 1px solid #ddd; border-radius: 5px; width: 100%; margin: 5px 0; }
-            #result { background: #d4edda; padding: 15px; border-radius: 10px; margin: 15px 0; display: none; }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1>🏠 AI House Price Predictor</h1>
-            <p style="text-align: center; font-size: 1.2em; color: #666; margin-bottom: 30px;">
-                Get instant California house price estimates with AI
-            </p>
-            
-            <div class="features">
-                <div class="feature">
-                    <h3>⚡ Lightning Fast</h3>
-                    <p>Instant predictions in milliseconds</p>
-                </div>
-                <div class="feature">
-                    <h3>🎯 Accurate</h3>
-                    <p>AI-powered market analysis</p>
-                </div>
-                <div class="feature">
-                    <h3>🌍 Location Smart</h3>
-                    <p>Geographic premium detection</p>
-                </div>
-                <div class="feature">
-                    <h3>📱 Mobile Ready</h3>
-                    <p>Works on all devices</p>
-                </div>
-            </div>
-            
-            <div class="demo">
-                <h3>🚀 Try It Now - Quick Prediction</h3>
-                <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px;">
-                    <div class="input-group">
-                        <label>💰 Median Income (10K units):</label>
-                        <input type="number" id="income" value="8.32" step="0.01">
-                    </div>
-                    <div class="input-group">
-                        <label>🏠 House Age (years):</label>
-                        <input type="number" id="age" value="41" step="1">
-                    </div>
-                    <div class="input-group">
-                        <label>🛏️ Avg Rooms:</label>
-                        <input type="number" id="rooms" value="6.98" step="0.01">
-                    </div>
-                    <div class="input-group">
-                        <label>🛌 Avg Bedrooms:</label>
-                        <input type="number" id="bedrooms" value="1.02" step="0.01">
-                    </div>
-                    <div class="input-group">
-                        <label>👥 Population:</label>
-                        <input type="number" id="population" value="322" step="1">
-                    </div>
-                    <div class="input-group">
-                        <label>🏘️ Avg Occupancy:</label>
-                        <input type="number" id="occupancy" value="2.55" step="0.01">
-                    </div>
-                    <div class="input-group">
-                        <label>📍 Latitude:</label>
-                        <input type="number" id="lat" value="37.88" step="0.01">
-                    </div>
-                    <div class="input-group">
-                        <label>📍 Longitude:</label>
-                        <input type="number" id="lng" value="-122.23" step="0.01">
-                    </div>
-                </div>
-                <button onclick="predict()" class="btn" style="width: 100%; margin-top: 20px;">
-                    🎯 Predict House Price
-                </button>
-                <div id="result"></div>
-            </div>
-            
-            <div style="text-align: center;">
-                <a href="/docs" class="btn">📚 API Documentation</a>
-                <a href="/health" class="btn">💚 System Health</a>
-            </div>
-        </div>
-        
-        <script>
-            async function predict() {
-                const data = [
-                    parseFloat(document.getElementById('income').value),
-                    parseFloat(document.getElementById('age').value),
-                    parseFloat(document.getElementById('rooms').value),
-                    parseFloat(document.getElementById('bedrooms').value),
-                    parseFloat(document.getElementById('population').value),
-                    parseFloat(document.getElementById('occupancy').value),
-                    parseFloat(document.getElementById('lat').value),
-                    parseFloat(document.getElementById('lng').value)
-                ];
-                
-                try {
-                    const response = await fetch('/predict', {
-                        method: 'POST',
-                        headers: { 'Content-Type': 'application/json' },
-                        body: JSON.stringify({ data: data, location: 'California' })
-                    });
-                    
-                    const result = await response.json();
-                    document.getElementById('result').style.display = 'block';
-                    document.getElementById('result').innerHTML = `
-                        <h4>🏠 Prediction Result:</h4>
-                        <p><strong>Estimated Price:</strong> ${result.prediction_formatted}</p>
-                        <p><strong>Confidence:</strong> ${result.confidence}</p>
-                        <p><strong>Location Insight:</strong> ${result.location_insight}</p>
-                        <p><strong>Generated:</strong> ${result.timestamp}</p>
-                    `;
-                } catch (error) {
-                    document.getElementById('result').style.display = 'block';
-                    document.getElementById('result').innerHTML = `<p style="color: red;">Error: ${error.message}</p>`;
-                }
-            }
-        </script>
-    </body>
-    </html>
-    """
-
-@app.post("/predict", response_model=PredictionResponse)
-def predict(input_data: HousePredictionInput):
-    try:
-        # Make prediction
-        pred = model.predict(input_data.data)
-        prediction_value = pred[0]
-        actual_price = prediction_value * 100000
-        
-        # Generate insights
-        lat, lng = input_data.data[6], input_data.data[7]
-        
-        if lat > 37.5 and lng < -122:
-            location_insight = "🌉 San Francisco Bay Area - Premium tech hub location"
-            confidence = "🎯 High Confidence (85%)"
-        elif lat > 34 and lat < 37:
-            location_insight = "☀️ Los Angeles Area - Entertainment district premium"
-            confidence = "📊 Good Confidence (75%)"
-        elif lat > 32.5 and lat < 34:
-            location_insight = "🏖️ San Diego Region - Coastal lifestyle premium"
-            confidence = "📈 Moderate Confidence (70%)"
-        else:
-            location_insight = "🏔️ Central/Northern California - Diverse market"
-            confidence = "📋 Standard Confidence (65%)"
-        
-        # Store prediction
-        prediction_history.append({
-            "price": actual_price,
-            "location": input_data.location,
-            "timestamp": datetime.now().isoformat()
-        })
-        
-        # Keep only last 50 predictions
-        if len(prediction_history) > 50:
-            prediction_history.pop(0)
-        
-        return PredictionResponse(
-            prediction_formatted=f"${actual_price:,.2f}",
-            confidence=confidence,
-            location_insight=location_insight,
-            timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        )
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
-
-@app.get("/health")
-def health():
-    return {
-        "status": "✅ Healthy",
-        "predictions_made": len(prediction_history),
-        "avg_price": f"${sum(p['price'] for p in prediction_history[-10:]) / min(10, len(prediction_history)):,.0f}" if prediction_history else "N/A",
-        "version": "2.1.0",
-        "features": ["Lightning Fast", "No External Dependencies", "Mobile Ready"]
-    }
-
-@app.get("/stats")
-def get_stats():
-    if not prediction_history:
-        return {"message": "No predictions yet", "total": 0}
-    
-    recent = prediction_history[-10:]
-    return {
-        "total_predictions": len(prediction_history),
-        "recent_average": f"${sum(p['price'] for p in recent) / len(recent):,.0f}",
-        "latest_predictions": [{"price": f"${p['price']:,.0f}", "time": p['timestamp'][:16]} for p in recent]
-    }
-
-if __name__ == "__main__":
-    import uvicorn
-    port = int(os.getenv("PORT", 10000))
-    print("🚀 Lightning Fast House Price Predictor Starting...")
-    print(f"⚡ Compatible with all Python versions - Ultra fast deployment!")
-    print(f"🌐 App: http://localhost:{port}")
-    print(f"📚 Docs: http://localhost:{port}/docs")
-    uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
@@ -0,0 +1,149 @@
+# Memory inspection for production workers: tracemalloc snapshots and tracked stores
+import hmac
+import os
+import sys
+import tracemalloc
+from collections import OrderedDict
+from datetime import datetime
+
+from fastapi import Header, HTTPException
+
+
+def require_debug_token(x_debug_token: str = Header(default="")):
+    """Dependency guarding /debug endpoints: disabled unless DEBUG_TOKEN is set and sent"""
+    expected = os.getenv("DEBUG_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest(x_debug_token, expected):
+        raise HTTPException(status_code=403, detail="Invalid debug token")
+
+
+def process_memory(pid="self"):
+    """RSS, PSS and unique (private) memory of a process in KB, from /proc/<pid>/smaps_rollup"""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1])
+    return {
+        "rss_kb": fields.get("Rss", 0),
+        "pss_kb": fields.get("Pss", 0),
+        "uss_kb": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+        "shared_kb": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+    }
+
+
+def deep_sizeof(obj, limit=200000):
+    """Approximate retained size of an object graph (stops after `limit` objects)"""
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack and len(seen) < limit:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        nbytes = getattr(item, "nbytes", None)
+        total += sys.getsizeof(item) + (nbytes if isinstance(nbytes, int) else 0)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif hasattr(item, "__dict__") and not isinstance(item, type):
+            stack.append(vars(item))
+    return total
+
+
+class MemoryProfiler:
+    """Start/stop tracemalloc, keep named snapshots and report top allocation sites.
+
+    Tracing is off by default; until start() is called nothing here runs on
+    the request path, so there is no overhead.
+    """
+
+    def __init__(self, max_snapshots=5):
+        self.max_snapshots = max_snapshots
+        self.snapshots = OrderedDict()
+        self.tracked = {}
+        self.started_at = None
+
+    def track(self, name, getter):
+        """Report the size of an application store (history, caches, UI state)"""
+        self.tracked[name] = getter
+
+    def start(self, frames=1):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            self.started_at = datetime.now().isoformat()
+
+    def stop(self):
+        tracemalloc.stop()
+        self.snapshots.clear()
+        self.started_at = None
+
+    def _take(self):
+        if not tracemalloc.is_tracing():
+            raise HTTPException(status_code=409, detail="tracemalloc is not running; start it first")
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ])
+
+    def snapshot(self, name):
+        self.snapshots[name] = self._take()
+        self.snapshots.move_to_end(name)
+        while len(self.snapshots) > self.max_snapshots:
+            self.snapshots.popitem(last=False)
+        return {"name": name, "snapshots": list(self.snapshots)}
+
+    def top(self, limit=20, group_by="lineno"):
+        stats = self._take().statistics(group_by)
+        return [
+            {"location": self._location(stat.traceback), "size_kb": round(stat.size / 1024, 1), "count": stat.count}
+            for stat in stats[:limit]
+        ]
+
+    def diff(self, base, limit=20, group_by="lineno"):
+        if base not in self.snapshots:
+            raise HTTPException(status_code=404, detail=f"No snapshot named '{base}'")
+        stats = self._take().compare_to(self.snapshots[base], group_by)
+        return [
+            {
+                "location": self._location(stat.traceback),
+                "size_kb": round(stat.size / 1024, 1),
+                "size_diff_kb": round(stat.size_diff / 1024, 1),
+                "count_diff": stat.count_diff
+            }
+            for stat in stats[:limit]
+        ]
+
+    @staticmethod
+    def _location(traceback):
+        frame = traceback[0]
+        return f"{frame.filename}:{frame.lineno}"
+
+    def status(self):
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        tracked = {}
+        for name, getter in self.tracked.items():
+            try:
+                tracked[name] = round(deep_sizeof(getter()) / 1024, 1)
+            except Exception as e:
+                tracked[name] = f"error: {e}"
+        try:
+            process = process_memory()
+        except OSError:
+            process = None
+        return {
+            "tracing": tracing,
+            "started_at": self.started_at,
+            "traced_kb": round(current / 1024, 1),
+            "peak_traced_kb": round(peak / 1024, 1),
+            "snapshots": list(self.snapshots),
+            "tracked_kb": tracked,
+            "process": process
+        }
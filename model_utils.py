@@ -0,0 +1,70 @@
+# Helpers shared by the subsystems that evaluate whichever model is active
+import hashlib
+import json
+import math
+import numbers
+import weakref
+
+import numpy as np
+
+from feature_pipeline import FORMAT as PIPELINE_FORMAT, PipelineLinearModel
+from linear_model import FORMAT as LINEAR_FORMAT, LinearModel
+from regional_model import FORMAT as REGIONAL_FORMAT, RegionalLinearModel
+from tree_model import TreeEnsembleModel
+
+# JSON model artifacts carry a "format" tag; anything else is a tree ensemble
+MODEL_FORMATS = {LINEAR_FORMAT: LinearModel, REGIONAL_FORMAT: RegionalLinearModel, PIPELINE_FORMAT: PipelineLinearModel}
+
+_fingerprints = weakref.WeakKeyDictionary()
+
+
+def load_model(path):
+    """Load an exported model: a tree ensemble (.json/.npz), or a global, regional or pipeline linear model (.json)"""
+    if path.endswith(".json"):
+        with open(path) as f:
+            model_class = MODEL_FORMATS.get(json.load(f).get("format"))
+        if model_class:
+            return model_class.load(path)
+    return TreeEnsembleModel.load(path)
+
+
+def is_feature_row(row):
+    """True for a list of exactly 8 finite numbers (bools and strings excluded)"""
+    return (isinstance(row, list) and len(row) == 8
+            and all(isinstance(x, numbers.Real) and not isinstance(x, bool) and math.isfinite(x) for x in row))
+
+
+def predict_rows(model, X):
+    """Vectorized prediction for a (rows x 8) array with any of the model types"""
+    X = np.asarray(X, dtype=np.float64)
+    predict = getattr(model, "predict_batch", None) or model.predict
+    return np.asarray(predict(X), dtype=np.float64)
+
+
+def model_fingerprint(model):
+    """Short content hash of a model's parameters, used as its version.
+
+    Published models are never mutated in place (updates publish a new copy),
+    so the hash is computed once per model object.
+    """
+    try:
+        return _fingerprints[model]
+    except KeyError:
+        pass
+    digest = hashlib.sha256(type(model).__name__.encode())
+    for name, value in sorted(vars(model).items()):
+        if name.startswith("_"):
+            continue
+        digest.update(name.encode())
+        if isinstance(value, dict):
+            value = repr(sorted(value.items()))
+        if isinstance(value, str):
+            digest.update(value.encode())
+        else:
+            try:
+                digest.update(np.ascontiguousarray(value, dtype=np.float64).tobytes())
+            except (TypeError, ValueError):
+                digest.update(repr(value).encode())
+    fingerprint = digest.hexdigest()[:16]
+    _fingerprints[model] = fingerprint
+    return fingerprint
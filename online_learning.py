@@ -0,0 +1,326 @@
+# Online model updates from sold-price feedback
+import copy
+import glob
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    # No fork on Windows, so serve.py never starts follower workers there
+    fcntl = None
+
+# Typical magnitude of each feature (plus the intercept column); used to scale the
+# prior covariance so a single high-population sample can't swamp the other weights
+FEATURE_SCALES = np.array([4.0, 30.0, 5.0, 1.0, 1500.0, 3.0, 2.0, 2.0, 1.0])
+
+
+def worker_role():
+    """Writer for the process that trains and checkpoints (a lone process or serve.py's worker slot 0),
+    follower for the other serve.py workers"""
+    return "writer" if os.getenv("WORKER_SLOT") in (None, "0") else "follower"
+
+
+def spool_path(checkpoint_path, slot):
+    """File through which a follower worker hands its feedback to the writer"""
+    root, _ = os.path.splitext(checkpoint_path)
+    return f"{root}.feedback.worker{slot}.jsonl"
+
+
+class RecursiveLeastSquares:
+    """Recursive least squares over [features, 1] with exponential forgetting"""
+
+    def __init__(self, coefficients, intercept, forgetting=0.999, prior_strength=100.0):
+        self.theta = np.append(np.asarray(coefficients, dtype=float), float(intercept))
+        # Prior covariance: small variance around the current coefficients
+        self.P = np.diag(1.0 / (prior_strength * FEATURE_SCALES ** 2))
+        self.forgetting = forgetting
+        self.samples_seen = 0
+
+    def update(self, features, target):
+        """Fold one observation into the estimate - O(d^2) per sample"""
+        phi = np.append(np.asarray(features, dtype=float), 1.0)
+        P_phi = self.P @ phi
+        gain = P_phi / (self.forgetting + phi @ P_phi)
+        error = target - phi @ self.theta
+        self.theta += gain * error
+        self.P = (self.P - np.outer(gain, P_phi)) / self.forgetting
+        # Keep P symmetric so rounding error doesn't accumulate
+        self.P = (self.P + self.P.T) * 0.5
+        self.samples_seen += 1
+        return error
+
+    @property
+    def coefficients(self):
+        return self.theta[:-1].copy()
+
+    @property
+    def intercept(self):
+        return float(self.theta[-1])
+
+
+class OnlineModelUpdater:
+    """Queue feedback samples and apply them to the model on a background thread.
+
+    One process trains: the writer. When serve.py runs several workers, the
+    others are followers. A follower appends the feedback it receives to its
+    spool file, which the writer collects, and reloads the model whenever the
+    writer replaces the checkpoint, so every worker serves the same
+    coefficients. New coefficients are published only when they are
+    checkpointed (every ``checkpoint_interval``). Caches keyed on the model
+    version, such as the heatmap, example cache and explainer, therefore turn
+    over at that pace rather than once per batch. The request path only
+    enqueues, and readers never see a half-updated model.
+    """
+
+    def __init__(self, model, publish, checkpoint_path="model_checkpoint.json",
+                 batch_size=64, flush_interval=1.0, checkpoint_interval=30.0,
+                 max_pending=10000):
+        self.model = model
+        self.publish = publish
+        self.checkpoint_path = checkpoint_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.checkpoint_interval = checkpoint_interval
+        self.estimator = RecursiveLeastSquares(model.coefficients, model.intercept)
+        self.pending = queue.Queue(maxsize=max_pending)
+        # Resolved in start(), which runs after serve.py forks
+        self.role = "writer"
+        self.spool = None
+        self.dropped = 0
+        self.spooled = 0
+        self.batches_applied = 0
+        self.failed_batches = 0
+        self.last_published = None
+        self.last_checkpoint = None
+        self._checkpoint_signature = None
+        self._dirty = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def submit(self, samples):
+        """Enqueue (features, price) pairs without blocking; returns how many were accepted"""
+        accepted = 0
+        for features, price in samples:
+            try:
+                # Feedback arrives in dollars; the model works in units of $100k
+                self.pending.put_nowait((features, price / 100000))
+                accepted += 1
+            except queue.Full:
+                self.dropped += 1
+        return accepted
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._resolve_role()
+        self.load_checkpoint()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="online-updater", daemon=True)
+        self._thread.start()
+
+    def _resolve_role(self):
+        # Followers need a checkpoint to follow and file locks to spool through
+        self.role = worker_role() if self.checkpoint_path and fcntl else "writer"
+        self.spool = spool_path(self.checkpoint_path, os.getenv("WORKER_SLOT")) if self.role == "follower" else None
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        if self.role == "follower":
+            while not self.pending.empty():
+                self._spool(self._drain())
+            return
+        while not self.pending.empty():
+            self._apply(self._drain())
+        self._apply_spooled()
+        if self._dirty:
+            self._checkpoint()
+
+    def _drain(self, timeout=None):
+        batch = []
+        try:
+            batch.append(self.pending.get(timeout=timeout) if timeout else self.pending.get_nowait())
+            while len(batch) < self.batch_size:
+                batch.append(self.pending.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _apply(self, batch):
+        if not batch:
+            return
+        estimator = self.estimator
+        theta, P, samples_seen = estimator.theta.copy(), estimator.P.copy(), estimator.samples_seen
+        try:
+            for features, target in batch:
+                estimator.update(features, target)
+            if not (np.all(np.isfinite(estimator.theta)) and np.all(np.isfinite(estimator.P))):
+                raise ValueError("update produced non-finite coefficients")
+        except Exception as e:
+            # Roll the whole batch back so the published model and checkpoint stay usable
+            estimator.theta, estimator.P, estimator.samples_seen = theta, P, samples_seen
+            self.failed_batches += 1
+            print(f"❌ Discarding feedback batch of {len(batch)}: {e}")
+            return
+        self.batches_applied += 1
+        self._dirty = True
+
+    def _run(self):
+        next_checkpoint = time.monotonic() + self.checkpoint_interval
+        while not self._stop.is_set():
+            batch = self._drain(timeout=self.flush_interval)
+            if self.role == "follower":
+                self._spool(batch)
+                self._follow()
+                continue
+            self._apply(batch)
+            self._apply_spooled()
+            if self._dirty and time.monotonic() >= next_checkpoint:
+                self._checkpoint()
+                next_checkpoint = time.monotonic() + self.checkpoint_interval
+
+    def _spool(self, batch):
+        """Follower: append samples to this worker's spool file for the writer to collect"""
+        if not batch:
+            return
+        lines = "".join(json.dumps([[float(x) for x in features], target]) + "\n" for features, target in batch)
+        try:
+            with open(self.spool, "a") as f:
+                # The writer empties the file under the same lock
+                fcntl.flock(f, fcntl.LOCK_EX)
+                f.write(lines)
+        except OSError as e:
+            self.dropped += len(batch)
+            print(f"❌ Dropping {len(batch)} feedback samples, spool {self.spool} failed: {e}")
+            return
+        self.spooled += len(batch)
+
+    def _collect_spooled(self):
+        """Writer: take the samples every follower has spooled, emptying each file under its lock"""
+        if not self.checkpoint_path or fcntl is None:
+            return []
+        root, _ = os.path.splitext(self.checkpoint_path)
+        samples = []
+        for path in glob.glob(f"{glob.escape(root)}.feedback.worker*.jsonl"):
+            try:
+                with open(path, "r+") as f:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                    lines = f.read().splitlines()
+                    f.seek(0)
+                    f.truncate()
+            except OSError as e:
+                print(f"❌ Could not read feedback spool {path}: {e}")
+                continue
+            for line in lines:
+                try:
+                    features, target = json.loads(line)
+                except (TypeError, ValueError):
+                    self.failed_batches += 1
+                    print(f"❌ Skipping malformed line in {path}")
+                    continue
+                samples.append((features, target))
+        return samples
+
+    def _apply_spooled(self):
+        spooled = self._collect_spooled()
+        for start in range(0, len(spooled), self.batch_size):
+            self._apply(spooled[start:start + self.batch_size])
+
+    def _follow(self):
+        """Follower: reload the writer's checkpoint whenever it has been replaced"""
+        try:
+            info = os.stat(self.checkpoint_path)
+        except OSError:
+            return
+        if (info.st_ino, info.st_mtime_ns, info.st_size) != self._checkpoint_signature:
+            self.load_checkpoint()
+
+    def _checkpoint(self):
+        """Save, then publish; followers load the same file, so all workers switch to the same model"""
+        try:
+            if self.checkpoint_path:
+                self.save_checkpoint()
+        except Exception as e:
+            # Still dirty, so the next interval (or stop) tries again
+            print(f"❌ Model checkpoint to {self.checkpoint_path} failed: {e}")
+            return
+        self._dirty = False
+        self._publish_model()
+
+    def _publish_model(self):
+        updated = copy.copy(self.model)
+        coefficients = self.estimator.coefficients
+        # Keep the container type the model was built with (list vs ndarray)
+        if isinstance(self.model.coefficients, list):
+            coefficients = coefficients.tolist()
+        updated.coefficients = coefficients
+        updated.intercept = self.estimator.intercept
+        self.model = updated
+        self.publish(updated)
+        self.last_published = datetime.now().isoformat()
+
+    def save_checkpoint(self):
+        """Write the estimator state to a temp file, then atomically swap it in"""
+        state = {
+            "coefficients": self.estimator.coefficients.tolist(),
+            "intercept": self.estimator.intercept,
+            "covariance": self.estimator.P.tolist(),
+            "samples_seen": self.estimator.samples_seen,
+            "saved_at": datetime.now().isoformat(),
+        }
+        tmp_path = f"{self.checkpoint_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+        self._dirty = False
+        self.last_checkpoint = state["saved_at"]
+
+    def load_checkpoint(self):
+        """Resume from (or, as a follower, catch up with) the checkpoint, if one exists"""
+        path = self.checkpoint_path
+        if not path or not os.path.exists(path):
+            return False
+        try:
+            info = os.stat(path)
+            # Remembered even if the file is unusable, so a follower doesn't retry it every poll
+            self._checkpoint_signature = (info.st_ino, info.st_mtime_ns, info.st_size)
+            with open(path) as f:
+                state = json.load(f)
+            theta = np.append(np.asarray(state["coefficients"], dtype=float), state["intercept"])
+            P = np.asarray(state["covariance"], dtype=float)
+            if theta.shape != self.estimator.theta.shape or P.shape != self.estimator.P.shape:
+                raise ValueError("checkpoint shape does not match model")
+        except Exception as e:
+            print(f"❌ Ignoring model checkpoint {path}: {e}")
+            return False
+        self.estimator.theta = theta
+        self.estimator.P = P
+        self.estimator.samples_seen = state.get("samples_seen", 0)
+        self.last_checkpoint = state.get("saved_at")
+        self._publish_model()
+        return True
+
+    def stats(self):
+        return {
+            "role": self.role,
+            "samples_seen": self.estimator.samples_seen,
+            "pending": self.pending.qsize(),
+            "dropped": self.dropped,
+            "spooled": self.spooled,
+            "batches_applied": self.batches_applied,
+            "failed_batches": self.failed_batches,
+            "last_published": self.last_published,
+            "last_checkpoint": self.last_checkpoint,
+        }
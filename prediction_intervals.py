@@ -0,0 +1,111 @@
+# Prediction intervals for linear models from training residual variance
+import hashlib
+import json
+import os
+from statistics import NormalDist
+
+import numpy as np
+
+
+def t_quantile(p, dof):
+    """Student-t quantile via the Cornish-Fisher expansion (no scipy needed)"""
+    z = NormalDist().inv_cdf(p)
+    g1 = (z ** 3 + z) / 4
+    g2 = (5 * z ** 5 + 16 * z ** 3 + 3 * z) / 96
+    g3 = (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / 384
+    return z + g1 / dof + g2 / dof ** 2 + g3 / dof ** 3
+
+
+def linear_fingerprint(model):
+    """Hash of a linear model's coefficients and intercept, or None for other model types"""
+    coefficients = getattr(model, "coefficients", None)
+    if coefficients is None:
+        return None
+    theta = np.append(np.asarray(coefficients, dtype=np.float64), float(model.intercept))
+    return hashlib.sha256(theta.tobytes()).hexdigest()[:16]
+
+
+class PredictionIntervals:
+    """Per-row prediction intervals: t * sqrt(s² (1 + zᵀ (XᵀX)⁻¹ z)), z = [x, 1].
+
+    Everything except the quadratic form is precomputed when the model loads.
+    The statistics only hold for the coefficients they were fitted with, which
+    ``fingerprint`` records.
+    """
+
+    def __init__(self, xtx_inv, residual_variance, dof, level=0.90, fingerprint=None):
+        self.xtx_inv = np.asarray(xtx_inv, dtype=np.float64)
+        self.residual_variance = float(residual_variance)
+        self.dof = int(dof)
+        self.level = level
+        self.fingerprint = fingerprint
+        self.t_value = t_quantile(0.5 + level / 2, self.dof)
+
+    @classmethod
+    def from_training_data(cls, X, y, predictions, level=0.90):
+        """Fit the interval statistics for a linear model trained on (X, y)"""
+        X = np.asarray(X, dtype=np.float64)
+        Z = np.hstack([X, np.ones((X.shape[0], 1))])
+        residuals = np.asarray(y) - np.asarray(predictions)
+        dof = Z.shape[0] - Z.shape[1]
+        return cls(np.linalg.pinv(Z.T @ Z), residuals @ residuals / dof, dof, level)
+
+    @classmethod
+    def from_model(cls, model, level=0.90):
+        """Use statistics attached to a fitted model, if it has any"""
+        stats = getattr(model, "interval_stats", None)
+        if not stats:
+            return None
+        return cls(stats["xtx_inv"], stats["residual_variance"], stats["dof"], level, linear_fingerprint(model))
+
+    @classmethod
+    def load(cls, path, model, level=0.90):
+        """Saved statistics for `model`, or None unless they were fitted with its exact coefficients"""
+        if not path or not os.path.exists(path):
+            return None
+        with open(path) as f:
+            stats = json.load(f)
+        intervals = cls(stats["xtx_inv"], stats["residual_variance"], stats["dof"], level, stats.get("fingerprint"))
+        if not intervals.matches(model):
+            print(f"⚠️ {path} was fitted for a different model; prediction intervals disabled")
+            return None
+        return intervals
+
+    def matches(self, model):
+        return self.fingerprint is not None and self.fingerprint == linear_fingerprint(model)
+
+    def to_dict(self):
+        return {
+            "xtx_inv": self.xtx_inv.tolist(),
+            "residual_variance": self.residual_variance,
+            "dof": self.dof,
+            "fingerprint": self.fingerprint,
+        }
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+    def half_width(self, X):
+        """Interval half-widths for a batch, in model units"""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        Z = np.hstack([X, np.ones((X.shape[0], 1))])
+        leverage = np.einsum("ij,jk,ik->i", Z, self.xtx_inv, Z)
+        return self.t_value * np.sqrt(self.residual_variance * (1.0 + leverage))
+
+    def bounds(self, X, predictions):
+        """Lower and upper bounds around the point predictions"""
+        width = self.half_width(X)
+        predictions = np.asarray(predictions, dtype=np.float64)
+        return predictions - width, predictions + width
+
+    def interval(self, features, prediction, scale=100000):
+        """Single-row convenience used by the API: numeric bounds in dollars"""
+        width = float(self.half_width(features)[0])
+        return {
+            "lower": round((prediction - width) * scale, 2),
+            "upper": round((prediction + width) * scale, 2),
+            "level": self.level,
+        }
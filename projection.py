@@ -0,0 +1,24 @@
+# Multi-year price projections compounding each region's annual growth
+import numpy as np
+
+MAX_HORIZON_YEARS = 30
+
+
+def horizon_years(years):
+    """Horizons as an int array: N means 1..N years, or an explicit list of years"""
+    if isinstance(years, int) and not isinstance(years, bool):
+        if not 1 <= years <= MAX_HORIZON_YEARS:
+            raise ValueError(f"'years' must be between 1 and {MAX_HORIZON_YEARS}")
+        return np.arange(1, years + 1)
+    horizons = np.asarray(years)
+    if horizons.ndim != 1 or horizons.size == 0 or horizons.dtype.kind not in "iu" \
+            or horizons.min() < 0 or horizons.max() > MAX_HORIZON_YEARS:
+        raise ValueError(f"'years' must be an integer or a list of whole years between 0 and {MAX_HORIZON_YEARS}")
+    return horizons
+
+
+def project_prices(prices, growth, years):
+    """(properties x horizons) projected prices in one broadcast: price * (1 + growth) ** year"""
+    prices = np.asarray(prices, dtype=np.float64)
+    growth = np.asarray(growth, dtype=np.float64)
+    return prices[:, None] * np.power(1.0 + growth[:, None], np.asarray(years, dtype=np.float64)[None, :])
@@ -0,0 +1,153 @@
+# Per-client token-bucket rate limiting and load shedding
+import asyncio
+import json
+import math
+import time
+from collections import OrderedDict
+
+
+class RateLimiter:
+    """Admission control state: token buckets per client plus overload signals.
+
+    Buckets live in a bounded LRU so a flood of distinct clients can't grow
+    memory without limit. Queue delay is measured as event-loop lag: how late
+    a periodic probe wakes up compared to when it asked to.
+    """
+
+    def __init__(self, rate=10.0, burst=20, max_clients=10000, max_in_flight=64,
+                 max_queue_delay=0.5, probe_interval=0.05, api_keys=()):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.max_in_flight = max_in_flight
+        self.max_queue_delay = max_queue_delay
+        self.probe_interval = probe_interval
+        # Only these X-API-Key values get a bucket of their own; any other key is ignored
+        self.api_keys = frozenset(api_keys)
+        self.buckets = OrderedDict()
+        self.in_flight = 0
+        self.queue_delay = 0.0
+        self.counters = {"allowed": 0, "rate_limited": 0, "shed_in_flight": 0, "shed_queue_delay": 0, "evicted": 0}
+        self._probe = None
+
+    def take(self, client, now=None):
+        """Spend a token for client; returns seconds to wait (0 when allowed)"""
+        now = time.monotonic() if now is None else now
+        bucket = self.buckets.get(client)
+        if bucket is None:
+            tokens, updated = float(self.burst), now
+            if len(self.buckets) >= self.max_clients:
+                self.buckets.popitem(last=False)
+                self.counters["evicted"] += 1
+        else:
+            tokens, updated = bucket
+            self.buckets.move_to_end(client)
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens < 1.0:
+            self.buckets[client] = (tokens, now)
+            return (1.0 - tokens) / self.rate
+        self.buckets[client] = (tokens - 1.0, now)
+        return 0.0
+
+    def overloaded(self):
+        """Reason to shed load right now, or None"""
+        if self.in_flight >= self.max_in_flight:
+            return "shed_in_flight"
+        if self.queue_delay >= self.max_queue_delay:
+            return "shed_queue_delay"
+        return None
+
+    def ensure_probe(self):
+        if self._probe is None or self._probe.done():
+            self._probe = asyncio.get_running_loop().create_task(self._measure_queue_delay())
+
+    async def _measure_queue_delay(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.probe_interval)
+            lag = max(loop.time() - start - self.probe_interval, 0.0)
+            # Smooth with an EWMA so one slow tick doesn't trigger shedding
+            self.queue_delay = 0.8 * self.queue_delay + 0.2 * lag
+
+    def stats(self):
+        return {
+            **self.counters,
+            "in_flight": self.in_flight,
+            "queue_delay_ms": round(self.queue_delay * 1000, 2),
+            "tracked_clients": len(self.buckets),
+            "config": {
+                "rate": self.rate,
+                "burst": self.burst,
+                "max_clients": self.max_clients,
+                "max_in_flight": self.max_in_flight,
+                "max_queue_delay": self.max_queue_delay,
+                "api_keys": len(self.api_keys)
+            }
+        }
+
+
+class RateLimitMiddleware:
+    """ASGI middleware that applies a RateLimiter to HTTP requests"""
+
+    def __init__(self, app, limiter, exempt_paths=("/health",)):
+        self.app = app
+        self.limiter = limiter
+        self.exempt_paths = exempt_paths
+
+    def client_key(self, scope):
+        """Bucket for a request: a configured API key, otherwise the peer address.
+
+        Client-supplied headers are not trusted: an arbitrary X-API-Key or
+        X-Forwarded-For would give every request a fresh bucket. Behind a proxy,
+        uvicorn's proxy-headers support (trusted proxies only) already rewrites
+        scope["client"] to the real client address.
+        """
+        if self.limiter.api_keys:
+            for name, value in scope.get("headers") or []:
+                if name == b"x-api-key":
+                    api_key = value.decode("latin-1")
+                    if api_key in self.limiter.api_keys:
+                        return "key:" + api_key
+                    break
+        client = scope.get("client")
+        return "ip:" + (client[0] if client else "unknown")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.limiter
+        limiter.ensure_probe()
+        reason = limiter.overloaded()
+        if reason:
+            limiter.counters[reason] += 1
+            await self._reject(send, 503, "Server overloaded, retry shortly", 1)
+            return
+        wait = limiter.take(self.client_key(scope))
+        if wait > 0:
+            limiter.counters["rate_limited"] += 1
+            await self._reject(send, 429, "Too many requests", math.ceil(wait))
+            return
+
+        limiter.counters["allowed"] += 1
+        limiter.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.in_flight -= 1
+
+    @staticmethod
+    async def _reject(send, status, detail, retry_after):
+        body = json.dumps({"detail": detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(retry_after).encode())
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
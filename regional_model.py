@@ -0,0 +1,99 @@
+# Piecewise linear model: separate coefficients and intercept per market region
+import json
+
+import numpy as np
+
+from housing_data import REGIONS, region_code, region_codes
+
+FORMAT = "regional_linear/v1"
+
+
+class RegionalLinearModel:
+    """One linear model per region, picked by the property's coordinates.
+
+    A batch is partitioned by region with a stable argsort; bincount gives each
+    region's slice of the sorted rows, every slice is scored with its own matmul,
+    and the results are scattered back to input order. That is one matmul per
+    region present plus an O(n) partition, with no per-row Python work.
+    """
+
+    def __init__(self, coefficients, intercepts):
+        self.region_coefficients = np.ascontiguousarray(coefficients, dtype=np.float64)
+        self.region_intercepts = np.ascontiguousarray(intercepts, dtype=np.float64)
+        if self.region_coefficients.shape != (len(REGIONS), 8) or self.region_intercepts.shape != (len(REGIONS),):
+            raise ValueError(f"Expected {len(REGIONS)}x8 coefficients and {len(REGIONS)} intercepts")
+
+    @classmethod
+    def from_global(cls, coefficients, intercept):
+        """Every region starts from the same global model"""
+        return cls(np.tile(coefficients, (len(REGIONS), 1)), np.full(len(REGIONS), float(intercept)))
+
+    def fit(self, X, y, min_rows=200):
+        """Least squares per region; regions with fewer than min_rows rows use the global fit"""
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        Z = np.hstack([X, np.ones((len(X), 1))])
+        global_theta, *_ = np.linalg.lstsq(Z, y, rcond=None)
+        codes = region_codes(X[:, 6], X[:, 7])
+        self.region_rows = np.bincount(codes, minlength=len(REGIONS)).tolist()
+        for code in range(len(REGIONS)):
+            mask = codes == code
+            theta = np.linalg.lstsq(Z[mask], y[mask], rcond=None)[0] if mask.sum() >= min_rows else global_theta
+            self.region_coefficients[code] = theta[:-1]
+            self.region_intercepts[code] = theta[-1]
+        return self
+
+    def predict(self, features):
+        """Single property (list of 8) -> [price]; a 2-D input is scored as a batch"""
+        X = np.asarray(features, dtype=np.float64)
+        if X.ndim == 2:
+            return self.predict_batch(X)
+        if X.shape != (8,):
+            raise ValueError("Expected 8 features")
+        code = region_code(X[6], X[7])
+        return [float(X @ self.region_coefficients[code] + self.region_intercepts[code])]
+
+    def predict_batch(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        codes = region_codes(X[:, 6], X[:, 7])
+        counts = np.bincount(codes, minlength=len(REGIONS))
+        present = np.flatnonzero(counts)
+        if len(present) == 1:
+            # Common for batches from one area: no partitioning needed
+            code = present[0]
+            return X @ self.region_coefficients[code] + self.region_intercepts[code]
+
+        # Stable argsort of int8 codes is a radix sort; rows of each region are then contiguous
+        order = np.argsort(codes, kind="stable")
+        bounds = np.concatenate([[0], np.cumsum(counts)])
+        grouped = X.take(order, axis=0)
+        scores = np.empty(len(X))
+        for code in present:
+            start, end = bounds[code], bounds[code + 1]
+            scores[start:end] = grouped[start:end] @ self.region_coefficients[code] + self.region_intercepts[code]
+        predictions = np.empty(len(X))
+        predictions[order] = scores
+        return predictions
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            spec = json.load(f)
+        if spec.get("format") != FORMAT:
+            raise ValueError(f"{path} is not a {FORMAT} model")
+        regions = spec["regions"]
+        return cls(
+            [regions[key]["coefficients"] for key, _ in REGIONS],
+            [regions[key]["intercept"] for key, _ in REGIONS]
+        )
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump({
+                "format": FORMAT,
+                "regions": {
+                    key: {"coefficients": self.region_coefficients[code].tolist(),
+                          "intercept": float(self.region_intercepts[code])}
+                    for code, (key, _) in enumerate(REGIONS)
+                }
+            }, f, indent=2)
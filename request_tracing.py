@@ -0,0 +1,104 @@
+# Lightweight per-request span tracing with a ring of the slowest requests
+import heapq
+import threading
+import time
+from array import array
+from datetime import datetime
+
+
+class TraceStartMiddleware:
+    """ASGI middleware stamping when a request arrived, before routing and body parsing"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            scope["trace_start_ns"] = time.perf_counter_ns()
+        await self.app(scope, receive, send)
+
+
+class RequestTracer:
+    """Span timings for one request flow, recorded with perf_counter_ns.
+
+    Each thread reuses one preallocated array of span durations, and mark(span)
+    charges the time since the previous mark to that span. Only requests slow
+    enough to enter the top-N of the current window are copied out, into a min-heap
+    per window; the current and previous windows are kept, so memory stays bounded.
+    """
+
+    def __init__(self, spans, keep=20, window=300.0):
+        self.spans = list(spans)
+        self.index = {name: i for i, name in enumerate(self.spans)}
+        self.keep = keep
+        self.window = window
+        self.traced = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._current = []
+        self._previous = []
+        self._window_start = time.monotonic()
+        self._sequence = 0
+
+    def begin(self, start_ns=None):
+        local = self._local
+        durations = getattr(local, "durations", None)
+        if durations is None:
+            durations = local.durations = array("q", bytes(8 * len(self.spans)))
+        else:
+            for i in range(len(durations)):
+                durations[i] = 0
+        local.start = local.last = start_ns or time.perf_counter_ns()
+        local.active = True
+
+    def mark(self, span):
+        local = self._local
+        if not getattr(local, "active", False):
+            return
+        now = time.perf_counter_ns()
+        local.durations[self.index[span]] += now - local.last
+        local.last = now
+
+    def finish(self, label=""):
+        local = self._local
+        if not getattr(local, "active", False):
+            return
+        local.active = False
+        total = time.perf_counter_ns() - local.start
+        self.traced += 1
+        with self._lock:
+            self._rotate()
+            heap = self._current
+            if len(heap) < self.keep or total > heap[0][0]:
+                self._sequence += 1
+                entry = (total, self._sequence, time.time(), label, tuple(local.durations))
+                if len(heap) < self.keep:
+                    heapq.heappush(heap, entry)
+                else:
+                    heapq.heapreplace(heap, entry)
+
+    def _rotate(self):
+        now = time.monotonic()
+        if now - self._window_start >= self.window:
+            # A whole idle window means the previous one is stale too
+            self._previous = self._current if now - self._window_start < 2 * self.window else []
+            self._current = []
+            self._window_start = now
+
+    def slowest(self):
+        with self._lock:
+            self._rotate()
+            entries = heapq.nlargest(self.keep, self._current + self._previous)
+        return {
+            "window_seconds": self.window,
+            "traced_requests": self.traced,
+            "slowest": [
+                {
+                    "total_ms": round(total / 1e6, 3),
+                    "timestamp": datetime.fromtimestamp(ts).isoformat(),
+                    "label": label,
+                    "spans_ms": {name: round(ns / 1e6, 3) for name, ns in zip(self.spans, durations)}
+                }
+                for total, _, ts, label, durations in entries
+            ]
+        }
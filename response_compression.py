@@ -0,0 +1,261 @@
+# Negotiated response compression (zstd, brotli, gzip) with a bounded cache of compressed bodies
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+
+# brotli and zstd are optional; without them only gzip is offered
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "application/javascript", "image/svg+xml", "text/")
+# Fast settings: large JSON compresses well even at low levels
+LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+# Complete bodies at least this large are compressed on a worker thread, off the event loop
+OFFLOAD_SIZE = 256 * 1024
+
+
+class _Gzip:
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        # Sync flush after every chunk so the client can decode what it has received
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data=b""):
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class _Brotli:
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data=b""):
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class _Zstd:
+    def __init__(self, level):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self, data=b""):
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+# Server preference order, used to break ties between equal q-values
+CODECS = {"zstd": _Zstd if zstandard else None, "br": _Brotli if brotli else None, "gzip": _Gzip}
+AVAILABLE_ENCODINGS = [name for name, codec in CODECS.items() if codec]
+
+
+def negotiate(accept_encoding, available=AVAILABLE_ENCODINGS):
+    """Encoding to use for an Accept-Encoding header: highest q-value, then server preference"""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[name.strip()] = q
+    best, best_q = None, 0.0
+    for name in available:
+        q = accepted.get(name, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def weak_etag(etag):
+    """A compressed body is a different byte sequence, so its ETag can't stay strong"""
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+def etag_matches(if_none_match, etag):
+    """If-None-Match with weak comparison: W/"x" matches "x", in a list or as *"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+class ResponseCompression:
+    """Compression settings, counters and an LRU of compressed bodies.
+
+    Cached bodies are keyed by encoding and a hash of the uncompressed body,
+    so identical output from a cacheable response (GET without no-store or
+    private) is compressed once however many times it is served. Hashing is
+    an order of magnitude cheaper than compressing. The cache is bounded both
+    in entries and in total compressed bytes.
+    """
+
+    def __init__(self, minimum_size=1024, cache_entries=256, cache_bytes=32 * 1024 * 1024,
+                 encodings=AVAILABLE_ENCODINGS, levels=LEVELS):
+        self.minimum_size = minimum_size
+        self.cache_entries = cache_entries
+        self.cache_bytes = cache_bytes
+        self.encodings = [name for name in encodings if CODECS.get(name)]
+        self.levels = dict(levels)
+        self.cache = OrderedDict()
+        self.cached_bytes = 0
+        self._lock = threading.Lock()
+        self.counters = {"compressed": 0, "streamed": 0, "too_small": 0, "cache_hits": 0,
+                         "bytes_in": 0, "bytes_out": 0}
+        self.by_encoding = {name: 0 for name in self.encodings}
+
+    def encoding_for(self, accept_encoding):
+        return negotiate(accept_encoding, self.encodings) if accept_encoding else None
+
+    def codec(self, encoding):
+        self.by_encoding[encoding] += 1
+        return CODECS[encoding](self.levels[encoding])
+
+    def compress(self, body, encoding, cacheable=False):
+        """Whole body in one shot, served from the cache when the same body was seen before"""
+        key = None
+        if cacheable and self.cache_entries:
+            key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+            with self._lock:
+                compressed = self.cache.get(key)
+                if compressed is not None:
+                    self.cache.move_to_end(key)
+                    self.counters["cache_hits"] += 1
+                    self.by_encoding[encoding] += 1
+                    self._count(body, compressed)
+                    return compressed
+
+        compressed = self.codec(encoding).finish(body)
+        self.counters["compressed"] += 1
+        self._count(body, compressed)
+        if key is not None and len(compressed) <= self.cache_bytes:
+            with self._lock:
+                if key not in self.cache:
+                    self.cache[key] = compressed
+                    self.cached_bytes += len(compressed)
+                while len(self.cache) > self.cache_entries or self.cached_bytes > self.cache_bytes:
+                    _, evicted = self.cache.popitem(last=False)
+                    self.cached_bytes -= len(evicted)
+        return compressed
+
+    def _count(self, body, compressed):
+        self.counters["bytes_in"] += len(body)
+        self.counters["bytes_out"] += len(compressed)
+
+    def stats(self):
+        bytes_in = self.counters["bytes_in"]
+        return {
+            **self.counters,
+            "ratio": round(self.counters["bytes_out"] / bytes_in, 4) if bytes_in else None,
+            "by_encoding": dict(self.by_encoding),
+            "cache": {"entries": len(self.cache), "bytes": self.cached_bytes,
+                      "max_entries": self.cache_entries, "max_bytes": self.cache_bytes},
+            "config": {"encodings": self.encodings, "minimum_size": self.minimum_size, "levels": self.levels}
+        }
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses with the encoding negotiated by ResponseCompression.
+
+    A complete body below minimum_size is sent as-is. A streaming response
+    (more_body) is compressed chunk by chunk and flushed after each one, so
+    NDJSON streams still arrive incrementally. A compressed response's ETag is
+    made weak, so it never claims to be byte-identical to the identity body.
+    """
+
+    def __init__(self, app, compression):
+        self.app = app
+        self.compression = compression
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = b""
+        for name, value in scope.get("headers") or []:
+            if name == b"accept-encoding":
+                accept_encoding = value
+        encoding = self.compression.encoding_for(accept_encoding.decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        compression = self.compression
+        start = None
+        stream = None
+        passthrough = False
+
+        async def compressing_send(message):
+            nonlocal start, stream, passthrough
+            if passthrough or message["type"] not in ("http.response.start", "http.response.body"):
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                # Held until the first body chunk shows whether the response is complete
+                start = message
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if stream is not None:
+                data = stream.compress(body) if more_body else stream.finish(body)
+                if data or not more_body:
+                    await send({"type": "http.response.body", "body": data, "more_body": more_body})
+                return
+
+            headers = MutableHeaders(scope=start)
+            too_small = not more_body and len(body) < compression.minimum_size
+            if (start["status"] in (204, 304) or "content-encoding" in headers or too_small
+                    or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)):
+                compression.counters["too_small"] += too_small
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            headers["content-encoding"] = encoding
+            headers.add_vary_header("Accept-Encoding")
+            if "etag" in headers:
+                headers["etag"] = weak_etag(headers["etag"])
+            if more_body:
+                del headers["content-length"]
+                stream = compression.codec(encoding)
+                compression.counters["streamed"] += 1
+                await send(start)
+                await send({"type": "http.response.body", "body": stream.compress(body), "more_body": True})
+                return
+
+            cache_control = headers.get("cache-control", "")
+            cacheable = scope["method"] == "GET" and "no-store" not in cache_control and "private" not in cache_control
+            if len(body) >= OFFLOAD_SIZE:
+                compressed = await run_in_threadpool(compression.compress, body, encoding, cacheable)
+            else:
+                compressed = compression.compress(body, encoding, cacheable)
+            headers["content-length"] = str(len(compressed))
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, compressing_send)
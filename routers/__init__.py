@@ -0,0 +1 @@
+# Routers mounted by app_factory.create_app; each is imported only by profiles that use it
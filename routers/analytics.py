@@ -0,0 +1,225 @@
+# Market analytics: prediction statistics, region insights, price heatmap, comparables and holdout evaluation
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
+from datetime import datetime
+import json
+import math
+import os
+import statistics
+import numpy as np
+from comparables import load_comparables
+from evaluation import EvaluationReport, evaluate, model_summary
+from heatmap import PriceHeatmap
+from model_utils import is_feature_row
+from response_compression import etag_matches
+from routers import state
+
+router = APIRouter()
+
+# Comparable-properties index: memory-mapped from disk, built from the reference CSV on first start
+comparables_index = load_comparables(
+    os.getenv("COMPARABLES_INDEX", "comparables_index"),
+    os.getenv("COMPARABLES_DATA")
+)
+
+# Price heatmap: rebuilt from the active model whenever a new one is published
+price_heatmap = PriceHeatmap()
+state.memory_profiler.track("heatmap", lambda: price_heatmap)
+
+def preload():
+    price_heatmap.build(state.model)
+
+@router.on_event("startup")
+def build_heatmap():
+    # No-op when the master already built it for this model
+    price_heatmap.ensure_current(state.model)
+
+@router.post("/comparables")
+def find_comparables(request_data: dict, k: int = 5):
+    """Similar reference properties nearby; 'data' may be one row or a list of rows"""
+    if comparables_index is None:
+        raise HTTPException(status_code=503, detail="Comparables index not available")
+    if not 1 <= k <= 100:
+        raise HTTPException(status_code=400, detail="k must be between 1 and 100")
+
+    data = request_data.get("data", [])
+    batched = isinstance(data, list) and bool(data) and isinstance(data[0], list)
+    rows = data if batched else [data]
+    if not 1 <= len(rows) <= 1000 or not all(map(is_feature_row, rows)):
+        raise HTTPException(status_code=400, detail="'data' must be 8 finite numbers or a list of 1-1000 such rows")
+
+    results = comparables_index.find(rows, k)
+    return {"k": k, "comparables": results if batched else results[0]}
+
+@router.get("/heatmap")
+def get_heatmap(request: Request, format: str = "json", step: int = 1):
+    """Price heatmap over California as a JSON grid or PNG image (step > 1 downsamples)"""
+    if format not in ("json", "png") or not 1 <= step <= 20:
+        raise HTTPException(status_code=400, detail="format must be json or png, step between 1 and 20")
+
+    body, etag = price_heatmap.render(state.model, format, step)
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=300"}
+    # Weak comparison: a client that cached the compressed body sends back W/"..."
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    media_type = "image/png" if format == "png" else "application/json"
+    return Response(content=body, media_type=media_type, headers=headers)
+
+@router.post("/evaluate")
+async def evaluate_model(request: Request):
+    """Accuracy of the active model on labelled sales, overall and per region.
+
+    Send {"samples": [{"data": [...8 features...], "price": dollars}, ...]}, or
+    the same samples as NDJSON (Content-Type: application/x-ndjson), one per
+    line. NDJSON is scored in chunks as the body arrives, so a holdout of any
+    size is evaluated in constant memory.
+    """
+    model = state.model
+    report = EvaluationReport()
+    rows, prices = [], []
+
+    def add(sample, line=None):
+        where = f" (line {line})" if line else ""
+        try:
+            data, price = sample["data"], float(sample["price"])
+        except (TypeError, KeyError, ValueError):
+            raise HTTPException(status_code=400, detail=f"Each sample needs 'data' and a numeric 'price'{where}")
+        if not is_feature_row(data) or not math.isfinite(price):
+            raise HTTPException(status_code=400, detail=f"'data' must be 8 finite numbers and 'price' finite{where}")
+        rows.append(data)
+        prices.append(price)
+
+    async def flush():
+        X = np.asarray(rows, dtype=float)
+        # Prices arrive in dollars; evaluate() works in the model's $100k units
+        await run_in_threadpool(evaluate, model, X, np.asarray(prices) / 100000, report=report)
+        rows.clear()
+        prices.clear()
+
+    if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+        buffer, line = b"", 0
+        async for body in request.stream():
+            buffer += body
+            *lines, buffer = buffer.split(b"\n")
+            for text in lines:
+                line += 1
+                if text.strip():
+                    try:
+                        add(json.loads(text), line)
+                    except ValueError:
+                        raise HTTPException(status_code=400, detail=f"Invalid JSON on line {line}")
+            if len(rows) >= 8192:
+                await flush()
+        if buffer.strip():
+            try:
+                add(json.loads(buffer), line + 1)
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Invalid JSON on line {line + 1}")
+    else:
+        try:
+            samples = (await request.json()).get("samples")
+        except (ValueError, AttributeError):
+            samples = None
+        if not isinstance(samples, list) or not 1 <= len(samples) <= 100000:
+            raise HTTPException(status_code=400, detail="'samples' must be a list of 1-100000 {'data', 'price'} objects")
+        for sample in samples:
+            add(sample)
+    if rows:
+        await flush()
+    if not report.count.sum():
+        raise HTTPException(status_code=400, detail="No samples to evaluate")
+    return {"model": model_summary(model), **report.to_dict()}
+
+@router.get("/analytics")
+def get_analytics():
+    return state.analytics_flight.do("analytics", compute_analytics)
+
+def compute_analytics():
+    prediction_history = state.prediction_history
+    if not prediction_history:
+        return {
+            "total_predictions": 0,
+            "avg_price": 0,
+            "market_status": "📊 Getting Started",
+            "top_region": "🌍 California",
+            "growth_trend": "📈 Ready to Analyze"
+        }
+
+    # Calculate analytics
+    total = len(prediction_history)
+    recent_30 = prediction_history[-30:] if len(prediction_history) >= 30 else prediction_history
+    prices = [p['price'] for p in recent_30]
+    avg_price = sum(prices) / len(prices)
+
+    # Region analysis
+    regions = {}
+    for pred in prediction_history[-50:]:
+        region = pred.get('region', 'Unknown')
+        if region in regions:
+            regions[region] += 1
+        else:
+            regions[region] = 1
+
+    top_region = max(regions.items(), key=lambda x: x[1])[0] if regions else "California"
+
+    # Market status
+    if total > 100:
+        market_status = "🔥 Very Active Market"
+    elif total > 50:
+        market_status = "📈 Active Market"
+    elif total > 20:
+        market_status = "📊 Growing Market"
+    else:
+        market_status = "🌱 Emerging Market"
+
+    return {
+        "total_predictions": total,
+        "avg_price": int(avg_price),
+        "market_status": market_status,
+        "top_region": f"🏙️ {top_region.split(' ')[0] if ' ' in top_region else top_region}",
+        "growth_trend": "📈 Positive" if len(prediction_history) > 10 else "📊 Building Data",
+        "price_range": {
+            "min": int(min(prices)),
+            "max": int(max(prices)),
+            "median": int(statistics.median(prices))
+        } if prices else {}
+    }
+
+@router.get("/stats")
+def get_stats():
+    prediction_history = state.prediction_history
+    if not prediction_history:
+        return {"message": "No predictions yet", "total": 0}
+
+    recent = prediction_history[-10:]
+    return {
+        "total_predictions": len(prediction_history),
+        "recent_average": f"${sum(p['price'] for p in recent) / len(recent):,.0f}",
+        "latest_predictions": [{"price": f"${p['price']:,.0f}", "time": p['timestamp'][:16]} for p in recent],
+        "market_insights": state.market_insights.get_market_summary()
+    }
+
+@router.get("/market-insights/{region}")
+def get_region_insights(region: str):
+    """Get detailed insights for a specific region"""
+    # Sample coordinates for different regions
+    region_coords = {
+        "bay_area": (37.7749, -122.4194),
+        "los_angeles": (34.0522, -118.2437),
+        "san_diego": (32.7157, -117.1611),
+        "central_valley": (36.7378, -119.7871)
+    }
+
+    if region.lower() not in region_coords:
+        raise HTTPException(status_code=404, detail="Region not found")
+
+    lat, lng = region_coords[region.lower()]
+    insights = state.market_insights.get_region_insights(lat, lng)
+
+    # Add prediction count for this region
+    region_predictions = [p for p in state.prediction_history if region.lower().replace('_', ' ') in p.get('region', '').lower()]
+    insights["prediction_count"] = len(region_predictions)
+    insights["recent_activity"] = len([p for p in region_predictions if datetime.fromisoformat(p['timestamp']).date() == datetime.now().date()])
+
+    return insights
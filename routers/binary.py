@@ -0,0 +1,43 @@
+# Binary prediction protocol served from the app's own event loop, so it shares the model and history
+from fastapi import APIRouter, Depends
+import os
+from binary_protocol import MAX_BATCH_ROWS, new_stats, start_server
+from memory_debug import require_debug_token
+from routers import state
+
+router = APIRouter()
+
+unix_path = os.getenv("BINARY_SOCKET")
+tcp_host = os.getenv("BINARY_HOST", "127.0.0.1")
+tcp_port = int(os.getenv("BINARY_PORT", 0)) or None
+max_batch_rows = int(os.getenv("BINARY_MAX_BATCH_ROWS", MAX_BATCH_ROWS))
+stats = new_stats()
+servers = []
+
+@router.on_event("startup")
+async def start_binary_protocol():
+    if servers:
+        return
+    try:
+        servers.extend(await start_server(state, unix_path, tcp_host, tcp_port, stats, max_batch_rows))
+        addresses = ([unix_path] if unix_path else []) + ([f"{tcp_host}:{tcp_port}"] if tcp_port else [])
+        print(f"⚡ Binary protocol listening on {', '.join(addresses)}")
+    except (OSError, RuntimeError) as e:
+        # Another worker already serves the Unix socket
+        print(f"⚠️ Binary protocol not started: {e}")
+
+@router.on_event("shutdown")
+async def stop_binary_protocol():
+    if not servers:
+        return
+    for server in servers:
+        server.close()
+        await server.wait_closed()
+    servers.clear()
+    if unix_path and os.path.exists(unix_path):
+        os.unlink(unix_path)
+
+@router.get("/debug/binary", dependencies=[Depends(require_debug_token)])
+def get_binary_stats():
+    """Connections, frames and predictions served over the binary protocol"""
+    return {"unix_socket": unix_path, "tcp_port": tcp_port, "max_batch_rows": max_batch_rows, "listening": bool(servers), **stats}
@@ -0,0 +1,77 @@
+# Operational endpoints: admission and coalescing counters, memory, CPU and slow-request inspection
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import Response
+from memory_debug import require_debug_token
+from sampling_profiler import SamplingProfiler
+from routers import state
+
+router = APIRouter(prefix="/debug")
+
+# Live CPU profiling (/debug/profile): a sampler thread runs only while a profile is requested
+sampling_profiler = SamplingProfiler()
+
+@router.get("/rate-limit", dependencies=[Depends(require_debug_token)])
+def get_rate_limit_stats():
+    """Admission-control counters for tuning the limits"""
+    return state.rate_limiter.stats()
+
+@router.get("/compression", dependencies=[Depends(require_debug_token)])
+def get_compression_stats():
+    """Compression ratio, per-encoding counts and compressed-body cache usage"""
+    return state.response_compression.stats()
+
+@router.get("/coalescing", dependencies=[Depends(require_debug_token)])
+def get_coalescing_stats():
+    """How often identical concurrent requests were served by one computation"""
+    return {"predict": state.predict_flight.stats(), "analytics": state.analytics_flight.stats()}
+
+@router.get("/memory", dependencies=[Depends(require_debug_token)])
+def get_memory_report(limit: int = 20, group_by: str = "lineno"):
+    """Tracing status, tracked store sizes and, while tracing, the top allocation sites"""
+    if group_by not in ("lineno", "filename"):
+        raise HTTPException(status_code=400, detail="group_by must be lineno or filename")
+    report = state.memory_profiler.status()
+    if report["tracing"]:
+        report["top"] = state.memory_profiler.top(limit, group_by)
+    return report
+
+@router.post("/memory/start", dependencies=[Depends(require_debug_token)])
+def start_memory_tracing(frames: int = 1):
+    state.memory_profiler.start(max(1, min(frames, 25)))
+    return state.memory_profiler.status()
+
+@router.post("/memory/stop", dependencies=[Depends(require_debug_token)])
+def stop_memory_tracing():
+    state.memory_profiler.stop()
+    return state.memory_profiler.status()
+
+@router.post("/memory/snapshot", dependencies=[Depends(require_debug_token)])
+def take_memory_snapshot(name: str = "baseline"):
+    return state.memory_profiler.snapshot(name)
+
+@router.get("/memory/diff", dependencies=[Depends(require_debug_token)])
+def get_memory_diff(base: str = "baseline", limit: int = 20, group_by: str = "lineno"):
+    """Allocation growth since a named snapshot, largest first"""
+    if group_by not in ("lineno", "filename"):
+        raise HTTPException(status_code=400, detail="group_by must be lineno or filename")
+    return {"base": base, "diff": state.memory_profiler.diff(base, limit, group_by)}
+
+@router.get("/profile", dependencies=[Depends(require_debug_token)])
+def get_profile(seconds: float = 5.0):
+    """Sample all threads for N seconds; returns collapsed stacks for flamegraph tools"""
+    if not 0.1 <= seconds <= 60:
+        raise HTTPException(status_code=400, detail="seconds must be between 0.1 and 60")
+    try:
+        counts, ticks = sampling_profiler.profile(seconds)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return Response(
+        content=sampling_profiler.collapsed(counts),
+        media_type="text/plain",
+        headers={"X-Profile-Samples": str(ticks), "X-Profile-Interval-Ms": str(sampling_profiler.interval * 1000)}
+    )
+
+@router.get("/slow", dependencies=[Depends(require_debug_token)])
+def get_slow_requests():
+    """Slowest /predict requests of the recent window, with per-span timings"""
+    return state.predict_tracer.slowest()
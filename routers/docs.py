@@ -0,0 +1,18 @@
+# Interactive API docs; the OpenAPI schema is only generated when first requested
+from fastapi import APIRouter, Request
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
+from fastapi.responses import JSONResponse
+
+router = APIRouter(include_in_schema=False)
+
+@router.get("/openapi.json")
+def openapi(request: Request):
+    return JSONResponse(request.app.openapi())
+
+@router.get("/docs")
+def swagger_ui(request: Request):
+    return get_swagger_ui_html(openapi_url="/openapi.json", title=f"{request.app.title} - Docs")
+
+@router.get("/redoc")
+def redoc(request: Request):
+    return get_redoc_html(openapi_url="/openapi.json", title=f"{request.app.title} - ReDoc")
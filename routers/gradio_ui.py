@@ -0,0 +1,186 @@
+# Gradio UI: the interactive predictor mounted at /gradio
+import os
+from datetime import datetime
+import gradio as gr
+
+# Create enhanced Gradio interface
+custom_css = """
+.gradio-container {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+}
+.main-header {
+    text-align: center;
+    padding: 20px;
+    background: rgba(255,255,255,0.1);
+    border-radius: 10px;
+    margin-bottom: 20px;
+}
+"""
+
+# Example properties (also used to warm the example cache)
+EXAMPLES = [
+    [8.3252, 41.0, 6.98, 1.02, 322.0, 2.55, 37.88, -122.23, "San Francisco Bay Area"],
+    [5.6431, 9.0, 7.85, 1.13, 485.0, 2.16, 33.60, -117.88, "Los Angeles Area"],
+    [3.2317, 34.0, 5.82, 1.06, 1977.0, 3.44, 36.06, -119.01, "Central Valley"],
+    [7.2574, 15.0, 8.32, 1.41, 1151.0, 2.93, 32.74, -117.16, "San Diego"],
+]
+
+
+def build_interface(predict_fn, history_fn, example_fn):
+    """Predictor, history and about tabs wired to the given callbacks"""
+    iface = gr.Blocks(
+        title="🏠 AI House Price Predictor"
+    )
+
+    with iface:
+
+        gr.HTML("""
+        <div class="main-header">
+            <h1 style="color: white; font-size: 2.5em; margin-bottom: 10px;">🏠 AI House Price Predictor</h1>
+            <p style="color: white; font-size: 1.2em;">Advanced California Housing Market Analysis</p>
+        </div>
+        """)
+
+        with gr.Tabs():
+            with gr.TabItem("🎯 Price Predictor"):
+                with gr.Row():
+                    with gr.Column(scale=2):
+                        gr.Markdown("### 📝 Property Details")
+                        med_inc = gr.Number(label="💰 Median Income (tens of thousands)", value=8.3252, precision=4)
+                        house_age = gr.Number(label="🏠 House Age (years)", value=41.0, precision=1)
+                        ave_rooms = gr.Number(label="🛏️ Average Rooms", value=6.98, precision=2)
+                        ave_bedrms = gr.Number(label="🛌 Average Bedrooms", value=1.02, precision=2)
+                        population = gr.Number(label="👥 Population", value=322.0, precision=0)
+                        ave_occup = gr.Number(label="🏘️ Average Occupancy", value=2.55, precision=2)
+
+                        gr.Markdown("### 🗺️ Location")
+                        latitude = gr.Number(label="📍 Latitude", value=37.88, precision=2)
+                        longitude = gr.Number(label="📍 Longitude", value=-122.23, precision=2)
+                        location_name = gr.Textbox(label="🏙️ Location Name", value="San Francisco Bay Area")
+
+                    with gr.Column(scale=3):
+                        gr.Markdown("### 🔮 Prediction Result")
+                        prediction_output = gr.Textbox(
+                            label="📊 Analysis Report",
+                            lines=15,
+                            max_lines=20
+                        )
+
+                predict_btn = gr.Button("🚀 Predict House Price", variant="primary", size="lg")
+
+            with gr.TabItem("📈 Price History"):
+                with gr.Column():
+                    gr.Markdown("### 📊 Recent Predictions")
+                    history_output = gr.Textbox(label="Prediction History", lines=10)
+                    refresh_btn = gr.Button("🔄 Refresh History", variant="secondary")
+
+            with gr.TabItem("ℹ️ About"):
+                gr.Markdown("""
+                ## 🎯 About This AI Predictor
+
+                This advanced house price prediction system uses machine learning to analyze California housing market data and provide accurate price estimates with market insights.
+
+                ### ✨ Features:
+                - **🤖 AI-Powered Predictions**: Custom trained model for accurate estimates
+                - **📊 Market Insights**: Comprehensive analysis of price factors
+                - **🎯 Confidence Scoring**: Reliability assessment for each prediction
+                - **🌍 Location Intelligence**: Geographic premium analysis
+                - **📈 Trend Analysis**: Historical prediction tracking
+
+                ### 📋 Input Features:
+                1. **Median Income**: Average household income in the area (in $10K)
+                2. **House Age**: Average age of houses in the neighborhood
+                3. **Average Rooms**: Average number of rooms per house
+                4. **Average Bedrooms**: Average number of bedrooms per house
+                5. **Population**: Total population in the area
+                6. **Average Occupancy**: Average number of people per household
+                7. **Latitude & Longitude**: Geographic coordinates
+
+                ### 🎨 Made with:
+                - FastAPI for robust API development
+                - Gradio for interactive UI
+                - Custom ML model for predictions
+                - Modern responsive design
+                """)
+
+        # Event handlers
+        predict_btn.click(
+            predict_fn,
+            inputs=[med_inc, house_age, ave_rooms, ave_bedrms, population, ave_occup, latitude, longitude, location_name],
+            outputs=prediction_output
+        )
+
+        refresh_btn.click(
+            history_fn,
+            outputs=history_output
+        )
+
+        gr.Examples(
+            examples=EXAMPLES,
+            inputs=[med_inc, house_age, ave_rooms, ave_bedrms, population, ave_occup, latitude, longitude, location_name],
+            outputs=prediction_output,
+            fn=example_fn,
+            cache_examples=False,
+            run_on_click=True
+        )
+
+    return iface
+
+def mount(app):
+    """Serve the UI at /gradio, backed by the shared model and history"""
+    from example_cache import ExampleCache
+    from model_utils import model_fingerprint
+    from routers import state
+
+    def predict_house_price(med_inc, house_age, ave_rooms, ave_bedrms, population, ave_occup, latitude, longitude, location_name="California"):
+        try:
+            features = [med_inc, house_age, ave_rooms, ave_bedrms, population, ave_occup, latitude, longitude]
+            result = state.evaluate_prediction(features, False)
+            interval = result["interval"]
+            if interval:
+                price_range = f"${interval['lower']:,.0f} - ${interval['upper']:,.0f} ({interval['level']:.0%} interval)"
+            else:
+                price_range = "Not available for this model"
+            region = result["region_insights"]
+
+            report = f"""
+🏠 **HOUSE PRICE PREDICTION REPORT**
+═══════════════════════════════════════
+💰 **Estimated Price: ${result['actual_price']:,.2f}**
+📏 **Likely Range: {price_range}**
+
+📊 **Analysis:**
+• {result['location_insight']}
+• {region['market_trend']} - {region['growth_rate']} growth, {region['inventory_level'].lower()} inventory
+• Confidence Level: {result['confidence']}
+
+📍 **Location: {location_name}**
+📅 **Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}**
+            """
+            return report.strip()
+        except Exception as e:
+            return f"❌ Error: {str(e)}"
+
+    def get_price_history():
+        history = state.prediction_history
+        if not history:
+            return "No predictions made yet."
+
+        text = "📈 **RECENT PREDICTIONS**\n" + "="*30 + "\n"
+        for i, pred in enumerate(history[-5:], 1):
+            text += f"{i}. ${pred['price']:,.0f} - {pred['location']} ({pred['timestamp'][:16]})\n"
+        avg_price = sum(p["price"] for p in history) / len(history)
+        text += f"\n📊 Average: ${avg_price:,.0f} | Total: {len(history)} predictions"
+        return text
+
+    # Example outputs are cached on disk per model version instead of re-running at every startup
+    example_cache = ExampleCache(predict_house_price, os.getenv("EXAMPLE_CACHE_PATH", ".gradio/example_cache.json"))
+
+    def predict_example(*example):
+        return example_cache.lookup(model_fingerprint(state.model), list(example))
+
+    iface = build_interface(predict_house_price, get_price_history, predict_example)
+    state.memory_profiler.track("example_cache", lambda: example_cache.entries)
+    state.memory_profiler.track("gradio_state", lambda: getattr(iface, "state_holder", None))
+    app.router.add_event_handler("startup", lambda: example_cache.warm(model_fingerprint(state.model), EXAMPLES))
+    return gr.mount_gradio_app(app, iface, path="/gradio")
@@ -0,0 +1,257 @@
+# Prediction API: single and batch scoring, sold-price feedback and the health check
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from datetime import datetime
+import json
+import math
+import os
+import numpy as np
+from explanations import explainer_for
+from model_utils import is_feature_row, predict_rows
+from sensitivity import Sweep
+from projection import horizon_years, project_prices
+from simulation import SimulationPool, simulation_from_request
+from routers import state
+
+router = APIRouter()
+
+# Monte Carlo simulations (/predict with "simulate") run on their own small pool
+simulation_pool = SimulationPool(
+    workers=int(os.getenv("SIMULATION_WORKERS", 2)),
+    max_pending=int(os.getenv("SIMULATION_MAX_PENDING", 8))
+)
+
+def preload():
+    explainer_for(state.model)
+
+@router.on_event("startup")
+def start_model_updater():
+    if state.model_updater:
+        state.model_updater.start()
+
+@router.on_event("shutdown")
+def stop_model_updater():
+    if state.model_updater:
+        state.model_updater.stop()
+
+@router.post("/predict")
+def predict(request_data: dict, request: Request, explain: bool = False):
+    tracer = state.predict_tracer
+    tracer.begin(request.scope.get("trace_start_ns"))
+    try:
+        # Extract data from request
+        data = request_data.get("data", [])
+        location = request_data.get("location", "California")
+        # Checked before anything is evaluated or recorded: a bad row in the history breaks /analytics
+        if not is_feature_row(data):
+            raise HTTPException(status_code=400, detail="'data' must be 8 finite numbers")
+        # Optional price distribution under per-feature uncertainty; a bad spec fails here, before anything is recorded
+        simulation = None
+        if request_data.get("simulate") is not None:
+            simulation = simulation_from_request(data, request_data["simulate"])
+        tracer.mark("parse")
+
+        # Create prediction data object
+        pred_data = state.PredictionData(data, location)
+        tracer.mark("prediction_data")
+
+        # Concurrent requests for the same property wait on one evaluation
+        key = (tuple(float(x) for x in data), explain)
+        result = state.predict_flight.do(key, state.evaluate_prediction, data, explain)
+        tracer.mark("coalesced_wait")
+        actual_price = result["actual_price"]
+        region_insights = result["region_insights"]
+
+        # Run before the prediction is stored, so a full pool (503) leaves the history untouched
+        if simulation is not None:
+            try:
+                simulation = simulation_pool.run(simulation, state.model)
+            except RuntimeError as e:
+                raise HTTPException(status_code=503, detail=str(e))
+        tracer.mark("simulation")
+
+        # Store prediction
+        state.record_prediction(data, location, result)
+        tracer.mark("history_append")
+
+        market_summary = state.market_insights.get_market_summary()
+        tracer.mark("market_summary")
+
+        # Return enhanced response (rendered here so serialization is part of the trace)
+        response = JSONResponse({
+            "prediction_formatted": f"${actual_price:,.2f}",
+            "prediction_interval": result["interval"],
+            "confidence": result["confidence"],
+            "location_insight": result["location_insight"],
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "market_insights": {
+                "region_data": region_insights,
+                "market_summary": market_summary
+            },
+            "prediction_id": len(state.prediction_history),
+            "explanation": result["explanation"],
+            "simulation": simulation
+        })
+        tracer.mark("serialization")
+        tracer.finish(region_insights["region"])
+        return response
+    except HTTPException:
+        tracer.finish("error")
+        raise
+    except Exception as e:
+        tracer.finish("error")
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/predict/batch")
+def predict_batch(request_data: dict, explain: bool = False):
+    """Score many properties in one vectorized call (batch results are not added to history)"""
+    rows = request_data.get("data", [])
+    if not isinstance(rows, list) or not 1 <= len(rows) <= 10000 or not all(map(is_feature_row, rows)):
+        raise HTTPException(status_code=400, detail="'data' must be a list of 1-10000 rows of 8 finite numbers each")
+
+    model = state.model
+    try:
+        X = np.asarray(rows, dtype=float)
+        predictions = model.predict_batch(X)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    result = {
+        "count": len(predictions),
+        "prices": np.round(predictions * 100000, 2).tolist()
+    }
+    intervals = state.prediction_intervals
+    if intervals:
+        lower, upper = intervals.bounds(X, predictions)
+        result["prediction_intervals"] = {
+            "lower": np.round(lower * 100000, 2).tolist(),
+            "upper": np.round(upper * 100000, 2).tolist(),
+            "level": intervals.level
+        }
+    if explain:
+        explainer = explainer_for(model)
+        result["explanations"] = explainer.explain_batch(X) if explainer else None
+    return result
+
+@router.post("/predict/sweep")
+def predict_sweep(request_data: dict):
+    """Price curve (one varied feature) or surface (two) around a base property, in one vectorized call"""
+    data = request_data.get("data", [])
+    vary = request_data.get("vary", [])
+    model = state.model
+    try:
+        sweep = Sweep(data, [vary] if isinstance(vary, dict) else vary)
+        prices = sweep.evaluate(model)
+        base_price = float(predict_rows(model, sweep.base[None])[0]) * 100000
+    except (ValueError, TypeError, AttributeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Insights describe the base property, so the region is looked up once
+    return {
+        "base_price": round(base_price, 2),
+        "region_insights": state.market_insights.get_region_insights(data[6], data[7]),
+        **sweep.to_dict(prices)
+    }
+
+@router.post("/predict/projection")
+def predict_projection(request_data: dict, stream: bool = False):
+    """Prices 1..N years out, compounding each property's regional growth rate.
+
+    'data' is one property or a list of them; ?stream=true returns NDJSON, one line
+    per property, computed in chunks so large batches start arriving immediately.
+    """
+    data = request_data.get("data", [])
+    batched = isinstance(data, list) and bool(data) and isinstance(data[0], list)
+    rows = data if batched else [data]
+    limit = 100000 if stream else 10000
+    if not 1 <= len(rows) <= limit or not all(map(is_feature_row, rows)):
+        raise HTTPException(status_code=400, detail=f"'data' must be 8 finite numbers or a list of 1-{limit} such rows")
+    try:
+        years = horizon_years(request_data.get("years", 5))
+        X = np.asarray(rows, dtype=float)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    model = state.model
+    insights = state.market_insights
+    growth = insights.growth_rates()
+
+    def project(X):
+        codes = insights.region_codes(X[:, 6], X[:, 7])
+        prices = predict_rows(model, X) * 100000
+        return codes, prices, project_prices(prices, growth[codes], years)
+
+    if stream:
+        def lines(chunk_size=2048):
+            for start in range(0, len(X), chunk_size):
+                codes, prices, projected = project(X[start:start + chunk_size])
+                prices, projected = np.round(prices, 2).tolist(), np.round(projected, 2).tolist()
+                yield "".join(
+                    json.dumps({
+                        "index": start + i,
+                        "region": state.REGIONS[code][1],
+                        "current_price": prices[i],
+                        "projected_prices": projected[i]
+                    }) + "\n"
+                    for i, code in enumerate(codes.tolist())
+                )
+        return StreamingResponse(lines(), media_type="application/x-ndjson", headers={"X-Projection-Years": ",".join(map(str, years.tolist()))})
+
+    codes, prices, projected = project(X)
+    if not batched:
+        return {
+            "current_price": round(float(prices[0]), 2),
+            "region": state.REGIONS[codes[0]][1],
+            "annual_growth": float(growth[codes[0]]),
+            "projections": [{"years": int(y), "price": p} for y, p in zip(years, np.round(projected[0], 2).tolist())]
+        }
+    return {
+        "count": len(rows),
+        "years": years.tolist(),
+        "regions": [state.REGIONS[code][1] for code in codes.tolist()],
+        "current_prices": np.round(prices, 2).tolist(),
+        "projected_prices": np.round(projected, 2).tolist()
+    }
+
+@router.post("/feedback")
+def submit_feedback(request_data: dict):
+    """Queue observed sold prices for online model updates"""
+    updater = state.model_updater
+    if updater is None:
+        raise HTTPException(status_code=501, detail="Active model does not support online updates")
+    samples = request_data.get("samples")
+    if samples is None:
+        samples = [request_data]
+
+    if not isinstance(samples, list):
+        raise HTTPException(status_code=400, detail="'samples' must be a list")
+
+    # Validated here: one bad row would otherwise poison the shared estimator off-thread
+    pairs = []
+    for sample in samples:
+        data = sample.get("data") if isinstance(sample, dict) else None
+        price = sample.get("price") if isinstance(sample, dict) else None
+        if (not is_feature_row(data) or not isinstance(price, (int, float)) or isinstance(price, bool)
+                or not math.isfinite(price) or price <= 0):
+            raise HTTPException(status_code=400, detail="Each sample needs 8 finite numbers in 'data' and a finite positive 'price'")
+        pairs.append((data, price))
+
+    accepted = updater.submit(pairs)
+    if accepted == 0 and pairs:
+        raise HTTPException(status_code=503, detail="Feedback queue is full, retry later")
+    return {
+        "accepted": accepted,
+        "rejected": len(pairs) - accepted,
+        "updater": updater.stats()
+    }
+
+@router.get("/health")
+def health():
+    history = state.prediction_history
+    return {
+        "status": "✅ Healthy",
+        "predictions_made": len(history),
+        "avg_price": f"${sum(p['price'] for p in history[-10:]) / min(10, len(history)):,.0f}" if history else "N/A",
+        "version": "6.0.0",
+        "features": ["Lightning Fast", "No External Dependencies", "Mobile Ready"]
+    }
@@ -0,0 +1,76 @@
+# What-if sweeps: vary one or two features of a property over a range or grid
+import numpy as np
+
+from housing_data import FEATURE_NAMES
+from model_utils import predict_rows
+
+MAX_SWEEP_POINTS = 10000
+_FEATURE_INDEX = {name.lower(): i for i, name in enumerate(FEATURE_NAMES)}
+
+
+def feature_index(feature):
+    """Column of a feature given by name (case-insensitive) or position"""
+    if isinstance(feature, int) and 0 <= feature < len(FEATURE_NAMES):
+        return feature
+    if isinstance(feature, str) and feature.lower() in _FEATURE_INDEX:
+        return _FEATURE_INDEX[feature.lower()]
+    raise ValueError(f"Unknown feature {feature!r}, expected one of {', '.join(FEATURE_NAMES)}")
+
+
+def axis_values(axis):
+    """Explicit 'values', or 'start'/'stop' with 'steps' evenly spaced points (ends included)"""
+    if "values" in axis:
+        values = np.asarray(axis["values"], dtype=np.float64)
+    elif "start" in axis and "stop" in axis:
+        steps = int(axis.get("steps", 21))
+        if steps < 2:
+            raise ValueError("'steps' must be at least 2")
+        values = np.linspace(float(axis["start"]), float(axis["stop"]), steps)
+    else:
+        raise ValueError("Each axis needs 'values' or 'start' and 'stop'")
+    if values.ndim != 1 or values.size == 0 or not np.all(np.isfinite(values)):
+        raise ValueError("Axis values must be a non-empty list of finite numbers")
+    return values
+
+
+class Sweep:
+    """The grid of feature vectors for a sweep around one base property.
+
+    Every point shares the base vector except the varied columns, so the grid is
+    one tiled array whose varied columns are filled from a meshgrid; the model
+    then scores all points in a single predict_batch call.
+    """
+
+    def __init__(self, base, axes):
+        self.base = np.asarray(base, dtype=np.float64)
+        if self.base.shape != (len(FEATURE_NAMES),):
+            raise ValueError(f"'data' must have {len(FEATURE_NAMES)} features")
+        if not 1 <= len(axes) <= 2:
+            raise ValueError("'vary' must list one or two features")
+        self.columns = [feature_index(axis.get("feature")) for axis in axes]
+        if len(set(self.columns)) != len(self.columns):
+            raise ValueError("Each feature can only be varied once")
+        self.values = [axis_values(axis) for axis in axes]
+        self.shape = tuple(v.size for v in self.values)
+        if int(np.prod(self.shape)) > MAX_SWEEP_POINTS:
+            raise ValueError(f"Sweep has {int(np.prod(self.shape))} points, the limit is {MAX_SWEEP_POINTS}")
+
+    def grid(self):
+        X = np.tile(self.base, (int(np.prod(self.shape)), 1))
+        for column, mesh in zip(self.columns, np.meshgrid(*self.values, indexing="ij")):
+            X[:, column] = mesh.ravel()
+        return X
+
+    def evaluate(self, model, scale=100000):
+        """Prices over the grid, shaped (n,) for one feature or (n1, n2) for two"""
+        return (predict_rows(model, self.grid()) * scale).reshape(self.shape)
+
+    def to_dict(self, prices):
+        return {
+            "features": [FEATURE_NAMES[c] for c in self.columns],
+            "values": [np.round(v, 6).tolist() for v in self.values],
+            "shape": list(self.shape),
+            "prices": np.round(prices, 2).tolist(),
+            "min_price": round(float(prices.min()), 2),
+            "max_price": round(float(prices.max()), 2)
+        }
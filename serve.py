@@ -0,0 +1,211 @@
+# Production launcher: CPU-aware worker count, fast event loop, tuned sockets
+# Usage: python serve.py [--app main_super_fast:app] [--workers N] [--reuse-port] [--preload]
+import argparse
+import gc
+import importlib
+import importlib.util
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+from cpu_limits import available_cpus, cgroup_cpu_limit
+from memory_debug import process_memory
+
+
+def default_workers():
+    if os.getenv("WEB_CONCURRENCY"):
+        return int(os.getenv("WEB_CONCURRENCY"))
+    # Async workers: one per usable core is enough to saturate the CPU
+    return available_cpus()
+
+
+def best_implementation(preferred, fallback):
+    return preferred if importlib.util.find_spec(preferred) else fallback
+
+
+def bind_socket(host, port, backlog, reuse_port):
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def uvicorn_config(app, settings):
+    return uvicorn.Config(
+        app,
+        loop=settings["loop"],
+        http=settings["http"],
+        timeout_keep_alive=settings["keep_alive"],
+        backlog=settings["backlog"],
+        limit_concurrency=settings["limit_concurrency"],
+        log_level=settings["log_level"],
+        access_log=settings["access_log"],
+        proxy_headers=True,
+    )
+
+
+def run_worker(app, settings, sock=None):
+    """Serve in this process; binds its own SO_REUSEPORT socket when none is inherited"""
+    if sock is None:
+        sock = bind_socket(settings["host"], settings["port"], settings["backlog"], reuse_port=True)
+    uvicorn.Server(uvicorn_config(app, settings)).run(sockets=[sock])
+
+
+def preload_app(app_path):
+    """Import the app in the master so forked workers share it copy-on-write"""
+    module_name, attr = app_path.split(":")
+    module = importlib.import_module(module_name)
+    hook = getattr(module, "preload", None)
+    if hook:
+        hook()
+    app = getattr(module, attr)
+    # Move everything loaded so far out of the GC's reach: collections would
+    # otherwise write to every object header and un-share the pages
+    gc.collect()
+    gc.freeze()
+    return app
+
+
+def print_memory_report(pids):
+    print(f"{'pid':>8} {'rss_kb':>10} {'pss_kb':>10} {'uss_kb':>10} {'shared_kb':>10}")
+    for label, pid in [("master", os.getpid())] + [("worker", pid) for pid in pids]:
+        try:
+            mem = process_memory(pid)
+        except OSError:
+            continue
+        print(f"{pid:>8} {mem['rss_kb']:>10} {mem['pss_kb']:>10} {mem['uss_kb']:>10} {mem['shared_kb']:>10}  {label}")
+    sys.stdout.flush()
+
+
+def supervise(app, settings, sock=None):
+    """Fork the workers and restart any that die until asked to stop"""
+    children = {}
+    stopping = False
+
+    def spawn(slot):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            if hasattr(signal, "SIGUSR1"):
+                signal.signal(signal.SIGUSR1, signal.SIG_IGN)
+            # Stable per-worker identity: slot 0 is the one that trains online_learning's model
+            os.environ["WORKER_SLOT"] = str(slot)
+            try:
+                run_worker(app, settings, sock)
+            finally:
+                os._exit(0)
+        children[pid] = slot
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    # kill -USR1 <master pid> prints per-worker unique memory
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, lambda signum, frame: print_memory_report(list(children)))
+    for slot in range(settings["workers"]):
+        spawn(slot)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        slot = children.pop(pid, None)
+        if slot is not None and not stopping:
+            print(f"⚠️ Worker {pid} exited with status {status}, restarting")
+            time.sleep(1)
+            spawn(slot)
+
+
+def parse_settings(argv=None):
+    parser = argparse.ArgumentParser(description="Run the house price API with production settings")
+    parser.add_argument("--app", default=os.getenv("APP_MODULE", "main_super_fast:app"))
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", 10000)))
+    parser.add_argument("--workers", type=int, default=default_workers())
+    parser.add_argument("--reuse-port", action="store_true", default=os.getenv("REUSE_PORT") == "1",
+                        help="each worker binds its own SO_REUSEPORT socket so the kernel balances connections")
+    parser.add_argument("--preload", action="store_true", default=os.getenv("PRELOAD") == "1",
+                        help="load the app, model and precomputed assets once in the master before forking")
+    parser.add_argument("--keep-alive", type=int, default=int(os.getenv("KEEP_ALIVE", 15)))
+    parser.add_argument("--backlog", type=int, default=int(os.getenv("BACKLOG", 2048)))
+    parser.add_argument("--limit-concurrency", type=int, default=None)
+    parser.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "warning"))
+    parser.add_argument("--access-log", action="store_true")
+    parser.add_argument("--dry-run", action="store_true", help="print the effective configuration and exit")
+    args = parser.parse_args(argv)
+
+    return {
+        "app": args.app,
+        "host": args.host,
+        "port": args.port,
+        "workers": max(1, args.workers),
+        "cpus": available_cpus(),
+        "cgroup_cpu_quota": cgroup_cpu_limit(),
+        "loop": best_implementation("uvloop", "asyncio"),
+        "http": best_implementation("httptools", "h11"),
+        "reuse_port": args.reuse_port and hasattr(socket, "SO_REUSEPORT"),
+        "preload": args.preload and hasattr(os, "fork"),
+        "keep_alive": args.keep_alive,
+        "backlog": args.backlog,
+        "limit_concurrency": args.limit_concurrency,
+        "log_level": args.log_level,
+        "access_log": args.access_log,
+        "dry_run": args.dry_run,
+    }
+
+
+def print_settings(settings):
+    print("🚀 House Price API launcher")
+    for key in ["app", "host", "port", "workers", "cpus", "cgroup_cpu_quota", "loop", "http",
+                "reuse_port", "preload", "keep_alive", "backlog", "limit_concurrency"]:
+        print(f"   {key:<18} {settings[key]}")
+    sys.stdout.flush()
+
+
+def main(argv=None):
+    settings = parse_settings(argv)
+    print_settings(settings)
+    if settings["dry_run"]:
+        return
+
+    if not hasattr(os, "fork"):
+        # No fork (Windows): let uvicorn's own supervisor spawn the workers
+        uvicorn.run(
+            settings["app"], host=settings["host"], port=settings["port"], workers=settings["workers"],
+            loop=settings["loop"], http=settings["http"], timeout_keep_alive=settings["keep_alive"],
+            backlog=settings["backlog"], log_level=settings["log_level"]
+        )
+        return
+
+    # Without preload, workers import the app after the fork (uvicorn resolves the "module:app" string)
+    app = preload_app(settings["app"]) if settings["preload"] else settings["app"]
+    sock = None if settings["reuse_port"] else bind_socket(
+        settings["host"], settings["port"], settings["backlog"], reuse_port=False)
+    if settings["workers"] == 1:
+        run_worker(app, settings, sock)
+    else:
+        supervise(app, settings, sock)
+
+
+if __name__ == "__main__":
+    main()
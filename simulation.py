@@ -0,0 +1,132 @@
+# Monte Carlo price distributions from per-feature uncertainty
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from model_utils import predict_rows
+from sensitivity import feature_index
+
+MAX_SAMPLES = 200000
+CHUNK_SIZE = 8192
+DEFAULT_QUANTILES = (0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95)
+
+
+class PriceSimulation:
+    """Distribution of predicted prices when some features are uncertain.
+
+    Each uncertain feature is either normal around the base value ({"std": s})
+    or uniform over a range ({"range": [low, high]}). Samples are drawn in
+    chunks from one seeded generator and each chunk is scored with a single
+    predict_batch call; sampling stops early once the time budget is spent, so
+    the same seed always yields the same leading samples.
+    """
+
+    def __init__(self, base, uncertainty, samples=10000, seed=None, time_budget=0.25, bins=20):
+        self.base = np.asarray(base, dtype=np.float64)
+        if self.base.shape != (8,):
+            raise ValueError("'data' must have 8 features")
+        if not isinstance(uncertainty, dict) or not uncertainty:
+            raise ValueError("'uncertainty' must map at least one feature to {'std': ...} or {'range': [low, high]}")
+        self.normal, self.uniform = [], []
+        for feature, spec in uncertainty.items():
+            column = feature_index(int(feature) if str(feature).isdigit() else feature)
+            if "std" in spec and float(spec["std"]) >= 0:
+                self.normal.append((column, float(spec["std"])))
+            elif "range" in spec and len(spec["range"]) == 2 and float(spec["range"][0]) <= float(spec["range"][1]):
+                self.uniform.append((column, float(spec["range"][0]), float(spec["range"][1])))
+            else:
+                raise ValueError(f"Uncertainty for {feature!r} needs a non-negative 'std' or a 'range' [low, high]")
+        samples, bins = int(samples), int(bins)
+        if not 1 <= samples <= MAX_SAMPLES:
+            raise ValueError(f"'samples' must be between 1 and {MAX_SAMPLES}")
+        if not 2 <= bins <= 200:
+            raise ValueError("'bins' must be between 2 and 200")
+        self.samples = samples
+        self.seed = None if seed is None else int(seed)
+        self.time_budget = min(float(time_budget), 5.0)
+        self.bins = bins
+
+    def draw(self, rng, n):
+        X = np.tile(self.base, (n, 1))
+        if self.normal:
+            columns, stds = zip(*self.normal)
+            X[:, list(columns)] += rng.standard_normal((n, len(columns))) * np.array(stds)
+        if self.uniform:
+            columns, lows, highs = zip(*self.uniform)
+            X[:, list(columns)] = rng.uniform(np.array(lows), np.array(highs), (n, len(columns)))
+        return X
+
+    def run(self, model, scale=100000):
+        started = time.perf_counter()
+        rng = np.random.default_rng(self.seed)
+        prices = np.empty(self.samples)
+        done = 0
+        while done < self.samples:
+            n = min(CHUNK_SIZE, self.samples - done)
+            prices[done:done + n] = predict_rows(model, self.draw(rng, n)) * scale
+            done += n
+            if time.perf_counter() - started > self.time_budget:
+                break
+        prices = prices[:done]
+
+        counts, edges = np.histogram(prices, bins=self.bins)
+        return {
+            "samples": done,
+            "requested_samples": self.samples,
+            "truncated": done < self.samples,
+            "seed": self.seed,
+            "mean": round(float(prices.mean()), 2),
+            "std": round(float(prices.std()), 2),
+            "quantiles": {str(q): round(float(v), 2) for q, v in zip(DEFAULT_QUANTILES, np.quantile(prices, DEFAULT_QUANTILES))},
+            "histogram": {"edges": np.round(edges, 2).tolist(), "counts": counts.tolist()},
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+
+
+class SimulationPool:
+    """A few dedicated threads for simulations, so they never take over the request threadpool.
+
+    At most `workers` simulations run at once and `max_pending` more may wait;
+    beyond that run() refuses immediately instead of queueing without bound.
+    NumPy releases the GIL while sampling and scoring, so plain /predict requests
+    keep being served while simulations run.
+    """
+
+    def __init__(self, workers=2, max_pending=8):
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="simulation")
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self.completed = 0
+        self.rejected = 0
+
+    def run(self, simulation, model):
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise RuntimeError("Too many simulations in progress, retry later")
+        try:
+            future = self.executor.submit(simulation.run, model)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(self._done)
+        return future.result()
+
+    def _done(self, future):
+        self.completed += 1
+        self._slots.release()
+
+
+def simulation_from_request(data, spec):
+    """Build a simulation from the 'simulate' object of a /predict request"""
+    if not isinstance(spec, dict):
+        raise ValueError("'simulate' must be an object with an 'uncertainty' mapping")
+    return PriceSimulation(
+        data,
+        spec.get("uncertainty"),
+        samples=spec.get("samples", 10000),
+        seed=spec.get("seed"),
+        time_budget=spec.get("time_budget_ms", 250) / 1000,
+        bins=spec.get("bins", 20)
+    )
@@ -0,0 +1,69 @@
+# Startup-time and import budgets per app profile
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app_factory import PROFILES, PROFILE_BUDGETS
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Runs in a fresh interpreter so nothing imported by pytest or another profile counts
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from app_factory import create_app
+app = create_app(sys.argv[1])
+elapsed = time.perf_counter() - started
+
+def paths(routes):
+    for route in routes:
+        # Included routers are kept as one entry wrapping the original router
+        inner = getattr(route, "original_router", None)
+        yield from paths(inner.routes) if inner else [getattr(route, "path", "")]
+
+print(json.dumps({
+    "seconds": elapsed,
+    "modules": sorted(sys.modules),
+    "paths": sorted(set(paths(app.routes))),
+}))
+"""
+
+
+def load_profile(profile):
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, profile],
+        cwd=ROOT, capture_output=True, text=True, timeout=120,
+        env={**os.environ, "MODEL_CHECKPOINT_PATH": os.devnull, "COMPARABLES_INDEX": os.devnull}
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("profile", sorted(PROFILES))
+def test_profile_budget(profile):
+    if "gradio" in PROFILES[profile] and importlib.util.find_spec("gradio") is None:
+        pytest.skip("gradio is not installed")
+    budget = PROFILE_BUDGETS[profile]
+    report = load_profile(profile)
+
+    assert report["seconds"] <= budget["max_seconds"], f"{profile} took {report['seconds']:.2f}s"
+    if budget["max_modules"]:
+        assert len(report["modules"]) <= budget["max_modules"], f"{profile} loaded {len(report['modules'])} modules"
+    leaked = [name for name in report["modules"]
+              if any(name == f or name.startswith(f + ".") for f in budget["forbidden"])]
+    assert not leaked, f"{profile} imported {leaked}"
+
+
+def test_minimal_profile_mounts_only_the_api():
+    paths = load_profile("minimal")["paths"]
+    assert {"/predict", "/predict/batch", "/feedback", "/health"} <= set(paths)
+    assert not {"/", "/analytics", "/docs", "/openapi.json"} & set(paths)
+
+
+def test_standard_profile_serves_docs():
+    paths = load_profile("standard")["paths"]
+    assert {"/", "/analytics", "/heatmap", "/docs", "/openapi.json", "/debug/slow"} <= set(paths)
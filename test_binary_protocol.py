@@ -0,0 +1,161 @@
+# Binary protocol: framing, batch scoring (inline and offloaded), pipelined ordering and error frames
+import asyncio
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+import pytest
+
+from binary_protocol import (FEATURES, HEADER, LENGTH, OP_BATCH, OP_PING, OP_PREDICT, ROWS, BinaryClient,
+                             new_stats, start_server)
+from conftest import ROW, StubLinearModel
+from housing_data import region_code
+from model_utils import predict_rows
+
+MAX_BATCH_ROWS = 3000
+
+
+class FakeState:
+    """The parts of routers.state the protocol uses"""
+    model = StubLinearModel([0.44, 0.01, -0.11, 0.65, -0.000001, -0.04, -0.42, -0.43], -36.9)
+    region_code = staticmethod(region_code)
+
+    def __init__(self):
+        self.history = []
+
+    def evaluate_prediction(self, data, explain):
+        price = float(predict_rows(self.model, [data])[0]) * 100000
+        return {"actual_price": price, "interval": {"lower": price - 1000, "upper": price + 1000}}
+
+    def record_prediction(self, data, location, result):
+        self.history.append((data, location, result["actual_price"]))
+
+
+@pytest.fixture(scope="module")
+def server():
+    state, stats = FakeState(), new_stats()
+    directory = tempfile.mkdtemp()
+    path = f"{directory}/pricing.sock"
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    servers = asyncio.run_coroutine_threadsafe(start_server(state, path, stats=stats, max_batch_rows=MAX_BATCH_ROWS), loop).result()
+    yield path, state, stats
+
+    async def close():
+        for server in servers:
+            server.close()
+            await server.wait_closed()
+    asyncio.run_coroutine_threadsafe(close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+    shutil.rmtree(directory)
+
+
+@pytest.fixture
+def client(server):
+    client = BinaryClient(server[0])
+    yield client
+    client.close()
+
+
+def rows(n, seed=0):
+    return np.tile(ROW, (n, 1)) + np.random.default_rng(seed).normal(size=(n, 8)) * 0.1
+
+
+def test_predict_matches_the_model(server, client):
+    _, state, _ = server
+    result = client.predict(ROW)
+    expected = float(predict_rows(state.model, [ROW])[0]) * 100000
+    assert result["price"] == pytest.approx(expected, rel=1e-12)
+    assert (result["lower"], result["upper"]) == pytest.approx((expected - 1000, expected + 1000))
+    assert result["region"] == region_code(ROW[6], ROW[7])
+    assert state.history[-1][0] == pytest.approx(ROW)
+    client.ping()
+
+
+@pytest.mark.parametrize("n", [1, 50, 2500])
+def test_batch_matches_predict_rows(server, client, n):
+    _, state, stats = server
+    offloaded = stats["offloaded"]
+    X = rows(n)
+    np.testing.assert_allclose(client.predict_batch(X), predict_rows(state.model, X) * 100000, rtol=1e-12)
+    # Batches above OFFLOAD_ROWS are scored on the executor
+    assert stats["offloaded"] == offloaded + (n > 1024)
+
+
+def test_pipelined_replies_keep_request_order(server, client):
+    _, state, _ = server
+    X = rows(2000, seed=1)
+    singles = rows(5, seed=2)
+    # A batch that is offloaded, with single predictions queued behind it in the same write
+    client.sock.sendall(client._request(OP_BATCH, ROWS.pack(len(X)) + X.tobytes())
+                        + b"".join(client._request(OP_PREDICT, FEATURES.pack(*row)) for row in singles))
+    np.testing.assert_allclose(np.frombuffer(client._response(), dtype="<f8"), predict_rows(state.model, X) * 100000)
+    prices = [client._prediction(client._response())["price"] for _ in singles]
+    np.testing.assert_allclose(prices, predict_rows(state.model, singles) * 100000)
+
+    results = client.predict_many(singles[::-1])
+    np.testing.assert_allclose([r["price"] for r in results], predict_rows(state.model, singles[::-1]) * 100000)
+
+
+@pytest.mark.parametrize("op, payload, message", [
+    (OP_PREDICT, FEATURES.pack(*ROW)[:-8], "OP_PREDICT needs 8 float64 features"),
+    (OP_BATCH, ROWS.pack(0), f"OP_BATCH needs 1-{MAX_BATCH_ROWS} rows"),
+    (OP_BATCH, ROWS.pack(MAX_BATCH_ROWS + 1) + FEATURES.pack(*ROW), f"OP_BATCH needs 1-{MAX_BATCH_ROWS} rows"),
+    (OP_BATCH, ROWS.pack(2) + FEATURES.pack(*ROW), f"OP_BATCH needs 1-{MAX_BATCH_ROWS} rows"),
+    (9, b"", "Unknown op 9"),
+])
+def test_bad_requests_get_error_frames_and_the_connection_survives(server, client, op, payload, message):
+    errors = server[2]["errors"]
+    client.sock.sendall(client._request(op, payload))
+    with pytest.raises(ValueError, match=message):
+        client._response()
+    assert server[2]["errors"] == errors + 1
+    client.ping()
+
+
+@pytest.mark.parametrize("value", [np.nan, np.inf, -np.inf])
+def test_non_finite_features_are_rejected_before_scoring(server, client, value):
+    _, state, stats = server
+    history, batch_rows, offloaded = len(state.history), stats["batch_rows"], stats["offloaded"]
+    row = list(ROW)
+    row[4] = value
+    with pytest.raises(ValueError, match="OP_PREDICT features must be finite"):
+        client.predict(row)
+    assert len(state.history) == history
+
+    for n in (3, 2000):  # inline and offloaded
+        X = rows(n)
+        X[n - 1, 0] = value
+        with pytest.raises(ValueError, match="OP_BATCH features must be finite"):
+            client.predict_batch(X)
+    assert (stats["batch_rows"], stats["offloaded"]) == (batch_rows, offloaded)
+    client.ping()
+
+
+@pytest.mark.parametrize("length", [HEADER.size - 1, HEADER.size + ROWS.size + (MAX_BATCH_ROWS + 1) * FEATURES.size])
+def test_invalid_frame_length_closes_the_connection(client, length):
+    client.sock.sendall(LENGTH.pack(length) + HEADER.pack(OP_PING, 1))
+    with pytest.raises(ValueError, match=f"Invalid frame length {length}"):
+        client._response()
+    with pytest.raises(ConnectionError):
+        client.ping()
+
+
+def test_debug_stats_require_the_token(monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from routers import binary
+    app = FastAPI()
+    app.include_router(binary.router)
+    # Not entered as a context manager, so the startup hook doesn't open a socket
+    http = TestClient(app)
+    monkeypatch.delenv("DEBUG_TOKEN", raising=False)
+    assert http.get("/debug/binary").status_code == 404
+    monkeypatch.setenv("DEBUG_TOKEN", "s3cret")
+    assert http.get("/debug/binary").status_code == 403
+    response = http.get("/debug/binary", headers={"X-Debug-Token": "s3cret"})
+    assert response.status_code == 200 and response.json()["max_batch_rows"] == binary.max_batch_rows
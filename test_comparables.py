@@ -0,0 +1,73 @@
+# Comparables KD-tree: nearest neighbours against a brute-force scan, and memory-mapped reload
+import numpy as np
+import pytest
+
+from comparables import ComparablesIndex, haversine_km, load_comparables
+
+
+def reference_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    X = np.column_stack([
+        rng.lognormal(1.2, 0.5, n), rng.integers(1, 52, n), rng.normal(5.4, 1.2, n), rng.normal(1.1, 0.1, n),
+        rng.integers(100, 5000, n), rng.normal(3.0, 0.5, n), rng.uniform(32.5, 42.0, n), rng.uniform(-124.5, -114.0, n),
+    ])
+    return X, rng.uniform(0.5, 5.0, n)
+
+
+def brute_force(index, X, k):
+    distances = ((index.transform(X)[:, None, :] - index.points[None]) ** 2).sum(axis=2)
+    return np.sort(distances, axis=1)[:, :k]
+
+
+@pytest.fixture(scope="module")
+def index():
+    X, y = reference_rows(3000)
+    return ComparablesIndex.build(X, y, leaf_size=16)
+
+
+@pytest.mark.parametrize("k", [1, 5, 40])
+def test_query_matches_brute_force(index, k):
+    queries, _ = reference_rows(200, seed=1)
+    indices, distances = index.query(queries, k)
+    np.testing.assert_allclose(distances, brute_force(index, queries, k), rtol=1e-12, atol=1e-12)
+    # Reported distances belong to the reported rows
+    recomputed = ((index.points[indices] - index.transform(queries)[:, None, :]) ** 2).sum(axis=2)
+    np.testing.assert_allclose(recomputed, distances, rtol=1e-12, atol=1e-12)
+
+
+def test_query_of_an_indexed_row_finds_itself(index):
+    indices, distances = index.query(index.features[:50], 1)
+    assert distances.max() == 0
+    np.testing.assert_array_equal(index.features[indices[:, 0]], index.features[:50])
+
+
+def test_k_is_clamped_to_index_size():
+    X, y = reference_rows(10)
+    small = ComparablesIndex.build(X, y, leaf_size=4)
+    indices, _ = small.query(X[:2], k=50)
+    assert indices.shape == (2, 10)
+    assert sorted(indices[0].tolist()) == list(range(10))
+
+
+def test_find_reports_prices_and_distances(index):
+    row = index.features[7]
+    (comparables,) = index.find(row, k=3)
+    nearest = comparables[0]
+    assert nearest["price"] == round(float(index.prices[7]) * 100000, 2)
+    assert nearest["distance_km"] == 0
+    other = comparables[1]["features"]
+    assert comparables[1]["distance_km"] == round(haversine_km(row[6], row[7], other["Latitude"], other["Longitude"]), 2)
+
+
+def test_saved_index_reloads_memory_mapped(index, tmp_path):
+    index.save(str(tmp_path / "index"))
+    loaded = load_comparables(str(tmp_path / "index"))
+    assert len(loaded) == len(index)
+    queries, _ = reference_rows(20, seed=2)
+    for a, b in zip(loaded.query(queries, 5), index.query(queries, 5)):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_haversine_reference_distance():
+    # San Francisco to Los Angeles, about 559 km
+    assert haversine_km(37.7749, -122.4194, 34.0522, -118.2437) == pytest.approx(559.1, abs=1.0)
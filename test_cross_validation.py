@@ -0,0 +1,82 @@
+# Cross-validation: Gram-matrix downdates against a direct standardized ridge solve on each training fold
+import numpy as np
+import pytest
+
+import cross_validation
+from cross_validation import SharedDataset, design, evaluate_fold, fold_ids, normal_equations, scaling_counts, summarize
+from feature_pipeline import FeaturePipeline
+
+FOLDS = 4
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(600, 8)) * [1.9, 12.6, 2.5, 0.5, 1100.0, 10.0, 2.1, 2.0] + [3.9, 28.6, 5.4, 1.1, 1425.0, 3.1, 35.6, -119.6]
+    y = X @ rng.normal(size=8) * 0.01 + rng.normal(size=600)
+    dataset = SharedDataset(X, y, FOLDS, seed=3)
+    equations = {features: dataset.normal_equations(features) for features in ("raw", "pipeline")}
+    # Attach in this process the way pool workers do
+    cross_validation._attach(*dataset.spec)
+    yield X, y, equations
+    cross_validation._shared.close()
+    cross_validation._shared = cross_validation._X = cross_validation._y = cross_validation._folds = None
+    dataset.close()
+
+
+def ridge_predictions(X_train, y_train, X_test, alpha):
+    """Ridge on training-fold standardized features with an unpenalized intercept, via an augmented lstsq"""
+    mean, std = X_train.mean(axis=0), X_train.std(axis=0)
+    Z = np.hstack([(X_train - mean) / std, np.ones((len(X_train), 1))])
+    penalty = np.hstack([np.sqrt(alpha) * np.eye(X_train.shape[1]), np.zeros((X_train.shape[1], 1))])
+    theta = np.linalg.lstsq(np.vstack([Z, penalty]), np.append(y_train, np.zeros(X_train.shape[1])), rcond=None)[0]
+    return (X_test - mean) / std @ theta[:-1] + theta[-1]
+
+
+@pytest.mark.parametrize("features", ["raw", "pipeline"])
+def test_downdated_fits_match_a_direct_solve(data, features):
+    X, y, equations = data
+    derived = X if features == "raw" else FeaturePipeline().transform(X)
+    folds = fold_ids(len(X), FOLDS, seed=3)
+    alphas = [0.0, 1.0, 100.0]
+    for fold in range(FOLDS):
+        results, _ = evaluate_fold(features, fold, alphas, *equations[features])
+        test = folds == fold
+        for row, alpha in zip(results, alphas):
+            residuals = y[test] - ridge_predictions(derived[~test], y[~test], derived[test], alpha)
+            assert row["rows"] == test.sum()
+            assert row["rmse"] == pytest.approx(np.sqrt(np.mean(residuals ** 2)), rel=1e-6)
+            assert row["mae"] == pytest.approx(np.mean(np.abs(residuals)), rel=1e-6)
+            assert row["r2"] == pytest.approx(1 - residuals @ residuals / np.sum((y[test] - y[test].mean()) ** 2), rel=1e-6)
+
+
+@pytest.mark.parametrize("features", ["raw", "pipeline"])
+def test_normal_equations_accumulated_in_chunks_match_the_full_design(data, features):
+    X, y, equations = data
+    Z = design(features, X)
+    gram, moment = normal_equations(features, X, y, chunk_rows=64)
+    np.testing.assert_allclose(gram, Z.T @ Z, rtol=1e-10)
+    np.testing.assert_allclose(moment, Z.T @ y, rtol=1e-10)
+    np.testing.assert_allclose(equations[features][0], Z.T @ Z, rtol=1e-10)
+
+
+def test_fold_ids_are_balanced_and_seeded():
+    ids = fold_ids(103, 5, seed=1)
+    assert sorted(np.bincount(ids).tolist()) == [20, 20, 21, 21, 21]
+    np.testing.assert_array_equal(ids, fold_ids(103, 5, seed=1))
+    assert (ids != fold_ids(103, 5, seed=2)).any()
+
+
+def test_summary_is_sorted_by_mean_r2():
+    results = [{"features": features, "alpha": alpha, "fold": fold, "r2": r2, "rmse": 1.0, "mae": 0.5}
+               for features, alpha, r2s in [("raw", 0.0, [0.5, 0.7]), ("raw", 1.0, [0.8, 0.8]), ("pipeline", 0.0, [0.1, 0.3])]
+               for fold, r2 in enumerate(r2s)]
+    summary = summarize(results)
+    assert [(entry["features"], entry["alpha"]) for entry in summary] == [("raw", 1.0), ("raw", 0.0), ("pipeline", 0.0)]
+    assert summary[1]["r2"] == 0.6 and summary[1]["r2_std"] == 0.1 and summary[0]["r2_std"] == 0.0
+
+
+def test_scaling_counts():
+    assert scaling_counts(1) == [1]
+    assert scaling_counts(8) == [1, 2, 4, 8]
+    assert scaling_counts(6) == [1, 2, 4, 6]
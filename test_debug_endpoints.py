@@ -0,0 +1,26 @@
+# /debug endpoints are hidden without DEBUG_TOKEN and refuse requests without the right X-Debug-Token
+import pytest
+from fastapi.testclient import TestClient
+
+GUARDED = ["/debug/rate-limit", "/debug/coalescing", "/debug/compression", "/debug/memory", "/debug/slow"]
+
+
+@pytest.fixture(scope="module")
+def client(unthrottled):
+    from app_factory import create_app
+    return TestClient(create_app("standard"))
+
+
+@pytest.mark.parametrize("path", GUARDED)
+def test_hidden_without_a_configured_token(client, monkeypatch, path):
+    monkeypatch.delenv("DEBUG_TOKEN", raising=False)
+    assert client.get(path).status_code == 404
+    assert client.get(path, headers={"X-Debug-Token": ""}).status_code == 404
+
+
+@pytest.mark.parametrize("path", GUARDED)
+def test_requires_the_matching_token(client, monkeypatch, path):
+    monkeypatch.setenv("DEBUG_TOKEN", "s3cret")
+    assert client.get(path).status_code == 403
+    assert client.get(path, headers={"X-Debug-Token": "wrong"}).status_code == 403
+    assert client.get(path, headers={"X-Debug-Token": "s3cret"}).status_code == 200
@@ -0,0 +1,109 @@
+# Gradio example cache: per-version pruning, persistence and saves off the request path
+import json
+import os
+import threading
+import time
+
+from example_cache import ExampleCache
+
+EXAMPLES = [[8.3, 41, 6.9, 1.0, 322, 2.5, 37.8, -122.2], [5.6, 52, 5.8, 1.1, 558, 2.5, 37.8, -122.2]]
+
+
+class Counter:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, *example):
+        self.calls.append(example)
+        return f"price for {example[0]}"
+
+
+def wait_for_saves(cache, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while cache._saving and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not cache._saving
+
+
+def test_lookup_computes_once_and_prunes_other_versions(tmp_path):
+    fn = Counter()
+    cache = ExampleCache(fn, str(tmp_path / "cache.json"))
+    assert cache.lookup("v1", EXAMPLES[0]) == cache.lookup("v1", [8.3, 41.0, 6.9, 1.0, 322.0, 2.5, 37.8, -122.2])
+    assert len(fn.calls) == 1 and cache.hits == 1 and cache.misses == 1
+
+    cache.lookup("v1", EXAMPLES[1])
+    cache.lookup("v2", EXAMPLES[1])
+    # Entries computed for v1 are gone as soon as v2 is asked for
+    assert cache.version == "v2" and len(cache.entries) == 1 and len(fn.calls) == 3
+    wait_for_saves(cache)
+    with open(tmp_path / "cache.json") as f:
+        assert json.load(f)["version"] == "v2"
+
+
+def test_warm_start_reuses_current_entries(tmp_path):
+    path = str(tmp_path / "cache.json")
+    first = ExampleCache(Counter(), path)
+    first.warm("v1", EXAMPLES).join()
+    wait_for_saves(first)
+
+    fn = Counter()
+    restarted = ExampleCache(fn, path)
+    assert restarted.warm("v1", EXAMPLES) is None and not fn.calls
+    assert restarted.lookup("v1", EXAMPLES[0]) == "price for 8.3"
+
+    restarted.warm("v2", EXAMPLES[:1]).join()
+    assert fn.calls == [tuple(EXAMPLES[0])] and list(restarted.entries) == [ExampleCache.key(EXAMPLES[0])]
+
+
+def test_misses_do_not_write_on_the_request_path(tmp_path, monkeypatch):
+    cache = ExampleCache(Counter(), str(tmp_path / "cache.json"))
+    release, saves = threading.Event(), []
+    save = cache.save
+
+    def slow_save():
+        release.wait(5)
+        saves.append(1)
+        save()
+
+    monkeypatch.setattr(cache, "save", slow_save)
+    for example in EXAMPLES * 3:
+        cache.lookup("v1", example)
+    # Every lookup returned while the first save was still blocked
+    assert not saves
+    release.set()
+    wait_for_saves(cache)
+    # Misses during a save are folded into one more
+    assert len(saves) == 2
+    assert len(ExampleCache(Counter(), str(tmp_path / "cache.json")).entries) == 2
+
+
+def test_concurrent_saves_do_not_collide(tmp_path):
+    path = str(tmp_path / "cache.json")
+    caches = [ExampleCache(Counter(), path) for _ in range(4)]
+    for cache in caches:
+        cache.lookup("v1", EXAMPLES[0])
+        wait_for_saves(cache)
+    errors = []
+
+    def save_repeatedly(cache):
+        try:
+            for _ in range(25):
+                cache.save()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save_repeatedly, args=(cache,)) for cache in caches for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert os.listdir(tmp_path) == ["cache.json"]
+
+
+def test_unreadable_or_old_format_files_start_empty(tmp_path):
+    path = tmp_path / "cache.json"
+    path.write_text(json.dumps({"abc123": "output without a version"}))
+    assert ExampleCache(Counter(), str(path)).entries == {}
+    path.write_text("not json")
+    assert ExampleCache(Counter(), str(path)).version is None
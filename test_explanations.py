@@ -0,0 +1,64 @@
+# Feature explanations: contributions add up to the price difference from the baseline property
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from conftest import ROW
+from explanations import FeatureExplainer, explainer_for
+from housing_data import FEATURE_MEANS, FEATURE_NAMES
+from linear_model import LinearModel
+
+MODEL = LinearModel([0.44, 0.01, -0.11, 0.65, -0.000001, -0.04, -0.42, -0.43], -36.9, FEATURE_MEANS * 1.01)
+
+
+def rows(n, seed=0):
+    return np.tile(ROW, (n, 1)) + np.random.default_rng(seed).normal(size=(n, 8)) * [1, 5, 1, 0.1, 300, 0.5, 1, 1]
+
+
+def test_contributions_sum_to_the_price_difference():
+    explainer = FeatureExplainer.from_model(MODEL)
+    X = rows(200)
+    np.testing.assert_allclose(explainer.contributions(X).sum(axis=1) + explainer.baseline_prediction,
+                               MODEL.predict_batch(X), rtol=1e-12)
+    # The baseline is the model's training mean when it has one
+    assert explainer.baseline_prediction == pytest.approx(MODEL.predict(MODEL.feature_means)[0])
+
+    single = explainer.explain(ROW)
+    assert list(single["contributions"]) == FEATURE_NAMES
+    assert sum(single["contributions"].values()) == pytest.approx(
+        MODEL.predict(ROW)[0] * 100000 - single["baseline_price"], abs=0.01 * len(FEATURE_NAMES))
+
+    batch = explainer.explain_batch(X)
+    for explanation, price in zip(batch, MODEL.predict_batch(X) * 100000):
+        assert sum(explanation["contributions"].values()) == pytest.approx(
+            price - explanation["baseline_price"], abs=0.01 * len(FEATURE_NAMES))
+
+
+def test_explainer_is_cached_per_model_and_absent_for_non_linear_models():
+    assert explainer_for(MODEL) is explainer_for(MODEL)
+    assert explainer_for(LinearModel(MODEL.coefficients, 0.0)) is not explainer_for(MODEL)
+    assert FeatureExplainer.from_model(object()) is None
+
+
+@pytest.fixture(scope="module")
+def client(unthrottled):
+    from app_factory import create_app
+    return TestClient(create_app("minimal"))
+
+
+def test_endpoints_explain_the_price_they_return(client, monkeypatch):
+    from routers import state
+    monkeypatch.setattr(state, "model", MODEL)
+    monkeypatch.setattr(state, "prediction_intervals", None)
+
+    single = client.post("/predict?explain=true", json={"data": ROW}).json()
+    price = float(single["prediction_formatted"].lstrip("$").replace(",", ""))
+    explanation = single["explanation"]
+    assert sum(explanation["contributions"].values()) == pytest.approx(
+        price - explanation["baseline_price"], abs=0.01 * (len(FEATURE_NAMES) + 1))
+
+    X = rows(20, seed=1)
+    batch = client.post("/predict/batch?explain=true", json={"data": X.tolist()}).json()
+    for explanation, price in zip(batch["explanations"], batch["prices"]):
+        assert sum(explanation["contributions"].values()) == pytest.approx(
+            price - explanation["baseline_price"], abs=0.01 * (len(FEATURE_NAMES) + 1))
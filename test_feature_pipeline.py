@@ -0,0 +1,101 @@
+# Feature pipeline: raster interpolation error, edge inputs and the saved-model round trip
+import numpy as np
+import pytest
+
+from conftest import ROW
+from feature_pipeline import (COASTLINE, DEFAULT_STEPS, MAJOR_METROS, DistanceRaster, FeaturePipeline,
+                              PipelineLinearModel, min_distance_km)
+from housing_data import CALIFORNIA_BOUNDS, FEATURE_NAMES
+from model_utils import load_model
+
+
+def california_points(n, seed=0):
+    rng = np.random.default_rng(seed)
+    lat = rng.uniform(CALIFORNIA_BOUNDS["lat_min"], CALIFORNIA_BOUNDS["lat_max"], n)
+    lng = rng.uniform(CALIFORNIA_BOUNDS["lng_min"], CALIFORNIA_BOUNDS["lng_max"], n)
+    return lat, lng
+
+
+def housing_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    lat, lng = california_points(n, seed)
+    X = np.abs(np.tile(ROW, (n, 1)) * rng.uniform(0.5, 1.5, size=(n, 8)))
+    X[:, 6], X[:, 7] = lat, lng
+    return X
+
+
+def haversine_km(lat, lng, point_lat, point_lng):
+    lat, lng, point_lat, point_lng = map(np.radians, (lat, lng, point_lat, point_lng))
+    a = np.sin((lat - point_lat) / 2) ** 2 + np.cos(lat) * np.cos(point_lat) * np.sin((lng - point_lng) / 2) ** 2
+    return 2 * 6371.0 * np.arcsin(np.sqrt(a))
+
+
+def test_raster_interpolation_error_is_about_a_kilometre():
+    raster = DistanceRaster.for_points([COASTLINE, MAJOR_METROS])
+    lat, lng = california_points(200000)
+    error = np.abs(raster.lookup(lat, lng) - np.stack([min_distance_km(lat, lng, COASTLINE),
+                                                      min_distance_km(lat, lng, MAJOR_METROS)]))
+    # Worst along the lines where the nearest reference point changes; far smaller elsewhere
+    assert error.max() < 1.2
+    assert error.mean(axis=1).max() < 0.02
+    assert np.percentile(error, 99) < 0.2
+
+
+def test_raster_is_exact_at_grid_nodes_and_clamps_outside_california():
+    raster = DistanceRaster.for_points([COASTLINE])
+    lat = CALIFORNIA_BOUNDS["lat_min"] + raster.step * np.array([0, 10, 250, raster.rows - 1])
+    lng = CALIFORNIA_BOUNDS["lng_min"] + raster.step * np.array([0, 40, 300, raster.cols - 1])
+    np.testing.assert_allclose(raster.lookup(lat, lng)[0], min_distance_km(lat, lng, COASTLINE), atol=1e-6)
+
+    inside = raster.lookup(np.array([CALIFORNIA_BOUNDS["lat_max"]]), np.array([CALIFORNIA_BOUNDS["lng_min"]]))
+    outside = raster.lookup(np.array([CALIFORNIA_BOUNDS["lat_max"] + 3.0]), np.array([CALIFORNIA_BOUNDS["lng_min"] - 3.0]))
+    np.testing.assert_allclose(outside, inside, atol=1e-4)
+
+
+def test_min_distance_is_close_to_haversine():
+    lat, lng = california_points(20000, seed=1)
+    nearest = np.min([haversine_km(lat, lng, *point) for point in MAJOR_METROS], axis=0)
+    far = nearest > 20
+    assert np.abs(min_distance_km(lat, lng, MAJOR_METROS)[far] / nearest[far] - 1).max() < 0.02
+
+
+def test_zero_denominators_and_negative_log_inputs():
+    pipeline = FeaturePipeline()
+    row = list(ROW)
+    row[2], row[5], row[4] = 0.0, 0.0, -50.0  # AveRooms, AveOccup, Population
+    derived = dict(zip(pipeline.output_names, pipeline.transform(row)[0]))
+    assert derived["rooms_per_occupant"] == 0.0
+    assert derived["bedroom_ratio"] == 0.0
+    assert derived["log_population"] == 0.0
+    assert np.isfinite(list(derived.values())).all()
+
+
+@pytest.mark.parametrize("step, message", [
+    ({"name": "bad", "op": "sqrt", "inputs": ["MedInc"]}, "Unknown op 'sqrt'"),
+    ({"name": "bad", "op": "log1p", "inputs": ["Income"]}, "unknown features"),
+])
+def test_invalid_steps_are_rejected(step, message):
+    with pytest.raises(ValueError, match=message):
+        FeaturePipeline(DEFAULT_STEPS + [step])
+
+
+def test_transform_is_standardized_after_fit():
+    X = housing_rows(2000)
+    Z = FeaturePipeline().fit(X).transform(X)
+    assert Z.shape == (2000, len(FEATURE_NAMES) + len(DEFAULT_STEPS))
+    np.testing.assert_allclose(Z.mean(axis=0), 0, atol=1e-9)
+    np.testing.assert_allclose(Z.std(axis=0), 1, rtol=1e-9)
+
+
+def test_saved_model_round_trips(tmp_path):
+    X = housing_rows(1000)
+    y = 0.4 * X[:, 0] - 0.01 * X[:, 6] + np.random.default_rng(2).normal(size=len(X)) * 0.1
+    model = PipelineLinearModel().fit(X, y)
+    path = str(tmp_path / "pipeline_model.json")
+    model.save(path)
+
+    loaded = load_model(path)
+    assert isinstance(loaded, PipelineLinearModel)
+    assert repr(loaded.pipeline) == repr(model.pipeline)
+    np.testing.assert_array_equal(loaded.predict_batch(X), model.predict_batch(X))
+    assert loaded.predict(ROW) == [pytest.approx(float(model.predict_batch([ROW])[0]), rel=1e-12)]
@@ -0,0 +1,83 @@
+# Price heatmap: quantized raster against direct per-cell predictions, downsampling and PNG encoding
+import json
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from conftest import StubLinearModel
+from heatmap import PriceHeatmap, encode_png
+from housing_data import FEATURE_MEANS
+
+
+MODEL = StubLinearModel(np.array([0.44, 0.01, -0.11, 0.65, -0.000001, -0.04, -0.42, -0.43]), 1.89)
+
+
+@pytest.fixture(scope="module")
+def heatmap():
+    heatmap = PriceHeatmap(resolution=0.25)
+    heatmap.build(MODEL)
+    return heatmap
+
+
+def test_raster_matches_per_cell_predictions(heatmap):
+    expected = np.empty((len(heatmap.lats), len(heatmap.lngs)))
+    for i, lat in enumerate(heatmap.lats):
+        for j, lng in enumerate(heatmap.lngs):
+            features = FEATURE_MEANS.copy()
+            features[6], features[7] = lat, lng
+            expected[i, j] = MODEL.predict(features)[0] * 100000
+    # uint16 quantization: within half a step of the exact price
+    assert np.abs(heatmap.prices() - expected).max() <= heatmap.price_step / 2 + 1e-6
+    assert heatmap.lats[0] == heatmap.bounds["lat_max"] and heatmap.lngs[0] == heatmap.bounds["lng_min"]
+
+
+def test_downsampling_averages_blocks(heatmap):
+    full = heatmap.prices()
+    coarse = heatmap.prices(step=3)
+    rows, cols = coarse.shape
+    assert (rows, cols) == (full.shape[0] // 3, full.shape[1] // 3)
+    np.testing.assert_allclose(coarse[1, 2], full[3:6, 6:9].mean())
+
+
+def test_json_render_is_cached_per_model_version(heatmap):
+    body, etag = heatmap.render(MODEL, "json", 2)
+    assert heatmap.render(MODEL, "json", 2) == (body, etag)
+    payload = json.loads(body)
+    assert payload["shape"] == list(heatmap.prices(2).shape)
+    assert payload["model_version"] == heatmap.version
+
+    other = StubLinearModel(MODEL.coefficients * 1.1, MODEL.intercept)
+    other_body, other_etag = PriceHeatmap(resolution=0.25).render(other, "json", 2)
+    assert other_etag != etag and json.loads(other_body)["model_version"] != heatmap.version
+
+
+def test_rebuilds_when_the_model_changes():
+    heatmap = PriceHeatmap(resolution=0.5)
+    heatmap.ensure_current(MODEL)
+    raster = heatmap.raster
+    heatmap.ensure_current(MODEL)
+    assert heatmap.raster is raster
+    heatmap.ensure_current(StubLinearModel(MODEL.coefficients, 2.5))
+    assert heatmap.raster is not raster
+
+
+def test_png_encoding_round_trips_pixels():
+    rgb = np.random.default_rng(0).integers(0, 256, size=(5, 7, 3), dtype=np.uint8)
+    png = encode_png(rgb)
+    assert png[:8] == b"\x89PNG\r\n\x1a\n"
+
+    chunks, offset = {}, 8
+    while offset < len(png):
+        (length,) = struct.unpack_from(">I", png, offset)
+        kind, data = png[offset + 4:offset + 8], png[offset + 8:offset + 8 + length]
+        (crc,) = struct.unpack_from(">I", png, offset + 8 + length)
+        assert crc == zlib.crc32(kind + data)
+        chunks[kind] = data
+        offset += 12 + length
+
+    assert struct.unpack(">II", chunks[b"IHDR"][:8]) == (7, 5)
+    scanlines = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8).reshape(5, 1 + 7 * 3)
+    assert not scanlines[:, 0].any()
+    np.testing.assert_array_equal(scanlines[:, 1:].reshape(5, 7, 3), rgb)
@@ -0,0 +1,159 @@
+# Dataset cache: chunked build, rebuild on change, touch without rebuild, verification and concurrent edits
+import json
+import os
+
+import numpy as np
+import pytest
+
+import housing_data
+from housing_data import FEATURE_NAMES, TARGET_NAME, build_dataset_cache, load_dataset, read_manifest
+
+
+def write_csv(path, rows):
+    with open(path, "w") as f:
+        f.write(",".join(FEATURE_NAMES + [TARGET_NAME]) + "\n")
+        for row in rows:
+            f.write(",".join(f"{value:.6f}" for value in row) + "\n")
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    table = np.random.default_rng(0).uniform(1, 9, size=(50, 9))
+    path = str(tmp_path / "housing.csv")
+    write_csv(path, table)
+    return path, np.round(table, 6)
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """Counts cache builds while still running them"""
+    calls = []
+    build = housing_data.build_dataset_cache
+
+    def counting_build(path, cache_dir, chunk_rows=housing_data.CSV_CHUNK_ROWS):
+        calls.append(path)
+        return build(path, cache_dir, chunk_rows)
+    monkeypatch.setattr(housing_data, "build_dataset_cache", counting_build)
+    return calls
+
+
+def test_first_load_builds_the_cache_and_later_loads_reuse_it(dataset, builds):
+    path, table = dataset
+    X, y = load_dataset(path)
+    np.testing.assert_array_equal(X, table[:, :8])
+    np.testing.assert_array_equal(y, table[:, 8])
+    # Each feature is contiguous in the column-major cache
+    assert X.flags.f_contiguous and X[:, 0].flags.c_contiguous
+    manifest = read_manifest(f"{path}.cache")
+    assert manifest["rows"] == 50 and manifest["source_size"] == os.path.getsize(path)
+
+    load_dataset(path)
+    assert len(builds) == 1
+
+
+def test_build_in_chunks_matches_a_single_pass(dataset, tmp_path):
+    path, table = dataset
+    manifest = build_dataset_cache(path, str(tmp_path / "chunked"), chunk_rows=7)
+    columns = np.load(tmp_path / "chunked" / "columns.npy")
+    np.testing.assert_array_equal(columns, table.T)
+    assert manifest["rows"] == 50
+
+
+def test_touch_rewrites_the_manifest_without_rebuilding(dataset, builds):
+    path, _ = dataset
+    load_dataset(path)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+    load_dataset(path)
+    assert len(builds) == 1
+    assert read_manifest(f"{path}.cache")["source_mtime_ns"] == os.stat(path).st_mtime_ns
+
+
+@pytest.mark.parametrize("edit", ["same_size", "appended_row"])
+def test_changed_content_rebuilds(dataset, builds, edit):
+    path, table = dataset
+    load_dataset(path)
+    changed = table.copy()
+    if edit == "same_size":
+        # Same byte count, so only the checksum can tell
+        changed[3, 8] = 8.5 if changed[3, 8] != 8.5 else 7.5
+    else:
+        changed = np.vstack([changed, changed[:1]])
+    size = os.path.getsize(path)
+    write_csv(path, changed)
+    assert (os.path.getsize(path) == size) == (edit == "same_size")
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 5_000_000_000))
+
+    _, y = load_dataset(path)
+    assert len(builds) == 2
+    np.testing.assert_array_equal(y, changed[:, 8])
+    assert read_manifest(f"{path}.cache")["source_sha256"] == housing_data.file_checksum(path)
+
+
+def test_verify_rebuilds_a_corrupted_cache(dataset, builds):
+    path, table = dataset
+    load_dataset(path)
+    data_path = f"{path}.cache/columns.npy"
+    with open(data_path, "r+b") as f:
+        f.seek(-8, os.SEEK_END)
+        f.write(np.float64(-1.0).tobytes())
+    # The source is unchanged, so only verify=True looks at the data
+    assert load_dataset(path)[1][-1] == -1.0
+    assert len(builds) == 1
+
+    _, y = load_dataset(path, verify=True)
+    assert len(builds) == 2
+    np.testing.assert_array_equal(y, table[:, 8])
+
+
+def test_verify_without_the_source_raises(dataset):
+    path, _ = dataset
+    load_dataset(path)
+    with open(f"{path}.cache/columns.npy", "r+b") as f:
+        f.seek(-8, os.SEEK_END)
+        f.write(np.float64(-1.0).tobytes())
+    os.unlink(path)
+    # A shipped cache without its CSV is trusted, unless it fails verification
+    assert load_dataset(path)[1][-1] == -1.0
+    with pytest.raises(ValueError, match="does not match its manifest checksum"):
+        load_dataset(path, verify=True)
+
+
+@pytest.mark.parametrize("drift", [-1, 1])
+def test_rows_changing_while_caching_raise(dataset, tmp_path, monkeypatch, drift):
+    path, _ = dataset
+    count_rows = housing_data.count_rows
+    # The first pass sees a different row count than the parse finds
+    monkeypatch.setattr(housing_data, "count_rows", lambda p: count_rows(p) + drift)
+    cache_dir = tmp_path / "cache"
+    with pytest.raises(ValueError, match="changed while it was being cached"):
+        build_dataset_cache(path, str(cache_dir), chunk_rows=7)
+    assert os.listdir(cache_dir) == []
+
+
+def test_cache_dir_from_the_environment(dataset, tmp_path, monkeypatch):
+    path, table = dataset
+    monkeypatch.setenv("DATASET_CACHE_DIR", str(tmp_path / "shared"))
+    np.testing.assert_array_equal(load_dataset(path)[0], table[:, :8])
+    assert os.path.exists(tmp_path / "shared" / "manifest.json")
+    assert not os.path.exists(f"{path}.cache")
+
+
+def test_stale_manifest_version_rebuilds(dataset, builds):
+    path, _ = dataset
+    load_dataset(path)
+    manifest_path = f"{path}.cache/manifest.json"
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    manifest["version"] = housing_data.DATASET_CACHE_VERSION - 1
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f)
+    load_dataset(path)
+    assert len(builds) == 2
+
+
+def test_missing_columns_are_reported(tmp_path):
+    path = tmp_path / "bad.csv"
+    path.write_text("MedInc,HouseAge\n1,2\n")
+    with pytest.raises(ValueError, match="missing columns: AveRooms"):
+        load_dataset(str(path))
@@ -0,0 +1,195 @@
+# Online updates: RLS against a closed-form solve, updater robustness and /feedback validation
+import os
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from conftest import ROW, StubLinearModel
+from online_learning import FEATURE_SCALES, OnlineModelUpdater, RecursiveLeastSquares, spool_path, worker_role
+
+
+def samples(n, seed=0):
+    rng = np.random.default_rng(seed)
+    X = ROW + rng.normal(size=(n, 8)) * FEATURE_SCALES[:-1]
+    y = X @ np.linspace(-0.5, 0.5, 8) + 2.0 + rng.normal(size=n) * 0.1
+    return X, y
+
+
+@pytest.mark.parametrize("forgetting", [1.0, 0.99])
+def test_rls_matches_weighted_least_squares(forgetting):
+    X, y = samples(200)
+    theta0 = np.append(np.full(8, 0.1), 1.5)
+    rls = RecursiveLeastSquares(theta0[:-1], theta0[-1], forgetting=forgetting)
+    prior_information = np.linalg.inv(rls.P)
+    for features, target in zip(X, y):
+        rls.update(features, target)
+
+    # Exponentially weighted ridge around the prior coefficients
+    Z = np.hstack([X, np.ones((len(X), 1))])
+    weights = forgetting ** np.arange(len(X) - 1, -1, -1)
+    prior_weight = forgetting ** len(X)
+    information = prior_weight * prior_information + Z.T @ (weights[:, None] * Z)
+    expected = np.linalg.solve(information, prior_weight * prior_information @ theta0 + Z.T @ (weights * y))
+
+    np.testing.assert_allclose(rls.theta, expected, rtol=1e-6, atol=1e-9)
+    np.testing.assert_allclose(np.linalg.inv(rls.P), information, rtol=1e-6)
+    assert rls.samples_seen == len(X)
+
+
+def test_bad_batch_is_rolled_back():
+    published = []
+    updater = OnlineModelUpdater(StubLinearModel([0.1] * 8, 1.5), published.append, checkpoint_path=None)
+    theta, P = updater.estimator.theta.copy(), updater.estimator.P.copy()
+
+    updater._apply([(ROW, 4.5), (["x"] * 8, 4.5)])
+    updater._apply([(ROW, float("inf"))])
+
+    assert updater.failed_batches == 2 and updater.batches_applied == 0 and not updater._dirty
+    np.testing.assert_array_equal(updater.estimator.theta, theta)
+    np.testing.assert_array_equal(updater.estimator.P, P)
+
+    updater._apply([(ROW, 4.5)])
+    assert updater.batches_applied == 1 and updater._dirty
+
+
+def test_models_are_published_at_checkpoints_only(tmp_path):
+    published = []
+    updater = OnlineModelUpdater(StubLinearModel([0.1] * 8, 1.5), published.append,
+                                 checkpoint_path=str(tmp_path / "checkpoint.json"))
+    X, y = samples(10)
+    for features, target in zip(X, y):
+        updater._apply([(features, target)])
+    assert not published
+
+    updater._checkpoint()
+    assert len(published) == 1 and not updater._dirty
+    assert published[0].intercept == updater.estimator.intercept
+    assert isinstance(published[0].coefficients, list)
+    assert os.path.exists(tmp_path / "checkpoint.json")
+
+
+def test_checkpoint_round_trip(tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    updater = OnlineModelUpdater(StubLinearModel([0.1] * 8, 1.5), lambda model: None, checkpoint_path=path)
+    X, y = samples(20)
+    updater._apply(list(zip(X, y)))
+    updater.save_checkpoint()
+    assert os.listdir(tmp_path) == ["checkpoint.json"]
+
+    published = []
+    restored = OnlineModelUpdater(StubLinearModel([0.1] * 8, 1.5), published.append, checkpoint_path=path)
+    assert restored.load_checkpoint()
+    np.testing.assert_array_equal(restored.estimator.theta, updater.estimator.theta)
+    np.testing.assert_array_equal(restored.estimator.P, updater.estimator.P)
+    assert restored.estimator.samples_seen == 20
+    assert published[0].intercept == updater.estimator.intercept
+
+
+def test_checkpoint_failure_keeps_state_dirty(tmp_path):
+    published = []
+    updater = OnlineModelUpdater(StubLinearModel([0.1] * 8, 1.5), published.append,
+                                 checkpoint_path=str(tmp_path / "missing" / "checkpoint.json"))
+    updater._apply([(ROW, 4.5)])
+    updater._checkpoint()
+    assert updater._dirty and updater.last_checkpoint is None and not published
+
+
+def test_worker_roles(monkeypatch, tmp_path):
+    monkeypatch.delenv("WORKER_SLOT", raising=False)
+    assert worker_role() == "writer"
+    monkeypatch.setenv("WORKER_SLOT", "0")
+    assert worker_role() == "writer"
+    monkeypatch.setenv("WORKER_SLOT", "3")
+    assert worker_role() == "follower"
+    assert spool_path("state/model_checkpoint.json", 3) == "state/model_checkpoint.feedback.worker3.jsonl"
+
+    updater = OnlineModelUpdater(StubLinearModel([0.1] * 8, 1.5), lambda model: None, checkpoint_path=None)
+    updater._resolve_role()
+    # Without a checkpoint there is nothing to follow, so the process trains on its own
+    assert updater.role == "writer" and updater.spool is None
+
+
+def test_followers_feed_the_writer_and_serve_its_checkpoint(monkeypatch, tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    writer_published, follower_published = [], []
+    monkeypatch.setenv("WORKER_SLOT", "0")
+    writer = OnlineModelUpdater(StubLinearModel([0.1] * 8, 1.5), writer_published.append, checkpoint_path=path)
+    writer._resolve_role()
+    monkeypatch.setenv("WORKER_SLOT", "2")
+    follower = OnlineModelUpdater(StubLinearModel([0.1] * 8, 1.5), follower_published.append, checkpoint_path=path)
+    follower._resolve_role()
+    assert (writer.role, follower.role) == ("writer", "follower")
+
+    X, y = samples(100)
+    follower.submit(zip(X[:70], y[:70] * 100000))
+    writer.submit(zip(X[70:], y[70:] * 100000))
+    while not follower.pending.empty():
+        follower._spool(follower._drain())
+    assert follower.spooled == 70 and follower.estimator.samples_seen == 0
+
+    writer._apply(writer._drain())
+    writer._apply_spooled()
+    assert writer.estimator.samples_seen == 100
+    assert os.path.getsize(follower.spool) == 0 and writer._collect_spooled() == []
+
+    # Every sample reached the one estimator, in batch order
+    expected = RecursiveLeastSquares(np.full(8, 0.1), 1.5)
+    for features, target in list(zip(X[70:], y[70:])) + list(zip(X[:70], y[:70])):
+        expected.update(features, target)
+    np.testing.assert_allclose(writer.estimator.theta, expected.theta, rtol=1e-9)
+
+    follower._follow()
+    assert not follower_published
+    writer._checkpoint()
+    follower._follow()
+    assert len(follower_published) == 1
+    np.testing.assert_array_equal(follower_published[0].coefficients, writer_published[0].coefficients)
+    assert follower.stats()["samples_seen"] == 100
+
+    # Unchanged checkpoint: nothing is republished
+    follower._follow()
+    assert len(follower_published) == 1
+
+
+@pytest.fixture(scope="module")
+def client():
+    from app_factory import create_app
+    from routers import state
+    if state.model_updater is None:
+        pytest.skip("active model does not support online updates")
+    # Not entered as a context manager, so the updater thread never starts
+    return TestClient(create_app("minimal"))
+
+
+@pytest.mark.parametrize("body", [
+    {"data": ["a"] * 8, "price": 400000},
+    {"data": ROW[:7], "price": 400000},
+    {"data": ROW + [1.0], "price": 400000},
+    {"data": ROW, "price": -5},
+    {"data": ROW, "price": True},
+    {"data": ROW, "price": "400000"},
+    {"samples": "not a list"},
+    {"samples": [ROW]},
+])
+def test_feedback_rejects_malformed_samples(client, body):
+    from routers import state
+    pending = state.model_updater.pending.qsize()
+    response = client.post("/feedback", json=body)
+    assert response.status_code == 400
+    assert state.model_updater.pending.qsize() == pending
+
+
+@pytest.mark.parametrize("body", [
+    '{"data": [8.3, 41, 6.9, 1.0, 322, 2.5, 37.8, NaN], "price": 400000}',
+    '{"data": [8.3, 41, 6.9, 1.0, 322, 2.5, 37.8, -122.2], "price": Infinity}',
+])
+def test_feedback_rejects_non_finite_values(client, body):
+    response = client.post("/feedback", content=body, headers={"content-type": "application/json"})
+    assert response.status_code == 400
+
+
+def test_feedback_accepts_valid_samples(client):
+    response = client.post("/feedback", json={"samples": [{"data": ROW, "price": 452600}]})
+    assert response.status_code == 200
+    assert response.json()["accepted"] == 1
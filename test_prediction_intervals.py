@@ -0,0 +1,148 @@
+# Prediction intervals: t quantiles against tables, interval widths against a direct
+# computation, and fingerprint matching of saved statistics
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from conftest import ROW, StubLinearModel
+from housing_data import FEATURE_NAMES, TARGET_NAME
+from prediction_intervals import PredictionIntervals, linear_fingerprint, t_quantile
+
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Serves the exported model in a fresh interpreter, as the app would start
+SERVE = """
+import json, sys
+from fastapi.testclient import TestClient
+from app_factory import create_app
+from routers import state
+response = TestClient(create_app("minimal")).post("/predict", json={"data": json.loads(sys.argv[1])})
+print(json.dumps({"model": type(state.model).__name__, "status": response.status_code, **response.json()}))
+"""
+
+
+# Student-t quantiles from standard tables
+@pytest.mark.parametrize("p, dof, expected", [
+    (0.95, 10, 1.812461), (0.975, 20, 2.085963), (0.95, 30, 1.697261), (0.95, 1000, 1.646379),
+])
+def test_t_quantile_matches_tables(p, dof, expected):
+    assert t_quantile(p, dof) == pytest.approx(expected, abs=1e-4)
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 8)) * np.arange(1, 9)
+    y = X @ np.linspace(-1, 1, 8) + 0.5 + rng.normal(size=300) * 0.3
+    Z = np.hstack([X, np.ones((300, 1))])
+    theta = np.linalg.lstsq(Z, y, rcond=None)[0]
+    model = StubLinearModel(theta[:-1], float(theta[-1]))
+    model.interval_stats = PredictionIntervals.from_training_data(X, y, Z @ theta).to_dict()
+    return X, y, Z, theta, model
+
+
+def test_half_width_matches_direct_formula(fitted):
+    X, y, Z, theta, model = fitted
+    intervals = PredictionIntervals.from_model(model)
+    residuals = y - Z @ theta
+    s2 = residuals @ residuals / (len(y) - Z.shape[1])
+    xtx_inv = np.linalg.inv(Z.T @ Z)
+    t = t_quantile(0.95, len(y) - Z.shape[1])
+
+    queries = np.random.default_rng(1).normal(size=(50, 8)) * 3
+    expected = [t * np.sqrt(s2 * (1 + z @ xtx_inv @ z)) for z in np.hstack([queries, np.ones((50, 1))])]
+    np.testing.assert_allclose(intervals.half_width(queries), expected, rtol=1e-8)
+
+    lower, upper = intervals.bounds(queries, np.zeros(50))
+    np.testing.assert_allclose(upper, expected, rtol=1e-8)
+    np.testing.assert_allclose(lower, -np.asarray(expected), rtol=1e-8)
+
+
+def test_single_interval_in_dollars(fitted):
+    X, y, Z, theta, model = fitted
+    intervals = PredictionIntervals.from_model(model)
+    width = intervals.half_width(X[0])[0]
+    interval = intervals.interval(list(X[0]), 2.0)
+    assert interval["lower"] == round((2.0 - width) * 100000, 2)
+    assert interval["upper"] == round((2.0 + width) * 100000, 2)
+    assert interval["level"] == 0.90
+
+
+def test_saved_statistics_only_load_for_the_same_model(fitted, tmp_path):
+    X, y, Z, theta, model = fitted
+    path = str(tmp_path / "model_stats.json")
+    PredictionIntervals.from_model(model).save(path)
+
+    loaded = PredictionIntervals.load(path, StubLinearModel(list(theta[:-1]), float(theta[-1])))
+    assert loaded is not None and loaded.fingerprint == linear_fingerprint(model)
+    np.testing.assert_allclose(loaded.half_width(X[:5]), PredictionIntervals.from_model(model).half_width(X[:5]))
+
+    assert PredictionIntervals.load(path, StubLinearModel(theta[:-1] + 1e-9, float(theta[-1]))) is None
+    assert PredictionIntervals.load(path, object()) is None
+    assert PredictionIntervals.load(str(tmp_path / "missing.json"), model) is None
+
+
+def test_statistics_without_fingerprint_are_not_used(fitted, tmp_path):
+    X, y, Z, theta, model = fitted
+    path = str(tmp_path / "model_stats.json")
+    stats = PredictionIntervals.from_model(model)
+    stats.fingerprint = None
+    stats.save(path)
+    assert PredictionIntervals.load(path, model) is None
+
+
+def test_online_update_drops_intervals(fitted, monkeypatch):
+    from routers import state
+    X, y, Z, theta, model = fitted
+    # Restored after the test: publish_model rebinds both globals
+    monkeypatch.setattr(state, "model", model)
+    monkeypatch.setattr(state, "prediction_intervals", PredictionIntervals.from_model(model))
+
+    state.publish_model(model)
+    assert state.prediction_intervals is not None
+    state.publish_model(StubLinearModel(theta[:-1] * 1.01, float(theta[-1])))
+    assert state.prediction_intervals is None
+
+
+@pytest.fixture(scope="module")
+def fitted_dir(tmp_path_factory):
+    """Directory where create_model.py has fitted a synthetic CSV"""
+    directory = tmp_path_factory.mktemp("fitted")
+    rng = np.random.default_rng(2)
+    X = ROW + rng.normal(size=(500, 8)) * [1.9, 12.6, 2.5, 0.5, 1100.0, 1.0, 2.1, 2.0]
+    y = X @ [0.44, 0.01, -0.11, 0.65, 0.0, -0.04, -0.42, -0.43] - 36.9 + rng.normal(size=500) * 0.5
+    np.savetxt(directory / "housing.csv", np.column_stack([X, y]), delimiter=",",
+               header=",".join(FEATURE_NAMES + [TARGET_NAME]), comments="")
+    fit = subprocess.run([sys.executable, os.path.join(ROOT, "create_model.py"), "housing.csv"],
+                         cwd=directory, capture_output=True, text=True, timeout=120)
+    assert fit.returncode == 0, fit.stderr
+    return directory
+
+
+def serve_prediction(cwd, **env):
+    base = {name: value for name, value in os.environ.items() if name not in ("MODEL_PATH", "MODEL_STATS_PATH")}
+    served = subprocess.run(
+        [sys.executable, "-c", SERVE, json.dumps(ROW)], cwd=cwd, capture_output=True, text=True, timeout=120,
+        env={**base, "PYTHONPATH": ROOT, "MODEL_CHECKPOINT_PATH": os.devnull, **env}
+    )
+    assert served.returncode == 0, served.stderr
+    result = json.loads(served.stdout.strip().splitlines()[-1])
+    assert result["model"] == "LinearModel" and result["status"] == 200
+    price = float(result["prediction_formatted"].lstrip("$").replace(",", ""))
+    interval = result["prediction_interval"]
+    assert interval is not None and interval["lower"] < price < interval["upper"]
+
+
+def test_fitted_model_serves_intervals_from_model_path(fitted_dir):
+    serve_prediction(ROOT, MODEL_PATH=str(fitted_dir / "linear_model.json"),
+                     MODEL_STATS_PATH=str(fitted_dir / "model_stats.json"))
+
+
+def test_fitted_model_is_served_by_default(fitted_dir):
+    # create_model.py's output in the working directory, with no paths configured
+    serve_prediction(fitted_dir)
@@ -0,0 +1,83 @@
+# Rate limiting: token-bucket arithmetic, client keys that can't be spoofed, and 429/503 responses
+import asyncio
+
+import pytest
+
+from rate_limit import RateLimiter, RateLimitMiddleware
+
+
+def scope(headers=(), client=("10.0.0.1", 5000), path="/predict"):
+    return {"type": "http", "path": path, "headers": list(headers), "client": client}
+
+
+def test_bucket_refills_at_the_configured_rate():
+    limiter = RateLimiter(rate=2.0, burst=3)
+    assert [limiter.take("a", now=0.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.take("a", now=0.0) == pytest.approx(0.5)
+    assert limiter.take("a", now=0.25) == pytest.approx(0.25)
+    assert limiter.take("a", now=0.5) == 0.0
+    # Refill is capped at the burst size
+    assert [limiter.take("a", now=100.0) for _ in range(4)][-1] > 0
+    assert limiter.take("b", now=0.0) == 0.0
+
+
+def test_least_recently_used_clients_are_evicted():
+    limiter = RateLimiter(max_clients=2)
+    for client in ("a", "b", "a", "c"):
+        limiter.take(client, now=0.0)
+    assert list(limiter.buckets) == ["a", "c"]
+    assert limiter.counters["evicted"] == 1
+
+
+def test_forwarded_for_is_ignored():
+    middleware = RateLimitMiddleware(None, RateLimiter())
+    spoofed = scope([(b"x-forwarded-for", b"1.2.3.4")])
+    assert middleware.client_key(spoofed) == "ip:10.0.0.1"
+    assert middleware.client_key(scope(client=None)) == "ip:unknown"
+
+
+def test_only_configured_api_keys_get_their_own_bucket():
+    middleware = RateLimitMiddleware(None, RateLimiter(api_keys=["partner-key"]))
+    assert middleware.client_key(scope([(b"x-api-key", b"partner-key")])) == "key:partner-key"
+    assert middleware.client_key(scope([(b"x-api-key", b"made-up")])) == "ip:10.0.0.1"
+    unconfigured = RateLimitMiddleware(None, RateLimiter())
+    assert unconfigured.client_key(scope([(b"x-api-key", b"partner-key")])) == "ip:10.0.0.1"
+
+
+async def ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def call(middleware, request_scope):
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    async def run():
+        await middleware(request_scope, None, send)
+
+    asyncio.run(run())
+    return messages[0]["status"], dict(messages[0]["headers"])
+
+
+def test_rotating_headers_do_not_escape_the_limit():
+    middleware = RateLimitMiddleware(ok_app, RateLimiter(rate=1.0, burst=2))
+    statuses = [call(middleware, scope([(b"x-api-key", f"key-{i}".encode()), (b"x-forwarded-for", f"1.1.1.{i}".encode())]))[0]
+                for i in range(4)]
+    assert statuses == [200, 200, 429, 429]
+
+
+def test_rejections_carry_retry_after_and_exempt_paths_pass():
+    limiter = RateLimiter(rate=0.5, burst=1)
+    middleware = RateLimitMiddleware(ok_app, limiter)
+    assert call(middleware, scope())[0] == 200
+    status, headers = call(middleware, scope())
+    assert status == 429 and headers[b"retry-after"] == b"2"
+    assert call(middleware, scope(path="/health"))[0] == 200
+
+    limiter.in_flight = limiter.max_in_flight
+    status, headers = call(middleware, scope(client=("10.0.0.2", 1)))
+    assert status == 503 and headers[b"retry-after"] == b"1"
+    assert limiter.counters["shed_in_flight"] == 1 and limiter.counters["rate_limited"] == 1
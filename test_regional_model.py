@@ -0,0 +1,89 @@
+# Regional model: grouped batch scoring against per-row dispatch, region codes and per-region fits
+import numpy as np
+import pytest
+
+from housing_data import REGIONS, region_code, region_codes
+from model_utils import load_model
+from regional_model import RegionalLinearModel
+
+
+def rows(n, seed=0, lat=(32.0, 42.0), lng=(-125.0, -114.0)):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 8)) + [3.9, 28.6, 5.4, 1.1, 1425.0, 3.1, 0.0, 0.0]
+    X[:, 6] = rng.uniform(*lat, n)
+    X[:, 7] = rng.uniform(*lng, n)
+    return X
+
+
+@pytest.fixture(scope="module")
+def model():
+    rng = np.random.default_rng(1)
+    return RegionalLinearModel(rng.normal(size=(len(REGIONS), 8)), rng.normal(size=len(REGIONS)))
+
+
+def test_region_codes_match_scalar_rules():
+    X = rows(5000)
+    # Boundary values exercise the strict inequalities
+    X[:8, 6] = [37.5, 34.0, 37.0, 32.5, 33.999, 37.501, 36.9, 34.001]
+    X[:8, 7] = [-122.5, -118.0, -121.0, -117.0, -117.0, -122.0, -121.0, -118.0]
+    expected = [region_code(lat, lng) for lat, lng in X[:, 6:8]]
+    np.testing.assert_array_equal(region_codes(X[:, 6], X[:, 7]), expected)
+
+
+def test_batch_matches_per_row_dispatch(model):
+    X = rows(2000)
+    expected = [model.predict(row)[0] for row in X]
+    np.testing.assert_allclose(model.predict_batch(X), expected, rtol=1e-12)
+    # Every region is represented, so the grouped path (not the single-region shortcut) ran
+    assert len(set(region_codes(X[:, 6], X[:, 7]).tolist())) == len(REGIONS)
+
+
+def test_scatter_back_preserves_input_order(model):
+    X = rows(300, seed=2)
+    predictions = model.predict_batch(X)
+    permutation = np.random.default_rng(3).permutation(len(X))
+    np.testing.assert_allclose(model.predict_batch(X[permutation]), predictions[permutation], rtol=1e-12)
+
+
+def test_single_region_batch(model):
+    X = rows(100, seed=4, lat=(38.0, 39.0), lng=(-123.0, -122.5))
+    codes = region_codes(X[:, 6], X[:, 7])
+    assert set(codes.tolist()) == {0}
+    np.testing.assert_allclose(model.predict_batch(X), X @ model.region_coefficients[0] + model.region_intercepts[0])
+
+
+def test_fit_matches_per_region_least_squares():
+    X = rows(4000, seed=5)
+    codes = region_codes(X[:, 6], X[:, 7])
+    truth = np.random.default_rng(6).normal(size=(len(REGIONS), 9))
+    Z = np.hstack([X, np.ones((len(X), 1))])
+    y = np.einsum("ij,ij->i", Z, truth[codes]) + np.random.default_rng(7).normal(size=len(X)) * 0.01
+
+    # Keep only a few San Diego rows so that region falls back to the global fit
+    keep = (codes != 2) | (np.cumsum(codes == 2) <= 50)
+    X, y, Z, codes = X[keep], y[keep], Z[keep], codes[keep]
+    model = RegionalLinearModel.from_global(np.zeros(8), 0.0).fit(X, y, min_rows=200)
+
+    global_theta = np.linalg.lstsq(Z, y, rcond=None)[0]
+    for code in range(len(REGIONS)):
+        mask = codes == code
+        expected = np.linalg.lstsq(Z[mask], y[mask], rcond=None)[0] if code != 2 else global_theta
+        np.testing.assert_allclose(model.region_coefficients[code], expected[:-1], rtol=1e-8, atol=1e-10)
+        assert model.region_intercepts[code] == pytest.approx(expected[-1], rel=1e-8, abs=1e-10)
+    assert model.region_rows[2] == 50
+
+
+def test_save_load_round_trip(model, tmp_path):
+    path = str(tmp_path / "regional_model.json")
+    model.save(path)
+    loaded = load_model(path)
+    assert isinstance(loaded, RegionalLinearModel)
+    X = rows(200, seed=8)
+    np.testing.assert_array_equal(loaded.predict_batch(X), model.predict_batch(X))
+
+
+def test_rejects_wrong_shapes():
+    with pytest.raises(ValueError):
+        RegionalLinearModel(np.zeros((3, 8)), np.zeros(3))
+    with pytest.raises(ValueError):
+        RegionalLinearModel.from_global(np.zeros(8), 0.0).predict([1.0] * 7)
@@ -0,0 +1,104 @@
+# Request tracing: span accounting, the per-window top-N heap and window rotation, on a fake clock
+import threading
+import types
+
+import pytest
+
+import request_tracing
+from request_tracing import RequestTracer
+
+MS = 1_000_000
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replaces the module's time functions with a clock that only moves when told to"""
+    clock = types.SimpleNamespace(ns=0)
+    clock.advance = lambda ms: setattr(clock, "ns", clock.ns + int(ms * MS))
+    monkeypatch.setattr(request_tracing, "time", types.SimpleNamespace(
+        perf_counter_ns=lambda: clock.ns, monotonic=lambda: clock.ns / 1e9, time=lambda: 1.7e9 + clock.ns / 1e9))
+    return clock
+
+
+def request(tracer, clock, spans, label=""):
+    """One traced request spending the given milliseconds in each span"""
+    tracer.begin()
+    for span, ms in spans:
+        clock.advance(ms)
+        tracer.mark(span)
+    tracer.finish(label)
+
+
+def totals(tracer):
+    return [entry["total_ms"] for entry in tracer.slowest()["slowest"]]
+
+
+def test_marks_charge_time_since_the_previous_mark(clock):
+    tracer = RequestTracer(["parse", "model", "render"])
+    tracer.begin(start_ns=clock.ns - 2 * MS)
+    clock.advance(1)
+    tracer.mark("parse")
+    clock.advance(3)
+    tracer.mark("model")
+    clock.advance(0.5)
+    tracer.mark("model")
+    tracer.finish("Bay Area")
+
+    (entry,) = tracer.slowest()["slowest"]
+    # Time before begin() (queueing ahead of the handler) counts towards parse and the total
+    assert entry["spans_ms"] == {"parse": 3.0, "model": 3.5, "render": 0.0}
+    assert entry["total_ms"] == 6.5 and entry["label"] == "Bay Area"
+
+
+def test_only_the_slowest_requests_are_kept(clock):
+    tracer = RequestTracer(["work"], keep=3)
+    for ms in [5, 1, 9, 3, 7, 2]:
+        request(tracer, clock, [("work", ms)], label=str(ms))
+    assert totals(tracer) == [9.0, 7.0, 5.0]
+    assert tracer.traced == 6 and len(tracer._current) == 3
+
+
+def test_windows_rotate_and_an_idle_window_clears_history(clock):
+    tracer = RequestTracer(["work"], keep=5, window=10.0)
+    request(tracer, clock, [("work", 4)])
+    clock.advance(10_000)
+    request(tracer, clock, [("work", 2)])
+    # The previous window is still reported alongside the current one
+    assert totals(tracer) == [4.0, 2.0]
+
+    clock.advance(10_000)
+    request(tracer, clock, [("work", 1)])
+    assert totals(tracer) == [2.0, 1.0]
+
+    # Two windows with no traffic: nothing recent enough to report
+    clock.advance(25_000)
+    assert totals(tracer) == []
+    request(tracer, clock, [("work", 3)])
+    assert totals(tracer) == [3.0]
+
+
+def test_state_is_reset_between_requests_and_kept_per_thread(clock):
+    tracer = RequestTracer(["a", "b"])
+    request(tracer, clock, [("a", 5), ("b", 5)])
+    request(tracer, clock, [("b", 1)])
+    spans = [entry["spans_ms"] for entry in tracer.slowest()["slowest"]]
+    # The reused duration array was zeroed by begin()
+    assert spans == [{"a": 5.0, "b": 5.0}, {"a": 0.0, "b": 1.0}]
+
+    # Marks and finishes outside a request are ignored
+    tracer.mark("a")
+    tracer.finish()
+    assert tracer.traced == 2
+
+    tracer.begin()
+    other = []
+    thread = threading.Thread(target=lambda: (tracer.mark("a"), tracer.finish(), other.append(tracer.traced)))
+    thread.start()
+    thread.join()
+    # Another thread has no request in progress, so this one's is untouched
+    assert other == [2]
+    clock.advance(7)
+    tracer.mark("a")
+    tracer.finish()
+    assert tracer.traced == 3
+    assert {"a": 7.0, "b": 0.0} in [entry["spans_ms"] for entry in tracer.slowest()["slowest"]]
@@ -0,0 +1,101 @@
+# Malformed feature rows are rejected with 400 (not 500) by the batch endpoints
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from comparables import ComparablesIndex
+from conftest import ROW, last_recorded
+
+MALFORMED = [
+    ROW,                      # a single row where a list of rows is expected
+    [ROW, ["a"] * 8],
+    [ROW, ROW[:7]],
+    [ROW, ROW + [1.0]],
+    [ROW, [None] * 8],
+    [ROW, [True] * 8],
+    "abc",
+    {"rows": [ROW]},
+    [],
+]
+
+
+@pytest.fixture(scope="module")
+def client(unthrottled):
+    from app_factory import create_app
+    from routers import analytics
+    X = np.tile(ROW, (50, 1)) + np.random.default_rng(0).normal(size=(50, 8))
+    index, analytics.comparables_index = analytics.comparables_index, ComparablesIndex.build(X, np.ones(50), leaf_size=8)
+    # Not entered as a context manager: startup work (heatmap, updater) isn't needed
+    yield TestClient(create_app("standard"), raise_server_exceptions=False)
+    analytics.comparables_index = index
+
+
+@pytest.mark.parametrize("data", MALFORMED)
+def test_batch_rejects_malformed_rows(client, data):
+    assert client.post("/predict/batch", json={"data": data}).status_code == 400
+
+
+@pytest.mark.parametrize("path", ["/predict/projection", "/comparables"])
+@pytest.mark.parametrize("data", [[1, 2], ["a"] * 8, ROW[:7], [ROW, "x"], [ROW, ROW[:7]], {"a": 1}, "abc", []])
+def test_single_or_batched_endpoints_reject_malformed_rows(client, path, data):
+    assert client.post(path, json={"data": data}).status_code == 400
+
+
+def test_non_finite_features_are_rejected(client):
+    body = '{"data": [[8.3, 41, 6.9, 1.0, 322, 2.5, 37.8, NaN]]}'
+    response = client.post("/predict/batch", content=body, headers={"content-type": "application/json"})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("path, data", [
+    ("/predict/batch", [ROW, ROW]),
+    ("/predict/projection", ROW),
+    ("/predict/projection", [ROW, ROW]),
+    ("/comparables", ROW),
+    ("/comparables", [ROW, ROW]),
+])
+def test_well_formed_rows_are_accepted(client, path, data):
+    assert client.post(path, json={"data": data}).status_code == 200
+
+
+@pytest.mark.parametrize("sample", [
+    {"data": ROW[:7], "price": 300000},
+    {"data": ["a"] * 8, "price": 300000},
+    {"data": 5, "price": 300000},
+    {"data": ROW, "price": "abc"},
+    {"data": ROW},
+    "not an object",
+])
+def test_evaluate_rejects_malformed_samples(client, sample):
+    assert client.post("/evaluate", json={"samples": [sample]}).status_code == 400
+    ndjson = (json.dumps({"data": ROW, "price": 300000}) + "\n" + json.dumps(sample) + "\n").encode()
+    response = client.post("/evaluate", content=ndjson, headers={"content-type": "application/x-ndjson"})
+    assert response.status_code == 400
+    assert "line 2" in response.json()["detail"]
+
+
+def test_evaluate_accepts_both_input_formats(client):
+    samples = [{"data": ROW, "price": 400000}, {"data": ROW, "price": 500000}]
+    as_json = client.post("/evaluate", json={"samples": samples})
+    as_ndjson = client.post("/evaluate", content="".join(json.dumps(s) + "\n" for s in samples).encode(),
+                            headers={"content-type": "application/x-ndjson"})
+    assert as_json.status_code == as_ndjson.status_code == 200
+    assert as_json.json()["overall"] == as_ndjson.json()["overall"]
+
+
+@pytest.mark.parametrize("body", [
+    '{"data": [8.3, 41, 6.9, 1.0, 322, 2.5, 37.8, NaN]}',
+    '{"data": [8.3, 41, 6.9, 1.0, 322, 2.5, 37.8, Infinity]}',
+    '{"data": ["a", 41, 6.9, 1.0, 322, 2.5, 37.8, -122.2]}',
+    '{"data": [8.3, 41, 6.9, 1.0, 322, 2.5, 37.8]}',
+    '{"data": [[8.3, 41, 6.9, 1.0, 322, 2.5, 37.8, -122.2]]}',
+    '{}',
+])
+def test_predict_rejects_malformed_rows_before_recording(client, body):
+    last = last_recorded()
+    response = client.post("/predict?explain=true", content=body, headers={"content-type": "application/json"})
+    assert response.status_code == 400
+    assert last_recorded() is last
+    assert client.get("/analytics").status_code == 200
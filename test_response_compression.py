@@ -0,0 +1,195 @@
+# Response compression: negotiation, passthrough rules, incremental streaming, ETags and the compressed-body cache
+import asyncio
+import gzip
+import json
+import zlib
+
+import pytest
+from fastapi.testclient import TestClient
+
+from response_compression import CompressionMiddleware, ResponseCompression, etag_matches, negotiate
+
+ALL = ["zstd", "br", "gzip"]
+BIG_JSON = json.dumps({"prices": list(range(2000))}).encode()
+
+
+@pytest.mark.parametrize("accept, available, expected", [
+    ("gzip", ALL, "gzip"),
+    ("gzip;q=0.5, br;q=0.9", ALL, "br"),
+    ("br;q=0.8, gzip;q=0.8, zstd;q=0.8", ALL, "zstd"),  # ties go to server preference
+    ("GZIP", ALL, "gzip"),
+    ("*", ALL, "zstd"),
+    ("*", ["gzip"], "gzip"),
+    ("*;q=0.1, gzip;q=0.5", ["zstd", "gzip"], "gzip"),
+    ("*, gzip;q=0", ["gzip"], None),
+    ("gzip;q=0", ALL, None),
+    ("gzip;q=abc", ALL, None),
+    ("identity", ALL, None),
+    ("br", ["gzip"], None),
+])
+def test_negotiate(accept, available, expected):
+    assert negotiate(accept, available) == expected
+
+
+def respond(status=200, headers=(), chunks=(b"",)):
+    """Raw ASGI app sending `chunks` as separate body messages"""
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(name.encode(), value.encode()) for name, value in headers]})
+        for i, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": i < len(chunks) - 1})
+    return app
+
+
+def call(app, compression, accept="gzip", method="GET"):
+    messages = []
+    scope = {"type": "http", "method": method, "path": "/", "headers": [(b"accept-encoding", accept.encode())]}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+    asyncio.run(CompressionMiddleware(app, compression)(scope, receive, send))
+    start, *body = messages
+    return start["status"], {name.decode(): value.decode() for name, value in start["headers"]}, body
+
+
+def json_response(body, **headers):
+    return respond(headers=[("content-type", "application/json"), ("content-length", str(len(body))), *headers.items()],
+                   chunks=(body,))
+
+
+def test_complete_body_is_compressed():
+    compression = ResponseCompression(encodings=["gzip"])
+    _, headers, body = call(json_response(BIG_JSON), compression)
+    assert headers["content-encoding"] == "gzip" and headers["vary"] == "Accept-Encoding"
+    assert int(headers["content-length"]) == len(body[0]["body"]) < len(BIG_JSON)
+    assert gzip.decompress(body[0]["body"]) == BIG_JSON
+    assert compression.counters["compressed"] == 1 and compression.by_encoding["gzip"] == 1
+
+
+def test_small_bodies_pass_through():
+    compression = ResponseCompression(minimum_size=1024, encodings=["gzip"])
+    small = json.dumps({"price": 452600}).encode()
+    _, headers, body = call(json_response(small), compression)
+    assert "content-encoding" not in headers and body[0]["body"] == small
+    assert compression.counters["too_small"] == 1 and compression.counters["compressed"] == 0
+
+
+@pytest.mark.parametrize("headers", [
+    [("content-type", "image/png")],
+    [("content-type", "application/json"), ("content-encoding", "br")],
+])
+def test_incompressible_or_already_encoded_bodies_pass_through(headers):
+    _, sent, body = call(respond(headers=headers, chunks=(BIG_JSON,)), ResponseCompression(encodings=["gzip"]))
+    assert sent.get("content-encoding") in (None, "br") and body[0]["body"] == BIG_JSON
+
+
+def test_no_acceptable_encoding_passes_through():
+    _, headers, body = call(json_response(BIG_JSON), ResponseCompression(encodings=["gzip"]), accept="gzip;q=0")
+    assert "content-encoding" not in headers and body[0]["body"] == BIG_JSON
+
+
+@pytest.mark.parametrize("status", [204, 304])
+def test_bodyless_statuses_pass_through(status):
+    app = respond(status, [("etag", '"v1"'), ("content-type", "application/json")])
+    sent_status, headers, body = call(app, ResponseCompression(minimum_size=0, encodings=["gzip"]))
+    assert sent_status == status
+    assert "content-encoding" not in headers and headers["etag"] == '"v1"'
+    assert body[0]["body"] == b""
+
+
+def test_stream_is_decodable_chunk_by_chunk():
+    lines = [json.dumps({"year": year, "price": 400000 + year}).encode() + b"\n" for year in range(5)]
+    app = respond(headers=[("content-type", "application/x-ndjson"), ("content-length", "999")], chunks=lines)
+    compression = ResponseCompression(encodings=["gzip"])
+    _, headers, body = call(app, compression)
+    assert headers["content-encoding"] == "gzip" and "content-length" not in headers
+    assert compression.counters["streamed"] == 1
+
+    decoder = zlib.decompressobj(31)
+    # Every line is readable as soon as its own message arrives
+    for line, message in zip(lines, body):
+        assert decoder.decompress(message["body"]) == line
+    assert [message["more_body"] for message in body][-1] is False
+    decoder.decompress(body[-1]["body"])
+    assert decoder.eof
+
+
+def test_compressed_responses_get_a_weak_etag():
+    compression = ResponseCompression(encodings=["gzip"])
+    _, headers, _ = call(json_response(BIG_JSON, etag='"v1"'), compression)
+    assert headers["etag"] == 'W/"v1"'
+    _, headers, _ = call(json_response(BIG_JSON, etag='W/"v1"'), compression)
+    assert headers["etag"] == 'W/"v1"'
+    _, headers, _ = call(json_response(BIG_JSON, etag='"v1"'), compression, accept="identity")
+    assert headers["etag"] == '"v1"'
+
+
+@pytest.mark.parametrize("if_none_match, matches", [
+    ('"v1"', True), ('W/"v1"', True), ('"v0", W/"v1"', True), ("*", True),
+    ('"v2"', False), (None, False), ("", False),
+])
+def test_etag_matching_is_weak(if_none_match, matches):
+    assert etag_matches(if_none_match, '"v1"') is matches
+
+
+def test_identical_cacheable_bodies_are_compressed_once():
+    compression = ResponseCompression(encodings=["gzip"])
+    first = call(json_response(BIG_JSON), compression)[2][0]["body"]
+    second = call(json_response(BIG_JSON), compression)[2][0]["body"]
+    assert first == second
+    assert compression.counters["compressed"] == 1 and compression.counters["cache_hits"] == 1
+    assert compression.by_encoding["gzip"] == 2
+
+    # Not cacheable: POST, no-store and private responses are compressed every time
+    call(json_response(BIG_JSON), compression, method="POST")
+    call(json_response(BIG_JSON, **{"cache-control": "no-store"}), compression)
+    call(json_response(BIG_JSON, **{"cache-control": "private, max-age=60"}), compression)
+    assert compression.counters["compressed"] == 4 and compression.counters["cache_hits"] == 1
+
+
+def test_cache_is_bounded_in_bytes_and_entries():
+    bodies = [json.dumps({"prices": list(range(i, i + 3000))}).encode() for i in range(4)]
+    size = len(ResponseCompression(encodings=["gzip"]).compress(bodies[0], "gzip"))
+    compression = ResponseCompression(cache_bytes=int(size * 2.5), encodings=["gzip"])
+    for body in bodies:
+        compression.compress(body, "gzip", cacheable=True)
+    assert compression.cached_bytes <= compression.cache_bytes
+    assert len(compression.cache) == 2
+    assert compression.cached_bytes == sum(map(len, compression.cache.values()))
+    # Least recently used went first
+    compression.compress(bodies[0], "gzip", cacheable=True)
+    assert compression.counters["cache_hits"] == 0
+    compression.compress(bodies[0], "gzip", cacheable=True)
+    assert compression.counters["cache_hits"] == 1
+
+    by_entries = ResponseCompression(cache_entries=3, encodings=["gzip"])
+    for body in bodies:
+        by_entries.compress(body, "gzip", cacheable=True)
+    assert len(by_entries.cache) == 3
+
+    too_big = ResponseCompression(cache_bytes=10, encodings=["gzip"])
+    too_big.compress(bodies[0], "gzip", cacheable=True)
+    assert len(too_big.cache) == 0 and too_big.cached_bytes == 0
+
+
+@pytest.fixture(scope="module")
+def client(unthrottled):
+    from app_factory import create_app
+    return TestClient(create_app("standard"))
+
+
+def test_heatmap_etag_depends_on_the_encoding(client):
+    compressed = client.get("/heatmap?step=5", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/heatmap?step=5", headers={"Accept-Encoding": "identity"})
+    assert compressed.headers["content-encoding"] == "gzip" and "content-encoding" not in identity.headers
+    assert compressed.content == identity.content
+    assert compressed.headers["etag"] == f"W/{identity.headers['etag']}"
+
+    # Either validator revalidates either representation
+    for etag in (compressed.headers["etag"], identity.headers["etag"]):
+        for accept in ("gzip", "identity"):
+            response = client.get("/heatmap?step=5", headers={"Accept-Encoding": accept, "If-None-Match": etag})
+            assert response.status_code == 304
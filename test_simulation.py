@@ -0,0 +1,60 @@
+# Monte Carlo simulations on /predict: specs are validated and capacity is claimed before anything is recorded
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from conftest import ROW, StubLinearModel, last_recorded
+from simulation import PriceSimulation, SimulationPool
+
+MODEL = StubLinearModel(np.array([0.44, 0.01, -0.11, 0.65, -0.000001, -0.04, -0.42, -0.43]), 1.89)
+
+
+@pytest.fixture(scope="module")
+def client(unthrottled):
+    from app_factory import create_app
+    return TestClient(create_app("minimal"))
+
+
+def test_seeded_runs_repeat_and_match_the_sampled_inputs():
+    spec = {"MedInc": {"std": 0.8}, "HouseAge": {"range": [30, 50]}}
+    first = PriceSimulation(ROW, spec, samples=5000, seed=7, time_budget=5).run(MODEL)
+    assert first == {**PriceSimulation(ROW, spec, samples=5000, seed=7, time_budget=5).run(MODEL),
+                     "elapsed_ms": first["elapsed_ms"]}
+
+    # Linear model: the mean price moves only with the uniform feature's midpoint shift
+    expected = (MODEL.predict(ROW)[0] + MODEL.coefficients[1] * (40 - ROW[1])) * 100000
+    assert first["mean"] == pytest.approx(expected, rel=1e-3)
+    assert sum(first["histogram"]["counts"]) == first["samples"] == 5000
+
+
+@pytest.mark.parametrize("simulate", [
+    {"uncertainty": {"bogus": {"std": 1}}},
+    {"uncertainty": {"MedInc": {"std": -1}}},
+    {"uncertainty": {"MedInc": {"range": [5, 1]}}},
+    {"uncertainty": {}},
+    {"uncertainty": {"MedInc": {"std": 1}}, "samples": 0},
+    "not an object",
+])
+def test_bad_specs_are_rejected_before_the_prediction_is_recorded(client, simulate):
+    last = last_recorded()
+    response = client.post("/predict", json={"data": ROW, "simulate": simulate})
+    assert response.status_code == 400
+    assert last_recorded() is last
+
+
+def test_a_full_pool_is_reported_before_the_prediction_is_recorded(client, monkeypatch):
+    from routers import predict
+    pool = SimulationPool(workers=1, max_pending=0)
+    pool._slots.acquire()
+    monkeypatch.setattr(predict, "simulation_pool", pool)
+    last = last_recorded()
+
+    body = {"data": ROW, "simulate": {"uncertainty": {"MedInc": {"std": 0.5}}, "samples": 100}}
+    response = client.post("/predict", json=body)
+    assert response.status_code == 503 and pool.rejected == 1
+    assert last_recorded() is last
+
+    pool._slots.release()
+    response = client.post("/predict", json=body)
+    assert response.status_code == 200 and response.json()["simulation"]["samples"] == 100
+    assert last_recorded() is not last
@@ -0,0 +1,108 @@
+# Single-flight coalescing: concurrent callers share one execution, later callers recompute
+import threading
+import time
+
+import pytest
+
+from single_flight import SingleFlight
+
+CALLERS = 8
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def run_concurrently(flight, key, fn):
+    """Start CALLERS threads on the same key; returns what each one got (result or exception)"""
+    outcomes = [None] * CALLERS
+
+    def call(i):
+        try:
+            outcomes[i] = flight.do(key, fn)
+        except Exception as e:
+            outcomes[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(CALLERS)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+
+def test_concurrent_callers_share_one_result():
+    flight, release, runs = SingleFlight(), threading.Event(), []
+
+    def compute():
+        runs.append(1)
+        release.wait(5)
+        return object()
+
+    threads, outcomes = run_concurrently(flight, "k", compute)
+    # Everyone but the leader is waiting on the one execution before it finishes
+    wait_until(lambda: flight.coalesced == CALLERS - 1)
+    assert flight.stats()["in_flight"] == 1
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(runs) == 1
+    assert all(outcome is outcomes[0] for outcome in outcomes)
+    assert flight.stats() == {"executions": 1, "coalesced": CALLERS - 1, "in_flight": 0,
+                              "coalesce_rate": round((CALLERS - 1) / CALLERS, 4)}
+
+
+def test_concurrent_callers_share_one_exception():
+    flight, release = SingleFlight(), threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise ValueError("model unavailable")
+
+    threads, outcomes = run_concurrently(flight, "k", fail)
+    wait_until(lambda: flight.coalesced == CALLERS - 1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert isinstance(outcomes[0], ValueError)
+    assert all(outcome is outcomes[0] for outcome in outcomes)
+    assert flight.executions == 1
+
+
+def test_calls_after_completion_recompute():
+    flight, runs = SingleFlight(), []
+
+    def compute():
+        runs.append(1)
+        return len(runs)
+
+    assert flight.do("k", compute) == 1
+    assert flight.do("k", compute) == 2
+    with pytest.raises(ZeroDivisionError):
+        flight.do("k", lambda: 1 / 0)
+    # A failure isn't cached either
+    assert flight.do("k", compute) == 3
+    assert flight.coalesced == 0 and flight.stats()["in_flight"] == 0
+
+
+def test_different_keys_run_independently():
+    flight, started, release = SingleFlight(), [], threading.Event()
+
+    def compute(key):
+        started.append(key)
+        release.wait(5)
+        return key
+
+    results = {}
+    threads = [threading.Thread(target=lambda k=k: results.setdefault(k, flight.do(k, compute, k))) for k in "abc"]
+    for thread in threads:
+        thread.start()
+    # All three are in flight at once rather than queued behind each other
+    wait_until(lambda: len(started) == 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results == {"a": "a", "b": "b", "c": "c"} and flight.executions == 3
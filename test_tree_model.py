@@ -0,0 +1,87 @@
+# Tree ensemble: packed-array scoring against per-row traversal, and save/load round trips
+import numpy as np
+import pytest
+
+from model_utils import load_model
+from tree_model import TreeEnsembleModel
+
+
+def random_tree(rng, depth, n_features=8):
+    """Random binary tree with tree-local child indices; leaves have feature -1"""
+    tree = {"feature": [], "threshold": [], "left": [], "right": [], "value": []}
+
+    def grow(level):
+        node = len(tree["feature"])
+        for key in tree:
+            tree[key].append(-1 if key in ("feature", "left", "right") else 0.0)
+        if level == depth or (level > 0 and rng.random() < 0.3):
+            tree["value"][node] = float(rng.normal())
+            return node
+        tree["feature"][node] = int(rng.integers(n_features))
+        tree["threshold"][node] = float(rng.normal())
+        tree["left"][node] = grow(level + 1)
+        tree["right"][node] = grow(level + 1)
+        return node
+
+    grow(0)
+    return tree
+
+
+def reference_predict(trees, X, base_score, learning_rate):
+    """One row and one tree at a time, following child pointers"""
+    predictions = []
+    for x in X:
+        total = 0.0
+        for tree in trees:
+            node = 0
+            while tree["feature"][node] >= 0:
+                go_left = x[tree["feature"][node]] <= tree["threshold"][node]
+                node = tree["left"][node] if go_left else tree["right"][node]
+            total += tree["value"][node]
+        predictions.append(base_score + learning_rate * total)
+    return np.array(predictions)
+
+
+@pytest.fixture(scope="module")
+def ensemble():
+    rng = np.random.default_rng(0)
+    # Uneven depths, including a single-leaf tree
+    trees = [random_tree(rng, depth) for depth in (0, 1, 3, 5, 6, 2)]
+    return trees, TreeEnsembleModel.from_trees(trees, base_score=2.07, learning_rate=0.1)
+
+
+def test_predict_matches_per_row_traversal(ensemble):
+    trees, model = ensemble
+    X = np.random.default_rng(1).normal(size=(500, 8))
+    np.testing.assert_allclose(model.predict(X), reference_predict(trees, X, 2.07, 0.1), rtol=0, atol=1e-12)
+    assert model.max_depth == 6
+
+
+def test_threshold_ties_go_left(ensemble):
+    trees, model = ensemble
+    root = trees[2]
+    X = np.zeros((1, 8))
+    X[0, root["feature"][0]] = root["threshold"][0]
+    np.testing.assert_allclose(model.predict(X), reference_predict(trees, X, 2.07, 0.1))
+
+
+def test_single_row_and_batch_entry_points(ensemble):
+    trees, model = ensemble
+    x = np.random.default_rng(2).normal(size=8)
+    assert model.predict(x).shape == (1,)
+    assert model.predict_batch(x[None])[0] == model.predict(x)[0]
+
+
+@pytest.mark.parametrize("suffix", [".json", ".npz"])
+def test_save_load_round_trip(ensemble, tmp_path, suffix):
+    trees, model = ensemble
+    path = str(tmp_path / f"model{suffix}")
+    model.save(path)
+    loaded = load_model(path)
+
+    assert isinstance(loaded, TreeEnsembleModel)
+    for name in ("feature", "threshold", "left", "right", "value", "roots"):
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(model, name))
+    assert (loaded.base_score, loaded.learning_rate, loaded.max_depth) == (model.base_score, model.learning_rate, model.max_depth)
+    X = np.random.default_rng(3).normal(size=(100, 8))
+    np.testing.assert_array_equal(loaded.predict(X), model.predict(X))
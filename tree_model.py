@@ -0,0 +1,144 @@
+# Gradient-boosted tree ensemble stored as flat parallel arrays
+import json
+
+import numpy as np
+
+
+class TreeEnsembleModel:
+    """Tree-ensemble regressor with all trees packed into flat node arrays.
+
+    Node i of the ensemble is described by feature[i], threshold[i], left[i],
+    right[i] and value[i]; leaves have feature == -1. Child indices are global
+    (already offset into the packed arrays), and roots[t] is the root of tree t.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots,
+                 base_score=0.0, learning_rate=1.0):
+        self.feature = np.ascontiguousarray(feature, dtype=np.int32)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)
+        self.left = np.ascontiguousarray(left, dtype=np.int32)
+        self.right = np.ascontiguousarray(right, dtype=np.int32)
+        self.value = np.ascontiguousarray(value, dtype=np.float64)
+        self.roots = np.ascontiguousarray(roots, dtype=np.int32)
+        self.base_score = float(base_score)
+        self.learning_rate = float(learning_rate)
+
+        # Leaves point at themselves so finished rows stay put during traversal
+        leaves = self.feature < 0
+        node_ids = np.arange(len(self.feature), dtype=np.int32)
+        self.left = np.where(leaves, node_ids, self.left)
+        self.right = np.where(leaves, node_ids, self.right)
+        # Leaves read feature 0; the comparison result is ignored for them
+        self._split_feature = np.where(leaves, 0, self.feature)
+        self.max_depth = self._depth()
+
+    def _depth(self):
+        frontier = self.roots
+        level = 0
+        while len(frontier):
+            internal = frontier[self.feature[frontier] >= 0]
+            frontier = np.concatenate([self.left[internal], self.right[internal]])
+            level += 1
+        return max(level - 1, 0)
+
+    @classmethod
+    def from_trees(cls, trees, base_score=0.0, learning_rate=1.0):
+        """Pack per-tree arrays (tree-local child indices) into one ensemble"""
+        feature, threshold, left, right, value, roots = [], [], [], [], [], []
+        offset = 0
+        for tree in trees:
+            n_nodes = len(tree["feature"])
+            tree_left = np.asarray(tree["left"], dtype=np.int32)
+            tree_right = np.asarray(tree["right"], dtype=np.int32)
+            roots.append(offset)
+            feature.append(np.asarray(tree["feature"], dtype=np.int32))
+            threshold.append(np.asarray(tree["threshold"], dtype=np.float64))
+            left.append(np.where(tree_left >= 0, tree_left + offset, -1))
+            right.append(np.where(tree_right >= 0, tree_right + offset, -1))
+            value.append(np.asarray(tree["value"], dtype=np.float64))
+            offset += n_nodes
+        return cls(
+            np.concatenate(feature), np.concatenate(threshold),
+            np.concatenate(left), np.concatenate(right),
+            np.concatenate(value), roots,
+            base_score=base_score, learning_rate=learning_rate
+        )
+
+    @classmethod
+    def from_sklearn(cls, estimator):
+        """Convert a fitted sklearn GradientBoostingRegressor (squared error loss)"""
+        trees = []
+        for (tree,) in estimator.estimators_:
+            t = tree.tree_
+            trees.append({
+                "feature": np.where(t.children_left < 0, -1, t.feature),
+                "threshold": t.threshold,
+                "left": t.children_left,
+                "right": t.children_right,
+                "value": t.value[:, 0, 0],
+            })
+        base_score = float(np.ravel(estimator.init_.predict(np.zeros((1, estimator.n_features_in_))))[0])
+        return cls.from_trees(trees, base_score=base_score, learning_rate=estimator.learning_rate)
+
+    @classmethod
+    def load(cls, path):
+        """Load a model exported with save() as .npz or .json"""
+        if path.endswith(".npz"):
+            with np.load(path) as data:
+                return cls(
+                    data["feature"], data["threshold"], data["left"], data["right"],
+                    data["value"], data["roots"],
+                    base_score=float(data["base_score"]), learning_rate=float(data["learning_rate"])
+                )
+        with open(path) as f:
+            spec = json.load(f)
+        return cls.from_trees(
+            spec["trees"],
+            base_score=spec.get("base_score", 0.0),
+            learning_rate=spec.get("learning_rate", 1.0)
+        )
+
+    def save(self, path):
+        """Export as .npz (packed arrays) or .json (one object per tree)"""
+        if path.endswith(".npz"):
+            np.savez(
+                path, feature=self.feature, threshold=self.threshold,
+                left=self.left, right=self.right, value=self.value, roots=self.roots,
+                base_score=self.base_score, learning_rate=self.learning_rate
+            )
+            return
+        ends = np.append(self.roots[1:], len(self.feature))
+        trees = []
+        for start, end in zip(self.roots, ends):
+            leaves = self.feature[start:end] < 0
+            trees.append({
+                "feature": self.feature[start:end].tolist(),
+                "threshold": self.threshold[start:end].tolist(),
+                "left": np.where(leaves, -1, self.left[start:end] - start).tolist(),
+                "right": np.where(leaves, -1, self.right[start:end] - start).tolist(),
+                "value": self.value[start:end].tolist(),
+            })
+        with open(path, "w") as f:
+            json.dump({
+                "format": "tree_ensemble/v1",
+                "base_score": self.base_score,
+                "learning_rate": self.learning_rate,
+                "trees": trees
+            }, f)
+
+    def predict(self, X):
+        """Score a batch by advancing every (row, tree) pair one level per pass"""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], len(self.roots))).copy()
+        for _ in range(self.max_depth):
+            go_left = X[rows, self._split_feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        return self.base_score + self.learning_rate * self.value[nodes].sum(axis=1)
+
+    # Same entry point the pure-Python linear model exposes for batches
+    predict_batch = predict